@@ -0,0 +1,61 @@
+'''
+Compares the time needed to build the path and link arrays of a GNN batch
+from the dictionaries of the samples (routing matrix, performance matrix and
+networkx topology) and with DatanetAPI.collate, which works on the arrays
+parsed by the reader.
+
+Usage: python bench_batches.py <pathToDataset> [batchSize]
+'''
+
+import os, sys, time, contextlib, io
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def collate_dicts(samples):
+    delays, capacities, path_links, offsets = [], [], [], [0]
+    n_links = 0
+    for s in samples:
+        G = s.get_topology_object()
+        link_ids = {}
+        for src, dst in G.edges():
+            link_ids[(src, dst)] = n_links + len(link_ids)
+            capacities.append(G[src][dst][0]['bandwidth'])
+        n = s.get_network_size()
+        for src in range(n):
+            for dst in range(n):
+                if (src == dst):
+                    continue
+                delays.append(s.get_srcdst_performance(src, dst)['AggInfo']['AvgDelay'])
+                path = s.get_srcdst_routing(src, dst)
+                path_links.extend(link_ids[hop] for hop in zip(path[:-1], path[1:]))
+                offsets.append(len(path_links))
+        n_links += len(link_ids)
+    return numpy.array(delays), numpy.array(capacities), numpy.array(path_links), numpy.array(offsets)
+
+def bench(reader, collate, batch_size):
+    start = time.perf_counter()
+    samples = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        batch = []
+        for s in reader:
+            batch.append(s)
+            if (len(batch) == batch_size):
+                collate(batch)
+                samples += len(batch)
+                batch = []
+    return samples / (time.perf_counter() - start)
+
+def main():
+    path = sys.argv[1]
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    reader = datanetAPI.DatanetAPI(path)
+    arrays = datanetAPI.DatanetAPI(path,
+                                   parsing=datanetAPI.ParsingOptions(fields=['performance', 'routing', 'topology']))
+    print("Batch size: %d" % batch_size)
+    print("Dictionaries:      %8.1f samples/s" % bench(reader, collate_dicts, batch_size))
+    print("collate (arrays):  %8.1f samples/s" % bench(arrays, arrays.collate, batch_size))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''
+Transcodes a dataset with every available codec (see datanetAPI.ARCHIVE_CODECS
+and transcode_dataset) into a temporary directory, and compares the size of
+the data files, the decompression throughput and the time needed to iterate
+over the samples of each copy. The tar.gz files are also measured with every
+installed gzip backend.
+
+Usage: python bench_codecs.py <pathToDataset>
+'''
+
+import os, sys, time, contextlib, io, tempfile, shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def data_files(path):
+    paths = []
+    for root, dirs, files in os.walk(path):
+        if ("graphs" in dirs and "routings" in dirs):
+            paths.extend(os.path.join(root, f) for f in datanetAPI.archives._list_data_files(root, dirs, files))
+    return paths
+
+def bench(path, gzip_backend=None):
+    paths = data_files(path)
+    size = sum(datanetAPI.archives._stat_data_file(p).st_size for p in paths)
+    reader = datanetAPI.DatanetAPI(path,
+                                   archive=datanetAPI.ArchiveOptions(streaming=True, gzip_backend=gzip_backend))
+    start = time.perf_counter()
+    decompressed = 0
+    for p in paths:
+        files, close = reader._open_archive(p, file_names=datanetAPI.SAMPLE_FILES)
+        for f in files.values():
+            if (f is not None):
+                decompressed += len(f.read())
+        close()
+    t_decompress = time.perf_counter() - start
+    reader = datanetAPI.DatanetAPI(path,
+                                   archive=datanetAPI.ArchiveOptions(streaming=True, gzip_backend=gzip_backend),
+                                   parsing=datanetAPI.ParsingOptions(array_mode=True))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples = sum(1 for _ in reader)
+    t_iter = time.perf_counter() - start
+    return size, decompressed / t_decompress, samples / t_iter
+
+def main():
+    path = sys.argv[1]
+    tmp = tempfile.mkdtemp()
+    try:
+        results = []
+        for backend, module in datanetAPI.GZIP_BACKENDS.items():
+            if (datanetAPI.archives._import_optional(module) is not None):
+                results.append(("gzip (%s)" % backend, bench(path, backend)))
+        for name in sorted(datanetAPI.ARCHIVE_CODECS) + ['dir']:
+            if (name == 'gzip' or (name != 'dir' and not datanetAPI.ARCHIVE_CODECS[name].is_available())):
+                continue
+            datanetAPI.transcode_dataset(path, os.path.join(tmp, name), name)
+            results.append((name, bench(os.path.join(tmp, name))))
+        print("%-16s %12s %18s %12s" % ("Codec", "Size (MB)", "Decompress (MB/s)", "Samples/s"))
+        for name, (size, throughput, rate) in results:
+            print("%-16s %12.1f %18.1f %12.1f" % (name, size / 1e6, throughput / 1e6, rate))
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main()
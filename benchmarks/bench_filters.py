@@ -0,0 +1,44 @@
+'''
+Compares the time needed to select the samples of a dataset with a condition
+on their global delay: filtering the samples produced by the iterator, which
+parses all of them, and with the filters option, which only parses the
+header of the rejected samples. The threshold is chosen to keep a fraction of
+the samples.
+
+Usage: python bench_filters.py <pathToDataset> [fractionKept]
+'''
+
+import os, sys, time, contextlib, io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI, numpy
+
+def bench(reader, predicate=None):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples = [s for s in reader if predicate is None or predicate(s)]
+    return (time.perf_counter() - start, len(samples))
+
+def main():
+    path = sys.argv[1]
+    fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    reader = datanetAPI.DatanetAPI(path, cache=datanetAPI.CacheOptions(use_store=False))
+    t_all, total = bench(reader)
+    with contextlib.redirect_stdout(io.StringIO()):
+        delays = [s.get_global_delay() for s in reader]
+    threshold = numpy.quantile(delays, fraction)
+
+    t_post, kept = bench(reader, lambda s: s.get_global_delay() <= threshold)
+    filtered = datanetAPI.DatanetAPI(path, cache=datanetAPI.CacheOptions(use_store=False),
+                                     filters={'global_delay': lambda d: d <= threshold})
+    t_pushdown, kept_pushdown = bench(filtered)
+    if (kept != kept_pushdown):
+        print("Different number of samples: %d and %d" % (kept, kept_pushdown))
+
+    print("Samples: %d, kept: %d" % (total, kept))
+    print("All samples:                 %8.3f s" % t_all)
+    print("Filtering the samples:       %8.3f s" % t_post)
+    print("Filters option:              %8.3f s (x%.1f)" % (t_pushdown, t_post/t_pushdown))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+'''
+Compares the time needed to build a table with a row per flow of every
+sample from the traffic_matrix and performance_matrix dictionaries, and with
+Sample.flows_table, which decodes the arrays of the sample directly.
+
+Usage: python bench_flows_table.py <pathToDataset>
+'''
+
+import os, sys, time, contextlib, io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def table_from_dicts(s):
+    rows = []
+    n = s.get_network_size()
+    for src in range(n):
+        for dst in range(n):
+            traffic = s.get_srcdst_traffic(src, dst)['Flows']
+            performance = s.get_srcdst_performance(src, dst)['Flows']
+            for k, (t, p) in enumerate(zip(traffic, performance)):
+                row = {'src': src, 'dst': dst, 'flow': k, 'ToS': t['ToS'], 'TimeDist': int(t['TimeDist']),
+                       'SizeDist': int(t['SizeDist']), 'AvgBw': t['AvgBw'], 'PktsGen': t['PktsGen'],
+                       'TotalPktsGen': t['TotalPktsGen']}
+                row.update(t['TimeDistParams'])
+                row.update(t['SizeDistParams'])
+                row.update(p)
+                rows.append(row)
+    return rows
+
+def main():
+    path = sys.argv[1]
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples = list(datanetAPI.DatanetAPI(path, parsing=datanetAPI.ParsingOptions(lazy=True)))
+    flows = 0
+    start = time.perf_counter()
+    for s in samples:
+        flows += len(table_from_dicts(s))
+    t_dicts = time.perf_counter() - start
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples = list(datanetAPI.DatanetAPI(path, parsing=datanetAPI.ParsingOptions(lazy=True)))
+    start = time.perf_counter()
+    for s in samples:
+        s.flows_table()
+    t_table = time.perf_counter() - start
+    print("Samples: %d, flows: %d" % (len(samples), flows))
+    print("Dictionaries: %8.3f ms/sample" % (t_dicts / len(samples) * 1000))
+    print("flows_table:  %8.3f ms/sample (x%.1f)" % (t_table / len(samples) * 1000, t_dicts / t_table))
+
+if __name__ == '__main__':
+    main()
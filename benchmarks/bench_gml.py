@@ -0,0 +1,49 @@
+'''
+Compares the time needed to read the GML graph files of a dataset with
+networkx.read_gml and with the reader of datanetAPI (_read_gml_topology),
+checking that both give the same graph.
+
+Usage: python bench_gml.py <pathToDataset> [repeat]
+'''
+
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI, networkx
+
+def bench(paths, read, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            read(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(paths)
+
+def main():
+    path = sys.argv[1]
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    paths = []
+    for root, dirs, files in os.walk(path):
+        if (os.path.basename(root) == "graphs"):
+            paths.extend(os.path.join(root, f) for f in files)
+
+    for graph_path in paths:
+        G = networkx.read_gml(graph_path, destringizer=int)
+        H = datanetAPI.topology._read_gml_topology(graph_path).to_networkx()
+        if (list(G.nodes(data=True)) != list(H.nodes(data=True)) or
+            list(G.edges(keys=True, data=True)) != list(H.edges(keys=True, data=True))):
+            print("Different graphs for " + graph_path)
+
+    links = sum(len(datanetAPI.topology._read_gml_topology(p).edge_src) for p in paths)
+    print("Graph files: %d, links: %d" % (len(paths), links))
+    t_networkx = bench(paths, lambda p: networkx.read_gml(p, destringizer=int), repeat)
+    t_arrays = bench(paths, datanetAPI.topology._read_gml_topology, repeat)
+    t_graph = bench(paths, lambda p: datanetAPI.topology._read_gml_topology(p).to_networkx(), repeat)
+    print("networkx.read_gml:          %8.3f ms/graph" % (t_networkx*1000))
+    print("Topology arrays:            %8.3f ms/graph (x%.1f)" % (t_arrays*1000, t_networkx/t_arrays))
+    print("Topology + networkx graph:  %8.3f ms/graph (x%.1f)" % (t_graph*1000, t_networkx/t_graph))
+
+if __name__ == '__main__':
+    main()
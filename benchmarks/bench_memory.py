@@ -0,0 +1,56 @@
+'''
+Measures the memory kept by the samples of a dataset, in bytes per sample
+and for every network size, when they are read with the default options
+(dictionary matrices), in array mode and with the compact option, compared
+with the size of the numeric arrays of the samples (payload). The memory of
+the samples is measured with tracemalloc, as the memory released when they
+are deleted, so the topologies and routings cached by the reader are not
+counted.
+
+Usage: python bench_memory.py <pathToDataset> [maxSamples]
+'''
+
+import os, sys, gc, tracemalloc, contextlib, io, itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def measure(reader, max_samples):
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples = list(itertools.islice(reader, max_samples))
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    n = len(samples)
+    del samples
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (before - after) / max(n, 1)
+
+def main():
+    path = sys.argv[1]
+    max_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    payload = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for s in datanetAPI.DatanetAPI(path, parsing=datanetAPI.ParsingOptions(compact=True),
+                                       cache=datanetAPI.CacheOptions(use_store=False)):
+            arrays = s._get_arrays()
+            size = sum(a.nbytes for a in arrays.values() if hasattr(a, 'nbytes'))
+            payload.setdefault(s.get_network_size(), []).append(size)
+
+    modes = (("dicts", datanetAPI.ParsingOptions()), ("arrays", datanetAPI.ParsingOptions(array_mode=True)),
+             ("compact", datanetAPI.ParsingOptions(compact=True)))
+    print("%8s %8s %12s" % ("Nodes", "Samples", "Payload") + "".join("%12s" % name for name, _ in modes) + "  (bytes/sample)")
+    for net_size in sorted(payload):
+        sizes = payload[net_size][:max_samples]
+        row = "%8d %8d %12d" % (net_size, len(sizes), sum(sizes) / len(sizes))
+        for _, parsing in modes:
+            reader = datanetAPI.DatanetAPI(path, parsing=parsing, cache=datanetAPI.CacheOptions(use_store=False),
+                                           filters={'net_size': lambda n, size=net_size: n == size})
+            row += "%12d" % measure(reader, max_samples)
+        print(row)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''
+Compares the time needed to process the lines of a sample with the
+dictionary parser (_process_flow_results_traffic_line) and with the array
+parser (_process_flow_results_traffic_arrays).
+
+Usage: python bench_parser.py <pathToDataset> [numSamples]
+'''
+
+import os, sys, time, contextlib, io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def read_samples(path, n):
+    reader = datanetAPI.DatanetAPI(path, archive=datanetAPI.ArchiveOptions(streaming=True),
+                                   parsing=datanetAPI.ParsingOptions(array_mode=True))
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for s in reader:
+            samples.append(s)
+            if (len(samples) == n):
+                break
+    return samples
+
+def bench(samples, process, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for s in samples:
+            process(s)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(samples)
+
+def main():
+    path = sys.argv[1]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    samples = read_samples(path, n)
+    reader = datanetAPI.DatanetAPI(path)
+    
+    def dict_parser(s):
+        reader._process_flow_results_traffic_line(s._results_line, s._traffic_line, s._flowresults_line, s._status_line, datanetAPI.Sample())
+    
+    def array_parser(s):
+        reader._process_flow_results_traffic_arrays(s._results_line, s._traffic_line, s._flowresults_line, s._status_line, datanetAPI.Sample())
+    
+    def array_parser_dicts(s):
+        aux = datanetAPI.Sample()
+        reader._process_flow_results_traffic_arrays(s._results_line, s._traffic_line, s._flowresults_line, s._status_line, aux)
+        aux.get_performance_matrix()
+        aux.get_traffic_matrix()
+    
+    print("Samples: %d, network size: %d" % (len(samples), samples[0].get_network_size()))
+    t_dict = bench(samples, dict_parser)
+    t_array = bench(samples, array_parser)
+    t_array_dicts = bench(samples, array_parser_dicts)
+    print("Dictionary parser:          %8.3f ms/sample" % (t_dict*1000))
+    print("Array parser:               %8.3f ms/sample (x%.1f)" % (t_array*1000, t_dict/t_array))
+    print("Array parser + dict views:  %8.3f ms/sample (x%.1f)" % (t_array_dicts*1000, t_dict/t_array_dicts))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+'''
+Measures the time needed to iterate over a dataset while the consumer
+spends some time on every sample (simulating a training step), without and
+with the prefetch option, and the time the consumer waits for samples.
+
+Usage: python bench_prefetch.py <pathToDataset> [stepMs] [prefetch]
+'''
+
+import os, sys, time, contextlib, io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def bench(path, step, prefetch):
+    reader = datanetAPI.DatanetAPI(path, archive=datanetAPI.ArchiveOptions(streaming=True),
+                                   parallel=datanetAPI.ParallelOptions(prefetch=prefetch),
+                                   parsing=datanetAPI.ParsingOptions(array_mode=True))
+    samples = 0
+    wait = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        it = iter(reader)
+        while (True):
+            t = time.perf_counter()
+            s = next(it, None)
+            wait += time.perf_counter() - t
+            if (s is None):
+                break
+            samples += 1
+            # The step releases the interpreter, as most numpy or deep
+            # learning framework operations do
+            time.sleep(step)
+    return samples, time.perf_counter() - start, wait
+
+def main():
+    path = sys.argv[1]
+    step = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+    prefetch = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    for n in (0, prefetch):
+        samples, elapsed, wait = bench(path, step, n)
+        print("prefetch=%-3d %d samples: %8.3f s, consumer waiting %8.3f s" % (n, samples, elapsed, wait))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+'''
+Compares the latency of reading random samples (reader[i]) of a dataset
+without gzip checkpoints, where the whole data file of the sample has to be
+decompressed whenever the previous sample came from another file, and with
+gzip checkpoints, where only the data between the closest checkpoint and the
+lines of the sample is decompressed.
+
+Usage: python bench_random_access.py <pathToDataset> [numReads] [checkpointSpacing]
+'''
+
+import os, sys, time, random, contextlib, io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def bench(reader, order):
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in order:
+            start = time.perf_counter()
+            reader[i]
+            times.append(time.perf_counter() - start)
+    reader._close_archive_cache()
+    times.sort()
+    return (sum(times) / len(times), times[len(times) // 2], times[int(len(times) * 0.95)])
+
+def main():
+    path = sys.argv[1]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    spacing = int(sys.argv[3]) if len(sys.argv) > 3 else 1024*1024
+    plain = datanetAPI.DatanetAPI(path, parsing=datanetAPI.ParsingOptions(array_mode=True), stats=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        total = len(plain)
+    order = [random.randrange(total) for _ in range(n)]
+
+    archive = datanetAPI.ArchiveOptions(checkpoints=True, checkpoint_spacing=spacing)
+    checkpointed = datanetAPI.DatanetAPI(path, archive=archive, parsing=datanetAPI.ParsingOptions(array_mode=True),
+                                         stats=True)
+    # The first reads of every data file record its checkpoints
+    start = time.perf_counter()
+    bench(checkpointed, sorted(set(order)))
+    t_build = time.perf_counter() - start
+
+    print("Samples: %d, random reads: %d" % (total, n))
+    print("Checkpoint build pass:  %8.3f s" % t_build)
+    for name, reader in (("Without checkpoints:", plain), ("With checkpoints:", checkpointed)):
+        reader.read_stats['compressed_bytes'] = 0
+        mean, p50, p95 = bench(reader, order)
+        print("%-22s  mean %8.3f ms, p50 %8.3f ms, p95 %8.3f ms, %6.1f MB read" %
+              (name, mean*1000, p50*1000, p95*1000, reader.read_stats['compressed_bytes'] / 1e6))
+
+if __name__ == '__main__':
+    main()
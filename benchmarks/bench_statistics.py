@@ -0,0 +1,45 @@
+'''
+Compares the time needed to compute the statistics of a dataset with
+compute_statistics, reading the data files and with the cached summaries of
+the data files, and checks the estimated quantiles against the exact ones
+computed with numpy from the measurements of the src-dst pairs.
+
+Usage: python bench_statistics.py <pathToDataset> [numWorkers]
+'''
+
+import os, sys, time, contextlib, io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI, numpy
+
+def main():
+    path = sys.argv[1]
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    reader = datanetAPI.DatanetAPI(path, parallel=datanetAPI.ParallelOptions(num_workers=workers))
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        statistics = reader.compute_statistics(cache=False)
+        t_read = time.perf_counter() - start
+        reader.compute_statistics()
+        start = time.perf_counter()
+        reader.compute_statistics()
+        t_cached = time.perf_counter() - start
+
+        delays = []
+        for s in datanetAPI.DatanetAPI(path,
+                                       parsing=datanetAPI.ParsingOptions(array_mode=True, fields=['performance'])):
+            agg = s.get_performance_array()
+            delays.append(agg[~numpy.eye(agg.shape[0], dtype=bool)][:,datanetAPI.PERF_COLUMNS.index('AvgDelay')])
+    delays = numpy.concatenate(delays)
+
+    print("Samples: %d, src-dst pairs: %d" % (statistics['samples'], len(delays)))
+    print("Reading the data files:  %8.3f s" % t_read)
+    print("Cached summaries:        %8.3f s (x%.1f)" % (t_cached, t_read/t_cached))
+    summary = statistics['path']['AvgDelay']
+    for q, value in summary['quantiles'].items():
+        exact = numpy.quantile(delays, q, method='inverted_cdf')
+        print("AvgDelay quantile %.2f:  %10.6f (exact %10.6f, error %.2f%%)" %
+              (q, value, exact, abs(value - exact) / abs(exact) * 100 if exact else 0))
+
+if __name__ == '__main__':
+    main()
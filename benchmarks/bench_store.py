@@ -0,0 +1,45 @@
+'''
+Compares the time needed to iterate over a dataset reading the data files
+and reading the columnar store (see DatanetAPI.build_store), which is built
+in a temporary cache directory. Samples are read in array mode, and the
+aggregate delays of every sample are accessed.
+
+Usage: python bench_store.py <pathToDataset> [epochs]
+'''
+
+import os, sys, time, contextlib, io, tempfile, shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import datanetAPI
+
+def bench(reader, epochs):
+    samples = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for epoch in range(epochs):
+            reader.set_epoch(epoch)
+            for s in reader:
+                s.get_delay_matrix().sum()
+                samples += 1
+    return samples / (time.perf_counter() - start)
+
+def main():
+    path = sys.argv[1]
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    cache_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        datanetAPI.DatanetAPI(path, cache=datanetAPI.CacheOptions(cache_dir=cache_dir)).build_store()
+        t_ingest = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(cache_dir) for f in files)
+        print("Ingest: %.2f s, store size: %.1f MB" % (t_ingest, size / 1e6))
+        for name, use_store in (("Data files:", False), ("Columnar store:", True)):
+            reader = datanetAPI.DatanetAPI(path, archive=datanetAPI.ArchiveOptions(streaming=True),
+                                           parsing=datanetAPI.ParsingOptions(array_mode=True),
+                                           cache=datanetAPI.CacheOptions(cache_dir=cache_dir, use_store=use_store))
+            print("%-16s %10.1f samples/s" % (name, bench(reader, epochs)))
+    finally:
+        shutil.rmtree(cache_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+'''
+Reproducible benchmark suite of the reader, run on synthetic datasets (see
+synthetic_dataset.py) so that results only depend on the code and the
+machine. Every benchmark runs in its own process and reports the number of
+items processed per second (samples, graphs or routing files), the MB/s of
+input data (compressed data files when iterating, lines or files
+otherwise) and the peak RSS of the process.
+
+Results can be saved as a JSON baseline, and compared with a previous
+baseline: benchmarks whose throughput decreased, or whose peak RSS
+increased, by more than the tolerance are reported as regressions, and the
+exit status is 1.
+
+Usage: python run_benchmarks.py [--output results.json] [--baseline baseline.json]
+       [--tolerance 0.2] [--data-dir dir] [--repeat N] [--only name,...]
+'''
+
+import os, sys, time, json, argparse, contextlib, io, platform, subprocess, tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+import datanetAPI, numpy
+from synthetic_dataset import generate_dataset
+
+# Synthetic datasets of the suite: arguments of generate_dataset
+DATASETS = {
+    'small': dict(num_nodes=10, num_files=4, samples_per_file=25, num_routings=2, seed=1),
+    'large': dict(num_nodes=30, num_files=2, samples_per_file=10, num_routings=2, seed=2),
+}
+
+# Version of the format of the results
+SUITE_VERSION = 1
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+# Minimum time of every measurement. Short runs are repeated until reaching it.
+MIN_TIME = 0.5
+
+def _best(run, repeat):
+    '''
+    Returns the best time per call of run out of repeat measurements, and
+    the value returned by the last call.
+    '''
+
+    best = None
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while (calls == 0 or time.perf_counter() - start < MIN_TIME):
+            value = run()
+            calls += 1
+        elapsed = (time.perf_counter() - start) / calls
+        best = elapsed if best is None else min(best, elapsed)
+    return (best, value)
+
+def _data_files_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path)
+               for f in files if f.endswith(".tar.gz"))
+
+def _read_lines(path):
+    reader = datanetAPI.DatanetAPI(path, parsing=datanetAPI.ParsingOptions(lazy=True))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [(s._results_line, s._traffic_line, s._flowresults_line, s._status_line) for s in reader]
+
+def bench_iterate(path, repeat, **options):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            reader = datanetAPI.DatanetAPI(path, cache=datanetAPI.CacheOptions(use_store=False), **options)
+            return sum(1 for _ in reader)
+    seconds, items = _best(run, repeat)
+    return (items, seconds, _data_files_size(path))
+
+def bench_iterate_cached(path, repeat, **options):
+    # Epochs after the first one, read from the epoch cache
+    reader = datanetAPI.DatanetAPI(path, cache=datanetAPI.CacheOptions(use_store=False, epoch_cache_size=1 << 30),
+                                   **options)
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sum(1 for _ in reader)
+    run()
+    seconds, items = _best(run, repeat)
+    return (items, seconds, _data_files_size(path))
+
+def bench_parser(path, repeat, array_mode):
+    lines = _read_lines(path)
+    reader = datanetAPI.DatanetAPI(path)
+    process = reader._process_flow_results_traffic_arrays if array_mode else reader._process_flow_results_traffic_line
+    def run():
+        for rline, tline, fline, sline in lines:
+            process(rline, tline, fline, sline, datanetAPI.Sample())
+    seconds, _ = _best(run, repeat)
+    return (len(lines), seconds, sum(len(l) for line in lines for l in line if l is not None))
+
+def bench_routing(path, repeat):
+    reader = datanetAPI.DatanetAPI(path)
+    graph = os.path.join(path, "graphs", os.listdir(os.path.join(path, "graphs"))[0])
+    topology = datanetAPI.topology._read_gml_topology(graph)
+    routings = [os.path.join(path, "routings", f) for f in sorted(os.listdir(os.path.join(path, "routings")))]
+    def run():
+        for routing in routings:
+            reader._create_routing_matrix(topology, routing)
+    seconds, _ = _best(run, repeat)
+    return (len(routings), seconds, sum(os.path.getsize(f) for f in routings))
+
+def bench_graph(path, repeat):
+    graphs = [os.path.join(path, "graphs", f) for f in sorted(os.listdir(os.path.join(path, "graphs")))]
+    def run():
+        for graph in graphs:
+            datanetAPI.topology._read_gml_topology(graph).to_networkx()
+    seconds, _ = _best(run, repeat)
+    return (len(graphs), seconds, sum(os.path.getsize(f) for f in graphs))
+
+# Benchmarks of the suite: function, its options and unit of the items
+BENCHMARKS = {
+    'iterate': (bench_iterate, {}, 'samples'),
+    'iterate_streaming': (bench_iterate, {'archive': datanetAPI.ArchiveOptions(streaming=True)}, 'samples'),
+    'iterate_arrays': (bench_iterate, {'parsing': datanetAPI.ParsingOptions(array_mode=True)}, 'samples'),
+    'iterate_compact': (bench_iterate, {'parsing': datanetAPI.ParsingOptions(compact=True)}, 'samples'),
+    'iterate_stats': (bench_iterate, {'stats': True}, 'samples'),
+    'iterate_epoch_cache': (bench_iterate_cached, {'parsing': datanetAPI.ParsingOptions(array_mode=True)}, 'samples'),
+    'parse_dicts': (bench_parser, {'array_mode': False}, 'samples'),
+    'parse_arrays': (bench_parser, {'array_mode': True}, 'samples'),
+    'routing_matrix': (bench_routing, {}, 'routings'),
+    'graph': (bench_graph, {}, 'graphs'),
+}
+
+def run_benchmark(name, dataset, path, repeat):
+    '''
+    Runs a benchmark in a new process and returns its results.
+    '''
+
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--run', name, path, str(repeat)],
+                            check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['dataset'] = dataset
+    return result
+
+def compare(results, baseline, tolerance):
+    '''
+    Prints the changes of results with respect to baseline and returns the
+    list of regressions.
+    '''
+
+    previous = {(r['name'], r['dataset']): r for r in baseline['results']}
+    regressions = []
+    for r in results['results']:
+        b = previous.get((r['name'], r['dataset']))
+        if (b is None):
+            continue
+        speed = r['items_per_s'] / b['items_per_s'] - 1
+        line = "%-20s %-6s throughput %+7.1f%%" % (r['name'], r['dataset'], speed * 100)
+        regressed = speed < -tolerance
+        if (r['peak_rss_mb'] is not None and b['peak_rss_mb'] is not None):
+            rss = r['peak_rss_mb'] / b['peak_rss_mb'] - 1
+            line += ", peak RSS %+7.1f%%" % (rss * 100)
+            regressed = regressed or rss > tolerance
+        print(line + ("  REGRESSION" if regressed else ""))
+        if (regressed):
+            regressions.append((r['name'], r['dataset']))
+    if (baseline['machine'] != results['machine']):
+        print("Warning: the baseline was obtained on another machine: %s" % baseline['machine'])
+    return regressions
+
+def main():
+    if (len(sys.argv) > 1 and sys.argv[1] == '--run'):
+        name, path, repeat = sys.argv[2], sys.argv[3], int(sys.argv[4])
+        function, options, unit = BENCHMARKS[name]
+        items, seconds, size = function(path, repeat, **options)
+        print(json.dumps({'name': name, 'unit': unit, 'items': items, 'seconds': seconds,
+                          'items_per_s': items / seconds, 'mb_per_s': size / seconds / 1e6,
+                          'peak_rss_mb': _peak_rss_mb()}))
+        return
+
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite of datanetAPI.")
+    parser.add_argument("--output", help="JSON file where the results are saved (e.g., a new baseline)")
+    parser.add_argument("--baseline", help="JSON file with the results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative change considered a regression")
+    parser.add_argument("--data-dir", help="directory where the synthetic datasets are kept between runs")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of every benchmark (the best is kept)")
+    parser.add_argument("--only", help="comma-separated benchmarks to run (all by default)")
+    args = parser.parse_args()
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        results = {'version': SUITE_VERSION,
+                   'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                               'numpy': numpy.__version__, 'cpus': os.cpu_count()},
+                   'results': []}
+        print("%-20s %-6s %10s %12s %10s %10s" % ("Benchmark", "Data", "Items", "Items/s", "MB/s", "Peak RSS"))
+        for dataset, config in DATASETS.items():
+            path = os.path.join(data_dir, dataset)
+            if (not os.path.isdir(path)):
+                generate_dataset(path, **config)
+            for name in names:
+                r = run_benchmark(name, dataset, path, args.repeat)
+                results['results'].append(r)
+                print("%-20s %-6s %10d %12.1f %10.2f %8.1f MB" % (name, dataset, r['items'], r['items_per_s'],
+                                                                  r['mb_per_s'], r['peak_rss_mb'] or 0))
+
+    if (args.output is not None):
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if (args.baseline is not None):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (len(compare(results, baseline, args.tolerance)) > 0):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+'''
+Generates synthetic datasets in the format read by datanetAPI, to test and
+benchmark the reader without the real datasets. A dataset directory holds a
+GML graph in graphs, shortest-path routing files in routings, and data files
+(results_<nodes>_<min>-<max>_<k>.tar.gz) with the simulationResults.txt,
+traffic.txt, stability.txt, input_files.txt and flowSimulationResults.txt
+files of every sample. Values are random but well-formed (e.g., delay
+percentiles are sorted and the global delay is the average delay of the
+src-dst pairs), and the same arguments always generate the same dataset.
+
+Usage: python synthetic_dataset.py <pathToDataset> [--nodes N] [--files F]
+       [--samples S] [--min-flows A] [--max-flows B] [--time-dists 0,1,...]
+       [--size-dists 0,1,...] [--routings R] [--unstable P] [--seed X]
+'''
+
+import os, sys, io, argparse, collections, gzip, random, tarfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datanetAPI import TimeDist, SizeDist, TIME_DIST_PARAMS
+
+def _write_graph(path, adjacency, ports, rng, num_tos):
+    '''
+    Writes the GML file of a directed graph given its adjacency lists and
+    the port of every link.
+    '''
+
+    weights = ','.join(str(100 // num_tos + (i < 100 % num_tos)) for i in range(num_tos))
+    with open(path, 'w') as f:
+        f.write('graph [\n  directed 1\n  multigraph 1\n')
+        for node in range(len(adjacency)):
+            f.write('  node [\n    id %d\n    label "%d"\n    levelsQoS %d\n    queueSizes "%s"\n'
+                    '    schedulingPolicy "WFQ"\n    schedulingWeights "%s"\n  ]\n' %
+                    (node, node, num_tos, ','.join(['32'] * num_tos), weights))
+        for node in range(len(adjacency)):
+            for neighbour in sorted(adjacency[node]):
+                f.write('  edge [\n    source %d\n    target %d\n    key 0\n    port %d\n    weight 1\n'
+                        '    bandwidth %d\n  ]\n' % (node, neighbour, ports[node][neighbour],
+                                                      rng.choice((10000, 25000, 40000))))
+        f.write(']\n')
+
+def _write_routing(path, adjacency, ports, rng):
+    '''
+    Writes a routing file with shortest paths (in number of hops, breaking
+    ties at random) between all the nodes: line i holds the output port of
+    node i towards every destination, or -1 for itself.
+    '''
+
+    num_nodes = len(adjacency)
+    next_port = [[-1] * num_nodes for _ in range(num_nodes)]
+    for dst in range(num_nodes):
+        # Breadth-first search from dst over the reversed links
+        previous = {dst: None}
+        pending = collections.deque([dst])
+        while (len(pending) > 0):
+            node = pending.popleft()
+            neighbours = sorted(adjacency[node])
+            rng.shuffle(neighbours)
+            for neighbour in neighbours:
+                if (neighbour not in previous):
+                    previous[neighbour] = node
+                    pending.append(neighbour)
+        for src in range(num_nodes):
+            if (src != dst):
+                next_port[src][dst] = ports[src][previous[src]]
+    with open(path, 'w') as f:
+        for src in range(num_nodes):
+            f.write(','.join(map(str, next_port[src])) + ',\n')
+
+def _flow_traffic(rng, time_dists, size_dists, num_tos, avg_bw):
+    '''
+    Returns the values of a flow in traffic.txt and its average packet size.
+    '''
+
+    time_dist = rng.choice(time_dists)
+    eq_lambda = round(avg_bw, 4)
+    params = [eq_lambda] + [round(rng.uniform(1, 1000), 4) for _ in TIME_DIST_PARAMS[time_dist][1:]]
+    size_dist = rng.choice(size_dists)
+    avg_size = 1000
+    if (size_dist == SizeDist.DETERMINISTIC_S):
+        size_params = [avg_size]
+    elif (size_dist in (SizeDist.UNIFORM_S, SizeDist.BINOMIAL_S)):
+        size_params = [avg_size, 300, 1700]
+    else:
+        candidates = rng.randint(1, 4)
+        sizes = [rng.randint(100, 1500) for _ in range(candidates)]
+        avg_size = round(sum(sizes) / candidates)
+        size_params = [avg_size, candidates]
+        for size in sizes:
+            size_params += [size, round(1.0 / candidates, 4)]
+    values = [int(time_dist)] + params + [int(size_dist)] + size_params + [rng.randrange(num_tos)]
+    return (','.join(map(str, values)), avg_size)
+
+def _measurements(rng, avg_bw, pkts_gen):
+    '''
+    Returns the 11 values of a src-dst pair or flow in simulationResults.txt
+    (see datanetAPI.PERF_COLUMNS) and its average delay.
+    '''
+
+    delay = rng.uniform(0.01, 10)
+    percentiles = sorted(delay * rng.uniform(0.5, 1.5) for _ in range(5))
+    values = [avg_bw, pkts_gen, pkts_gen * rng.uniform(0, 0.05), delay,
+              rng.uniform(-5, 2.3)] + percentiles + [delay * rng.uniform(0, 0.5)]
+    return (','.join('%.6g' % v for v in values), delay)
+
+def _sample_lines(rng, num_nodes, intensity, flows_per_pair, time_dists, size_dists, num_tos):
+    '''
+    Returns the lines of simulationResults.txt, traffic.txt and
+    flowSimulationResults.txt of a sample.
+    '''
+
+    results = []
+    traffic = []
+    flow_results = []
+    global_packets = 0
+    global_losses = 0
+    delays = []
+    for src in range(num_nodes):
+        for dst in range(num_nodes):
+            if (src == dst):
+                results.append(','.join(['0'] * 11))
+                flow_results.append(','.join(['0'] * 11))
+                traffic.append('-1')
+                continue
+            flows = []
+            flow_values = []
+            pair_bw = 0
+            pair_pkts = 0
+            for _ in range(rng.randint(*flows_per_pair)):
+                avg_bw = intensity * rng.uniform(0.5, 1.5) / flows_per_pair[1]
+                line, avg_size = _flow_traffic(rng, time_dists, size_dists, num_tos, avg_bw)
+                pkts_gen = avg_bw / avg_size
+                flows.append(line)
+                flow_values.append(_measurements(rng, avg_bw, pkts_gen)[0])
+                pair_bw += avg_bw
+                pair_pkts += pkts_gen
+            line, delay = _measurements(rng, pair_bw, pair_pkts)
+            results.append(line)
+            traffic.append(':'.join(flows))
+            flow_results.append(':'.join(flow_values))
+            global_packets += pair_pkts
+            global_losses += pair_pkts * rng.uniform(0, 0.05)
+            delays.append(delay)
+    header = '%.6g,%.6g,%.6g|' % (global_packets, global_losses, sum(delays) / max(len(delays), 1))
+    return (header + ';'.join(results) + ';\n',
+            '%d|' % intensity + ';'.join(traffic) + '\n',
+            ';'.join(flow_results) + ';\n')
+
+def _add_file(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+def generate_dataset(path, num_nodes=10, num_files=2, samples_per_file=10, flows_per_pair=(1, 3),
+                     time_dists=None, size_dists=None, num_routings=1, num_tos=3,
+                     intensity_range=(400, 2000), unstable_ratio=0.0, flow_results=True, seed=0):
+    '''
+    Generates a dataset directory at path.
+
+    Parameters
+    ----------
+    path : str
+        Dataset directory, created if needed.
+    num_nodes : int
+        Number of nodes of the network.
+    num_files : int
+        Number of data files.
+    samples_per_file : int
+        Number of samples (lines) of every data file.
+    flows_per_pair : (int, int)
+        Minimum and maximum number of flows of every src-dst pair.
+    time_dists, size_dists : list
+        Time and size distributions (TimeDist and SizeDist values) of the
+        flows, chosen at random for every flow. Values can be repeated to
+        make them more likely. By default, all of them.
+    num_routings : int
+        Number of routing files. Every sample uses one of them.
+    num_tos : int
+        Number of ToS (QoS classes) of the flows.
+    intensity_range : (int, int)
+        Range of the maxAvgLambda of the samples, also given in the names of
+        the data files.
+    unstable_ratio : float
+        Probability of a sample being an unstable simulation, which the
+        reader skips.
+    flow_results : boolean
+        Whether the data files include flowSimulationResults.txt.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    List with the paths of the data files.
+
+    '''
+
+    rng = random.Random(seed)
+    time_dists = list(time_dists if time_dists is not None else TimeDist)
+    size_dists = list(size_dists if size_dists is not None else SizeDist)
+    os.makedirs(os.path.join(path, "graphs"), exist_ok=True)
+    os.makedirs(os.path.join(path, "routings"), exist_ok=True)
+
+    # Ring with random chords, so that the graph is strongly connected
+    adjacency = [set() for _ in range(num_nodes)]
+    for node in range(num_nodes):
+        adjacency[node].add((node + 1) % num_nodes)
+        adjacency[(node + 1) % num_nodes].add(node)
+    for _ in range(num_nodes // 2):
+        a, b = rng.sample(range(num_nodes), 2)
+        adjacency[a].add(b)
+        adjacency[b].add(a)
+    ports = [{neighbour: port for port, neighbour in enumerate(sorted(adjacency[node]))}
+             for node in range(num_nodes)]
+    graph_file = "graph_%d.txt" % num_nodes
+    _write_graph(os.path.join(path, "graphs", graph_file), adjacency, ports, rng, num_tos)
+    routing_files = ["Routing_SP_k_%d.txt" % k for k in range(num_routings)]
+    for routing_file in routing_files:
+        _write_routing(os.path.join(path, "routings", routing_file), adjacency, ports, rng)
+
+    paths = []
+    for k in range(num_files):
+        name = "results_%d_%d-%d_%d" % (num_nodes, intensity_range[0], intensity_range[1], k)
+        lines = {'simulationResults.txt': [], 'traffic.txt': [], 'flowSimulationResults.txt': [],
+                 'stability.txt': [], 'input_files.txt': []}
+        for i in range(samples_per_file):
+            intensity = rng.randint(*intensity_range)
+            results, traffic, flows = _sample_lines(rng, num_nodes, intensity, flows_per_pair,
+                                                    time_dists, size_dists, num_tos)
+            lines['simulationResults.txt'].append(results)
+            lines['traffic.txt'].append(traffic)
+            lines['flowSimulationResults.txt'].append(flows)
+            status = "KO" if (rng.random() < unstable_ratio) else "OK"
+            lines['stability.txt'].append("%.6f;%s;0\n" % (rng.uniform(10, 100), status))
+            lines['input_files.txt'].append("%d;%s;%s\n" % (i, graph_file, rng.choice(routing_files)))
+        if (not flow_results):
+            del lines['flowSimulationResults.txt']
+        file_path = os.path.join(path, name + ".tar.gz")
+        # Without timestamps, so that the files are reproducible
+        with gzip.GzipFile(file_path, "wb", mtime=0) as gz, tarfile.open(fileobj=gz, mode="w") as tar:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            tar.addfile(info)
+            for member, member_lines in lines.items():
+                _add_file(tar, name + "/" + member, ''.join(member_lines).encode())
+        paths.append(file_path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic dataset.")
+    parser.add_argument("path", help="dataset directory")
+    parser.add_argument("--nodes", type=int, default=10, help="number of nodes")
+    parser.add_argument("--files", type=int, default=2, help="number of data files")
+    parser.add_argument("--samples", type=int, default=10, help="samples per data file")
+    parser.add_argument("--min-flows", type=int, default=1, help="minimum number of flows per src-dst pair")
+    parser.add_argument("--max-flows", type=int, default=3, help="maximum number of flows per src-dst pair")
+    parser.add_argument("--time-dists", help="comma-separated TimeDist values (all by default)")
+    parser.add_argument("--size-dists", help="comma-separated SizeDist values (all by default)")
+    parser.add_argument("--routings", type=int, default=1, help="number of routing files")
+    parser.add_argument("--unstable", type=float, default=0.0, help="ratio of unstable samples")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    time_dists = [TimeDist(int(v)) for v in args.time_dists.split(',')] if args.time_dists else None
+    size_dists = [SizeDist(int(v)) for v in args.size_dists.split(',')] if args.size_dists else None
+    paths = generate_dataset(args.path, args.nodes, args.files, args.samples, (args.min_flows, args.max_flows),
+                             time_dists, size_dists, args.routings, unstable_ratio=args.unstable, seed=args.seed)
+    print("Generated %d data files in %s" % (len(paths), args.path))
+
+if __name__ == '__main__':
+    main()
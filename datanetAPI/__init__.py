@@ -0,0 +1,34 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# DataNet API: reader of the samples of the datasets. The classes and
+# constants of the package are available from this module.
+
+from .archives import SAMPLE_FILES, ArchiveCodec, GzipCodec, ZstdCodec, Lz4Codec, GZIP_BACKENDS, ARCHIVE_CODECS
+from .sample import (TimeDist, SizeDist, TIME_DIST_PARAMS, SIZE_DIST_PARAMS, PERF_COLUMNS, ARRAY_FIELDS,
+                     SAMPLE_FIELDS, FLOW_TIME_PARAMS, FLOW_SIZE_PARAMS, Sample, CompactSample)
+from .stats import STATS_VERSION, STATS_GLOBAL_VALUES, READER_STAGES, SKIP_REASONS, ReaderStats
+from .topology import Topology, RoutingPaths
+from .store import STORE_VERSION, STORE_SCALARS, STORE_ARRAYS
+from .options import (ArchiveOptions, ParallelOptions, ParsingOptions, ShuffleOptions, ShardOptions, CacheOptions,
+                      FollowOptions, OPTION_GROUPS)
+from .reader import (INDEX_VERSION, INDEX_COLUMNS, FILTER_STAGES, STATE_VERSION, STATE_OPTIONS, MANIFEST_VERSION,
+                     MANIFEST_RACY_SECONDS, DatanetAPI)
+from .cli import transcode_dataset, main
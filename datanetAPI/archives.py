@@ -0,0 +1,432 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Readers and codecs of the data files of the datasets: tar archives compressed
+# with gzip, zstd or lz4, or uncompressed directories.
+
+import os, bisect, collections, importlib, io, time, zlib
+
+# Files of a sample archive read by the iterator, in the order their lines
+# are consumed for every sample.
+SAMPLE_FILES = ("simulationResults.txt", "traffic.txt", "flowSimulationResults.txt",
+                "stability.txt", "input_files.txt")
+
+class _CountingReader:
+    """
+    Read-only file wrapper that counts the bytes read through it. Seeks are
+    forwarded to the wrapped file when it supports them. If stats (a
+    ReaderStats instance) is given, the time spent reading is added to its
+    stage. If rewinds is true, the wrapped file is a gzip.GzipFile, and
+    bytes_inflated also counts the bytes it decompresses to seek: seeking
+    forward decompresses the data up to the new position, and seeking back
+    decompresses the file again from its start.
+    """
+    
+    def __init__(self, fileobj, stats=None, stage=None, rewinds=False):
+        self.fileobj = fileobj
+        self.bytes_read = 0
+        self.bytes_inflated = 0
+        self.stats = stats
+        self.stage = stage
+        self.rewinds = rewinds
+    
+    def read(self, size=-1):
+        if (self.stats is not None):
+            start = time.perf_counter()
+            data = self.fileobj.read(size)
+            self.stats.add_time(self.stage, time.perf_counter() - start)
+        else:
+            data = self.fileobj.read(size)
+        self.bytes_read += len(data)
+        self.bytes_inflated += len(data)
+        return data
+    
+    def readinto(self, buffer):
+        if (self.stats is not None):
+            start = time.perf_counter()
+            n = self.fileobj.readinto(buffer)
+            self.stats.add_time(self.stage, time.perf_counter() - start)
+        else:
+            n = self.fileobj.readinto(buffer)
+        self.bytes_read += n
+        self.bytes_inflated += n
+        return n
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return self.fileobj.seekable()
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if (not self.rewinds):
+            return self.fileobj.seek(offset, whence)
+        current = self.fileobj.tell()
+        pos = self.fileobj.seek(offset, whence)
+        self.bytes_inflated += pos if pos < current else pos - current
+        return pos
+    
+    def tell(self):
+        return self.fileobj.tell()
+    
+    def close(self):
+        self.fileobj.close()
+
+class _GzipCheckpointReader(io.RawIOBase):
+    """
+    Seekable read-only raw file object with the decompressed content of a
+    gzip file. While decompressing, a checkpoint with a copy of the state of
+    the decompressor is recorded every spacing bytes of decompressed data, so
+    that seeking to any position only needs decompressing the data from the
+    closest checkpoint before it. The lists of checkpoints can be shared by
+    several readers of the same file. Besides, the positions left by the
+    last max_recent seeks are recorded by each reader, so that reading
+    several members of a tar archive in parallel (i.e., seeking back and
+    forth between them) decompresses every member only once, whatever the
+    size of the archive. With spacing None, no checkpoint is recorded, and seeking back
+    decompresses the file again from the start (as gzip.GzipFile). As
+    gzip.GzipFile, files may contain several concatenated gzip members,
+    and zeros after them. bytes_decompressed counts all the bytes
+    decompressed, including those decompressed again when seeking.
+    """
+    
+    # Number of compressed bytes read from the file at once. Checkpoints keep
+    # the unconsumed part of the last chunk read.
+    chunk_size = 16 * 1024
+    
+    # Number of positions left by the last seeks whose state is kept.
+    max_recent = 8
+    
+    def __init__(self, fileobj, spacing, positions=None, states=None):
+        self.fileobj = fileobj
+        self.spacing = spacing
+        # Decompressed position of each checkpoint (sorted) and the
+        # corresponding (file position, pending input, inside a member,
+        # decompressor) tuple
+        self.positions = [] if positions is None else positions
+        self.states = [] if states is None else states
+        # (position, state) of the positions left by the last seeks
+        self._recent = collections.deque(maxlen=self.max_recent)
+        self.bytes_decompressed = 0
+        self._restart()
+    
+    def _restart(self):
+        self.fileobj.seek(0)
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._input = b''
+        self._in_member = False
+        self._pos = 0
+    
+    def _get_state(self):
+        return (self.fileobj.tell(), self._input, self._in_member, self._decompressor.copy())
+    
+    def _set_state(self, pos, state):
+        file_pos, self._input, self._in_member, decompressor = state
+        self.fileobj.seek(file_pos)
+        self._decompressor = decompressor.copy()
+        self._pos = pos
+    
+    def _inflate(self, size):
+        """
+        Returns up to size bytes decompressed from the current position, or
+        an empty bytes object at the end of the file.
+        """
+        
+        while(True):
+            if (not self._in_member):
+                # Zeros between or after the gzip members are skipped
+                self._input = self._input.lstrip(b'\x00')
+            if (len(self._input) == 0):
+                self._input = self.fileobj.read(self.chunk_size)
+                if (len(self._input) == 0):
+                    if (self._in_member):
+                        raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+                    return b''
+                continue
+            data = self._decompressor.decompress(self._input, size)
+            self._input = self._decompressor.unconsumed_tail
+            self._in_member = True
+            if (self._decompressor.eof):
+                # Files may contain several concatenated gzip members
+                self._input = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                self._in_member = False
+            if (len(data) > 0):
+                self._pos += len(data)
+                self.bytes_decompressed += len(data)
+                if (self.spacing is not None and
+                    (len(self.positions) == 0 or self._pos >= self.positions[-1] + self.spacing)):
+                    self.positions.append(self._pos)
+                    self.states.append(self._get_state())
+                return data
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self._pos
+    
+    def readinto(self, b):
+        # Reads are not short before the end of the file, since tarfile
+        # reads the archive directly
+        n = 0
+        while (n < len(b)):
+            data = self._inflate(len(b) - n)
+            if (len(data) == 0):
+                break
+            b[n:n+len(data)] = data
+            n += len(data)
+        return n
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if (whence == os.SEEK_CUR):
+            offset += self._pos
+        elif (whence == os.SEEK_END):
+            while(len(self._inflate(io.DEFAULT_BUFFER_SIZE)) > 0):
+                pass
+            offset += self._pos
+        if (self.spacing is not None and offset != self._pos):
+            # Closest recorded position before offset
+            best = None
+            i = bisect.bisect_right(self.positions, offset) - 1
+            if (i >= 0):
+                best = (self.positions[i], self.states[i])
+            for entry in self._recent:
+                if (entry[0] <= offset and (best is None or entry[0] > best[0])):
+                    best = entry
+            if (self._pos > 0 and (len(self.positions) == 0 or self._pos != self.positions[-1])):
+                self._recent.append((self._pos, self._get_state()))
+            if (best is not None and (offset < self._pos or best[0] > self._pos)):
+                if (best in self._recent):
+                    # Reading continues from it, and its new position is
+                    # recorded when seeking away again
+                    self._recent.remove(best)
+                self._set_state(*best)
+        if (offset < self._pos):
+            self._restart()
+        while(self._pos < offset):
+            if (len(self._inflate(min(offset - self._pos, 1024 * 1024))) == 0):
+                break
+        return self._pos
+    
+    def close(self):
+        if (not self.closed):
+            self.fileobj.close()
+        super().close()
+
+def _import_optional(*names):
+    """
+    Returns the first module in names that can be imported, or None if none
+    of them is installed.
+    """
+    
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            pass
+    return None
+
+class ArchiveCodec:
+    """
+    Compression format of the data files of a dataset, i.e., of the tar
+    archives containing a directory with the files in SAMPLE_FILES. Data
+    files are recognized by the suffix of their codec (see ARCHIVE_CODECS).
+    New formats can be supported by subclassing ArchiveCodec and adding an
+    instance to ARCHIVE_CODECS.
+    
+    Attributes
+    ----------
+    name : str
+        Name of the codec, as used by transcode_dataset.
+    suffix : str
+        Suffix of the names of the data files, e.g., '.tar.gz'.
+    """
+    
+    name = None
+    suffix = None
+    
+    def is_available(self):
+        """
+        Returns whether the modules needed by the codec are installed.
+        """
+        
+        return True
+    
+    def open_reader(self, fileobj):
+        """
+        Returns a file object reading the decompressed tar archive from the
+        compressed file object fileobj, which is not closed by it.
+        """
+        
+        raise NotImplementedError
+    
+    def open_writer(self, fileobj, level=None):
+        """
+        Returns a file object compressing the tar archive written to it into
+        fileobj. Closing it flushes the compressed data, but does not close
+        fileobj. level is the compression level, or None for the default
+        level of the codec.
+        """
+        
+        raise NotImplementedError
+
+class GzipCodec(ArchiveCodec):
+    """
+    Codec of the tar.gz data files. Files are decompressed with the fastest
+    zlib-compatible module installed (see GZIP_BACKENDS), unless a backend is
+    given. Note that the reader only uses it for sequential reads, i.e., in
+    streaming mode.
+    """
+    
+    name = 'gzip'
+    suffix = '.tar.gz'
+    
+    def __init__(self, backend=None):
+        if (backend is not None and backend not in GZIP_BACKENDS):
+            raise ValueError("Unknown gzip backend: %s" % backend)
+        self.backend = backend
+    
+    def _get_module(self):
+        if (self.backend is None):
+            return _import_optional(*GZIP_BACKENDS.values())
+        module = _import_optional(GZIP_BACKENDS[self.backend])
+        if (module is None):
+            raise ValueError("The %s gzip backend is not installed" % self.backend)
+        return module
+    
+    def open_reader(self, fileobj):
+        return self._get_module().open(fileobj, 'rb')
+    
+    def open_writer(self, fileobj, level=None):
+        if (level is None):
+            return self._get_module().open(fileobj, 'wb')
+        return self._get_module().open(fileobj, 'wb', compresslevel=level)
+
+class ZstdCodec(ArchiveCodec):
+    """
+    Codec of the tar.zst data files, compressed with Zstandard. Needs the
+    zstandard module.
+    """
+    
+    name = 'zstd'
+    suffix = '.tar.zst'
+    
+    def is_available(self):
+        return _import_optional('zstandard') is not None
+    
+    def open_reader(self, fileobj):
+        zstandard = _import_optional('zstandard')
+        if (zstandard is None):
+            raise ValueError("Reading tar.zst files needs the zstandard module")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, read_size=1024*1024, closefd=False)
+    
+    def open_writer(self, fileobj, level=None):
+        zstandard = _import_optional('zstandard')
+        if (zstandard is None):
+            raise ValueError("Writing tar.zst files needs the zstandard module")
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return compressor.stream_writer(fileobj, closefd=False)
+
+class Lz4Codec(ArchiveCodec):
+    """
+    Codec of the tar.lz4 data files, compressed with the LZ4 frame format.
+    Needs the lz4 module.
+    """
+    
+    name = 'lz4'
+    suffix = '.tar.lz4'
+    
+    def is_available(self):
+        return _import_optional('lz4.frame') is not None
+    
+    def open_reader(self, fileobj):
+        lz4_frame = _import_optional('lz4.frame')
+        if (lz4_frame is None):
+            raise ValueError("Reading tar.lz4 files needs the lz4 module")
+        return lz4_frame.open(fileobj, 'rb')
+    
+    def open_writer(self, fileobj, level=None):
+        lz4_frame = _import_optional('lz4.frame')
+        if (lz4_frame is None):
+            raise ValueError("Writing tar.lz4 files needs the lz4 module")
+        return lz4_frame.open(fileobj, 'wb', compression_level=0 if level is None else level)
+
+# Modules that can decompress the tar.gz data files, from the fastest. The
+# first one installed is used by default.
+GZIP_BACKENDS = collections.OrderedDict([('isal', 'isal.igzip'), ('zlib_ng', 'zlib_ng.gzip_ng'),
+                                         ('gzip', 'gzip')])
+
+# Codecs of the data files, indexed by name. Besides these, data files can be
+# uncompressed directories with the files in SAMPLE_FILES (see
+# transcode_dataset).
+ARCHIVE_CODECS = {codec.name: codec for codec in (GzipCodec(), ZstdCodec(), Lz4Codec())}
+
+# Size and modification time of a data file
+_DataFileStat = collections.namedtuple('_DataFileStat', ['st_size', 'st_mtime', 'st_mtime_ns'])
+
+def _stat_data_file(path):
+    """
+    Returns the size and modification time of a data file. For uncompressed
+    directories, the total size of the files of the sample and their latest
+    modification time.
+    """
+    
+    if (not os.path.isdir(path)):
+        stat = os.stat(path)
+        return _DataFileStat(stat.st_size, stat.st_mtime, stat.st_mtime_ns)
+    stats = [os.stat(os.path.join(path, name)) for name in SAMPLE_FILES
+             if os.path.isfile(os.path.join(path, name))]
+    return _DataFileStat(sum(st.st_size for st in stats), max(st.st_mtime for st in stats),
+                         max(st.st_mtime_ns for st in stats))
+
+def _is_data_directory(path):
+    """
+    Returns whether path is an uncompressed data directory.
+    """
+    
+    return os.path.isfile(os.path.join(path, SAMPLE_FILES[0]))
+
+def _find_codec(path):
+    """
+    Returns the ArchiveCodec of the data file path, or None if it is an
+    uncompressed directory.
+    """
+    
+    if (os.path.isdir(path)):
+        return None
+    for codec in ARCHIVE_CODECS.values():
+        if (path.endswith(codec.suffix)):
+            return codec
+    raise ValueError("Unknown data file format: " + path)
+
+def _list_data_files(root, dirs, files):
+    """
+    Returns the names of the data files and data directories of a dataset
+    directory, given the lists of subdirectories and files of root.
+    """
+    
+    suffixes = tuple(codec.suffix for codec in ARCHIVE_CODECS.values())
+    names = [f for f in files if f.endswith(suffixes)]
+    names.extend([d for d in dirs if d not in ("graphs", "routings") and _is_data_directory(os.path.join(root, d))])
+    return names
@@ -0,0 +1,202 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Transcoding of datasets and command line interface of the package.
+
+import os, tarfile, argparse, multiprocessing, shutil, tempfile, time
+from .archives import ARCHIVE_CODECS, _find_codec, _list_data_files
+from .options import ParallelOptions, CacheOptions
+from .reader import DatanetAPI
+
+def _read_data_file_members(path):
+    """
+    Yields a (name, size, file object) tuple for every file of the data file
+    or data directory path, where name is the path of the file inside the
+    archive (for data directories, the name of the directory without suffix
+    followed by the name of the file).
+    """
+    
+    codec = _find_codec(path)
+    if (codec is None):
+        for name in sorted(os.listdir(path)):
+            if (os.path.isfile(os.path.join(path, name))):
+                with open(os.path.join(path, name), 'rb') as f:
+                    yield (os.path.basename(path) + "/" + name, os.fstat(f.fileno()).st_size, f)
+        return
+    with open(path, 'rb') as raw:
+        reader = codec.open_reader(raw)
+        try:
+            with tarfile.open(fileobj=reader, mode='r|') as tar:
+                for member in tar:
+                    if (member.isfile()):
+                        yield (member.name, member.size, tar.extractfile(member))
+        finally:
+            reader.close()
+
+def _transcode_data_file(path, out_dir, codec_name, level=None):
+    """
+    Writes the data file or data directory path into the directory out_dir
+    using the codec codec_name of ARCHIVE_CODECS, or as an uncompressed data
+    directory if codec_name is 'dir'. The output is written to a temporary
+    file and then renamed. Returns the path of the output.
+    """
+    
+    name = os.path.basename(path)
+    source = _find_codec(path)
+    if (source is not None):
+        name = name[:-len(source.suffix)]
+    
+    if (codec_name == 'dir'):
+        out_path = os.path.join(out_dir, name)
+        tmp_path = tempfile.mkdtemp(dir=out_dir, prefix=".tmp_")
+        try:
+            for member, _, f in _read_data_file_members(path):
+                with open(os.path.join(tmp_path, os.path.basename(member)), 'wb') as out:
+                    shutil.copyfileobj(f, out)
+            if (os.path.isdir(out_path)):
+                shutil.rmtree(out_path)
+            os.replace(tmp_path, out_path)
+        except:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        return out_path
+    
+    codec = ARCHIVE_CODECS[codec_name]
+    out_path = os.path.join(out_dir, name + codec.suffix)
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            writer = codec.open_writer(out, level)
+            with tarfile.open(fileobj=writer, mode='w|', format=tarfile.GNU_FORMAT) as tar:
+                dir_name = None
+                for member, size, f in _read_data_file_members(path):
+                    # Same layout as the original archives: a directory with
+                    # the files of the samples
+                    if (dir_name != os.path.dirname(member)):
+                        dir_name = os.path.dirname(member)
+                        info = tarfile.TarInfo(dir_name)
+                        info.type = tarfile.DIRTYPE
+                        info.mode = 0o755
+                        tar.addfile(info)
+                    info = tarfile.TarInfo(member)
+                    info.size = size
+                    info.mode = 0o644
+                    tar.addfile(info, f)
+            writer.close()
+        os.replace(tmp_path, out_path)
+    except:
+        os.unlink(tmp_path)
+        raise
+    return out_path
+
+def transcode_dataset(src, dst, codec='zstd', level=None, num_workers=None):
+    """
+    Rewrites the dataset directories found in src into dst, keeping the
+    directory structure. The graphs and routings directories are copied, and
+    every data file is written with another codec, so that it can be read
+    faster by DatanetAPI, which reads any of the formats transparently.
+
+    Parameters
+    ----------
+    src : str
+        Folder where the dataset is stored.
+    dst : str
+        Folder where the new dataset is written. It must be different from
+        src, since data files with different codecs in the same directory
+        would be read twice.
+    codec : str
+        Name of the codec of the new data files (see ARCHIVE_CODECS), or
+        'dir' to write every data file as an uncompressed directory. By
+        default 'zstd'.
+    level : int
+        Compression level. By default, the default level of the codec.
+    num_workers : int
+        Number of processes transcoding data files in parallel. By default,
+        one per CPU.
+
+    Returns
+    -------
+    List with the paths of the new data files.
+
+    """
+    
+    if (codec != 'dir' and codec not in ARCHIVE_CODECS):
+        raise ValueError("Unknown codec: %s" % codec)
+    if (codec != 'dir' and not ARCHIVE_CODECS[codec].is_available()):
+        raise ValueError("The modules needed by the %s codec are not installed" % codec)
+    if (os.path.abspath(src) == os.path.abspath(dst)):
+        raise ValueError("The source and destination folders must be different")
+    
+    tasks = []
+    for root, dirs, files in os.walk(src):
+        if ("graphs" not in dirs or "routings" not in dirs):
+            continue
+        out_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(out_root, exist_ok=True)
+        for name in ("graphs", "routings"):
+            shutil.copytree(os.path.join(root, name), os.path.join(out_root, name), dirs_exist_ok=True)
+        data_files = _list_data_files(root, dirs, files)
+        tasks.extend([(os.path.join(root, f), out_root, codec, level) for f in data_files])
+        dirs[:] = [d for d in dirs if d not in data_files]
+    
+    if (num_workers is None):
+        num_workers = os.cpu_count() or 1
+    num_workers = min(num_workers, len(tasks))
+    if (num_workers > 1):
+        with multiprocessing.get_context().Pool(num_workers) as pool:
+            return pool.starmap(_transcode_data_file, tasks)
+    return [_transcode_data_file(*task) for task in tasks]
+
+def main(args=None):
+    """
+    Command line interface of the package:
+        python -m datanetAPI transcode <src> <dst> [--codec C] [--level L]
+                                                   [--workers W]
+    rewrites the dataset in src into dst with another codec (see
+    transcode_dataset), and
+        python -m datanetAPI ingest <dataset> [--cache-dir D] [--workers W]
+    builds the columnar store of a dataset (see DatanetAPI.build_store).
+    """
+    
+    parser = argparse.ArgumentParser(prog="python -m datanetAPI")
+    commands = parser.add_subparsers(dest='command', required=True)
+    transcode = commands.add_parser('transcode', help="rewrite a dataset with another codec")
+    transcode.add_argument('src', help="folder where the dataset is stored")
+    transcode.add_argument('dst', help="folder where the new dataset is written")
+    transcode.add_argument('--codec', default='zstd', choices=sorted(ARCHIVE_CODECS) + ['dir'],
+                           help="codec of the new data files, or 'dir' for uncompressed directories (default: zstd)")
+    transcode.add_argument('--level', type=int, default=None, help="compression level")
+    transcode.add_argument('--workers', type=int, default=None, help="number of processes (default: one per CPU)")
+    ingest = commands.add_parser('ingest', help="build the columnar store of a dataset")
+    ingest.add_argument('dataset', help="folder where the dataset is stored")
+    ingest.add_argument('--cache-dir', default=None, help="cache directory (see the cache_dir option)")
+    ingest.add_argument('--workers', type=int, default=0, help="number of processes (default: one per CPU)")
+    args = parser.parse_args(args)
+    
+    if (args.command == 'transcode'):
+        start = time.perf_counter()
+        paths = transcode_dataset(args.src, args.dst, args.codec, args.level, args.workers)
+        print("Transcoded %d data files in %.1f s" % (len(paths), time.perf_counter() - start))
+    elif (args.command == 'ingest'):
+        start = time.perf_counter()
+        reader = DatanetAPI(args.dataset, parallel=ParallelOptions(num_workers=args.workers),
+                            cache=CacheOptions(cache_dir=args.cache_dir))
+        built = reader.build_store()
+        print("Built %d store segments in %.1f s" % (built, time.perf_counter() - start))
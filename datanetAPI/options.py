@@ -0,0 +1,308 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Statistics of the values of the dataset (see DatanetAPI.compute_statistics)
+# and instrumentation of the reader (see ReaderStats).
+# Groups of options of DatanetAPI, given to it as small config objects
+# instead of one keyword argument per option.
+
+import collections
+
+from .archives import GZIP_BACKENDS
+from .sample import SAMPLE_FIELDS
+
+class _Options:
+    """
+    Base class of the groups of options. Every group has one keyword
+    argument per option, whose values are kept in attributes with the same
+    names, and compares equal to other instances with the same values.
+    """
+    
+    # Names of the options of the group, in the order of __init__
+    names = ()
+    
+    # Prefix of the attributes of DatanetAPI where the options are kept
+    prefix = ''
+    
+    def as_dict(self):
+        """
+        Returns the options of the group as a dictionary, that can be given
+        back to the class as keyword arguments.
+        """
+        
+        return {name: getattr(self, name) for name in self.names}
+    
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+    
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % (name, getattr(self, name))
+                                                          for name in self.names))
+
+class ArchiveOptions(_Options):
+    """
+    How the data files are decompressed.
+
+    Parameters
+    ----------
+    streaming: boolean
+        Specify if every archive should be decompressed in a single
+        sequential pass, buffering the content of each file of the archive,
+        instead of reading all the files of the archive in parallel. By
+        default false
+    checkpoints: boolean
+        Specify if tar.gz files should be read with a gzip decompressor
+        recording checkpoints of its state, so that seeking in a tar.gz file
+        only decompresses from the closest checkpoint. Without streaming,
+        the files of a sample are then read decompressing the archive twice
+        (once to find them), instead of decompressing it again every time
+        tarfile's reader seeks back. By default false
+    checkpoint_spacing: int
+        Number of decompressed bytes between checkpoints. By default 1 MiB
+    gzip_backend: str
+        Module decompressing the tar.gz files in streaming mode, one of
+        GZIP_BACKENDS. By default the fastest one installed
+
+    """
+    
+    names = ('streaming', 'checkpoints', 'checkpoint_spacing', 'gzip_backend')
+    
+    def __init__(self, streaming=False, checkpoints=False, checkpoint_spacing=1024*1024, gzip_backend=None):
+        if (gzip_backend is not None and gzip_backend not in GZIP_BACKENDS):
+            raise ValueError("Unknown gzip backend: %s" % gzip_backend)
+        self.streaming = streaming
+        self.checkpoints = checkpoints
+        self.checkpoint_spacing = checkpoint_spacing
+        self.gzip_backend = gzip_backend
+
+class ParallelOptions(_Options):
+    """
+    How the data files are read in the background.
+
+    Parameters
+    ----------
+    num_workers: int
+        Number of worker processes reading and processing the data files.
+        By default 0, i.e., files are read by the process iterating over
+        the samples
+    ordered: boolean
+        Specify if the samples read by the workers should be produced in the
+        same order as without workers. Otherwise they are produced as soon
+        as they are read. By default true
+    queue_size: int
+        Maximum number of samples read in advance by the workers, besides
+        those of the files read ahead in ordered mode. By default 64
+    prefetch: int
+        Number of samples read in advance by a background thread. By
+        default 0, i.e., no thread
+
+    """
+    
+    names = ('num_workers', 'ordered', 'queue_size', 'prefetch')
+    
+    def __init__(self, num_workers=0, ordered=True, queue_size=64, prefetch=0):
+        self.num_workers = num_workers
+        self.ordered = ordered
+        self.queue_size = queue_size
+        self.prefetch = prefetch
+
+class ParsingOptions(_Options):
+    """
+    How the lines of the samples are parsed.
+
+    Parameters
+    ----------
+    array_mode: boolean
+        Specify if the lines of every sample should be parsed in bulk into
+        numpy arrays, building performance_matrix and traffic_matrix from
+        them when accessed. Always set with lazy, compact or fields. By
+        default false
+    lazy: boolean
+        Specify if every part of a sample should only be parsed the first
+        time it is accessed. By default false
+    fields: list
+        Parts of the samples to read, among SAMPLE_FIELDS. Parts not in the
+        list are never parsed. By default all of them
+    compact: boolean
+        Specify if CompactSample instances, with a small memory footprint,
+        should be produced. By default false
+
+    """
+    
+    names = ('array_mode', 'lazy', 'fields', 'compact')
+    
+    def __init__(self, array_mode=False, lazy=False, fields=None, compact=False):
+        if (fields is None):
+            fields = SAMPLE_FIELDS
+        for field in fields:
+            if (field not in SAMPLE_FIELDS):
+                raise ValueError("Unknown field: %s" % field)
+        self.lazy = lazy
+        self.fields = tuple(fields)
+        self.compact = compact
+        self.array_mode = array_mode or lazy or compact or len(self.fields) != len(SAMPLE_FIELDS)
+
+class ShuffleOptions(_Options):
+    """
+    How the samples are mixed, besides shuffling the data files with the
+    shuffle option of DatanetAPI.
+
+    Parameters
+    ----------
+    seed: int
+        Seed used to shuffle the dataset, together with the epoch (see
+        DatanetAPI.set_epoch). By default 1234
+    interleave: int
+        Number of data files read at the same time, taking every sample from
+        one of them chosen at random. By default 1
+    shuffle_buffer: int
+        Size of the buffer used to shuffle the samples read. By default 0,
+        i.e., no buffer
+
+    """
+    
+    names = ('seed', 'interleave', 'shuffle_buffer')
+    
+    def __init__(self, seed=1234, interleave=1, shuffle_buffer=0):
+        self.seed = seed
+        self.interleave = interleave
+        self.shuffle_buffer = shuffle_buffer
+
+class ShardOptions(_Options):
+    """
+    Shard of the dataset read.
+
+    Parameters
+    ----------
+    rank, world_size: int
+        Shard to read and number of shards the dataset is split into, e.g.,
+        for data-parallel training. By default 0 and 1, i.e., no sharding
+    loader_worker_id, num_loader_workers: int
+        Shard to read and number of shards the shard of the rank is further
+        split into, e.g., for the workers of a data loader. By default 0
+        and 1
+    drop_remainder: boolean
+        Specify if all the shards should have the same number of samples,
+        dropping the last samples of the dataset if needed. This needs the
+        index of all the data files. By default true if world_size is
+        greater than 1, so that all the ranks read the same number of
+        samples, and false otherwise
+
+    """
+    
+    names = ('rank', 'world_size', 'loader_worker_id', 'num_loader_workers', 'drop_remainder')
+    
+    def __init__(self, rank=0, world_size=1, loader_worker_id=0, num_loader_workers=1, drop_remainder=None):
+        if (not 0 <= rank < world_size):
+            raise ValueError("rank must be in [0, world_size)")
+        if (not 0 <= loader_worker_id < num_loader_workers):
+            raise ValueError("loader_worker_id must be in [0, num_loader_workers)")
+        if (drop_remainder is None):
+            drop_remainder = world_size > 1
+        self.rank = rank
+        self.world_size = world_size
+        self.loader_worker_id = loader_worker_id
+        self.num_loader_workers = num_loader_workers
+        self.drop_remainder = drop_remainder
+
+class CacheOptions(_Options):
+    """
+    Files generated from the dataset and data kept in memory.
+
+    Parameters
+    ----------
+    cache_dir: str
+        Directory where the index, the columnar store and the other files
+        generated from the dataset are stored. By default a '.datanetAPI'
+        directory inside every dataset directory
+    use_index: boolean
+        Specify if the dataset index should be used to skip the data files
+        without samples in the intensity range or accepted by the filters.
+        By default false
+    use_store: boolean
+        Specify if the data files with a segment in the columnar store
+        should be read from the store. Whether there is a store is checked
+        once per dataset directory and epoch. By default true
+    topology_cache: boolean
+        Specify if graphs and routing paths should be saved in the cache
+        directory and loaded from there while their files do not change. By
+        default None, i.e., only if cache_dir is given
+    max_topologies, max_topology_memory: int
+        Maximum number of graphs and routing paths kept in memory, and
+        maximum bytes used by them. By default 64 and no limit
+    manifest: boolean
+        Specify if the data files found should be recorded in a manifest in
+        the cache directory, so that only the directories that changed are
+        listed again. By default None, i.e., only if cache_dir is given
+    epoch_cache_size: int
+        Size in bytes of the shared memory cache keeping the samples parsed
+        in the first epoch. By default 0, i.e., no cache
+    epoch_cache_policy: str
+        What to do when a data file does not fit in the epoch cache: 'lru'
+        removes the least recently used files, and 'pin' keeps the first
+        files cached. By default 'lru'
+
+    """
+    
+    names = ('cache_dir', 'use_index', 'use_store', 'topology_cache', 'max_topologies', 'max_topology_memory',
+             'manifest', 'epoch_cache_size', 'epoch_cache_policy')
+    
+    def __init__(self, cache_dir=None, use_index=False, use_store=True, topology_cache=None, max_topologies=64,
+                 max_topology_memory=None, manifest=None, epoch_cache_size=0, epoch_cache_policy='lru'):
+        if (epoch_cache_policy not in ('lru', 'pin')):
+            raise ValueError("Unknown epoch cache policy: %s" % epoch_cache_policy)
+        self.cache_dir = cache_dir
+        self.use_index = use_index
+        self.use_store = use_store
+        self.topology_cache = topology_cache
+        self.max_topologies = max_topologies
+        self.max_topology_memory = max_topology_memory
+        self.manifest = manifest
+        self.epoch_cache_size = epoch_cache_size
+        self.epoch_cache_policy = epoch_cache_policy
+
+class FollowOptions(_Options):
+    """
+    Follow mode: once all the data files were read, the iterator keeps
+    waiting for new data files.
+
+    Parameters
+    ----------
+    interval: float
+        Seconds between checks for new data files. By default 10
+    timeout: float
+        Seconds without new data files after which the iteration ends. By
+        default None, i.e., it never ends
+
+    """
+    
+    names = ('interval', 'timeout')
+    prefix = 'follow_'
+    
+    def __init__(self, interval=10, timeout=None):
+        self.interval = interval
+        self.timeout = timeout
+
+# Groups of options of DatanetAPI, indexed by the keyword argument receiving
+# them. Only the follow group is None by default (no follow mode).
+OPTION_GROUPS = collections.OrderedDict([('archive', ArchiveOptions), ('parallel', ParallelOptions),
+                                         ('parsing', ParsingOptions), ('shuffling', ShuffleOptions),
+                                         ('sharding', ShardOptions), ('cache', CacheOptions),
+                                         ('follow', FollowOptions)])
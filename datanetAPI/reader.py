@@ -0,0 +1,2912 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Iterator over the samples of a dataset.
+
+import os, tarfile, numpy, math, networkx, queue, random, traceback, collections, copy, fractions, gzip, hashlib, heapq, io, json, multiprocessing, pickle, shutil, tempfile, threading, time
+from .archives import (SAMPLE_FILES, _CountingReader, _GzipCheckpointReader, GzipCodec,
+                       _stat_data_file, _find_codec, _list_data_files)
+from .sample import (TimeDist, SizeDist, PERF_COLUMNS, ARRAY_FIELDS, SAMPLE_FIELDS, _parse_sample_header,
+                     _parse_sample_arrays, Sample, CompactSample)
+from .stats import _StatsAccumulator, STATS_VERSION, STATS_GLOBAL_VALUES, ReaderStats
+from .topology import _routing_paths_from_next_hops, _read_gml_topology, Topology, RoutingPaths
+from .store import (_LRUCache, _atomic_write, _dump_cached, _load_cached, STORE_VERSION, STORE_SCALARS,
+                    STORE_ARRAYS, _StoreSegment, _write_store_segment, _EpochCache)
+from .options import OPTION_GROUPS
+
+def _parallel_reader_worker(reader, tasks, results):
+    """
+    Entry point of the worker processes of the parallel reader. Reads the data
+    files received through tasks until a None is received, and sends the
+    messages below through results:
+        ('sample', idx, s) for every Sample s read from file idx (pickled).
+        ('done', idx, None) when file idx has been completely read.
+        ('error', idx, (e, traceback)) if reading file idx failed, with the
+            exception e (pickled) and its formatted traceback.
+        ('exit', None, (read_stats, stats)) before finishing.
+    """
+    
+    # Only the counters of this process are sent back
+    for key in reader.read_stats:
+        reader.read_stats[key] = 0
+    if (reader.stats is not None):
+        reader.stats.reset()
+    for idx, *task in iter(tasks.get, None):
+        try:
+            for s in reader._read_samples(*task):
+                # Pickled here so that errors are reported as any other error
+                # instead of being lost in the feeder thread of the queue
+                results.put(('sample', idx, pickle.dumps(s, pickle.HIGHEST_PROTOCOL)))
+        except Exception as e:
+            try:
+                error = pickle.dumps(e, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                error = pickle.dumps(RuntimeError(repr(e)), pickle.HIGHEST_PROTOCOL)
+            results.put(('error', idx, (error, traceback.format_exc())))
+            break
+        results.put(('done', idx, None))
+    results.put(('exit', None, (reader.read_stats, reader.stats)))
+
+def _build_archive_index_worker(reader, root, file):
+    """
+    Entry point of the worker processes building the dataset index.
+    """
+    
+    return reader._build_archive_index(root, file)
+
+def _build_store_segment_worker(reader, root, file):
+    """
+    Entry point of the worker processes building the columnar store.
+    """
+    
+    reader._build_store_segment(root, file)
+
+def _task_statistics_worker(reader, task, fields, levels, relative_accuracy, cache):
+    """
+    Entry point of the worker processes computing the dataset statistics.
+    """
+    
+    return reader._task_statistics(task, fields, levels, relative_accuracy, cache)
+
+# Version of the format of the index files. Index files with a different
+# version are rebuilt.
+INDEX_VERSION = 3
+
+# Values stored in the index for every line of a data file
+INDEX_COLUMNS = ('ok', 'maxAvgLambda', 'global_packets', 'global_losses', 'global_delay',
+                 'sim_time', 'net_size', 'graph_file', 'routing_file', 'offsets')
+
+# Values of the samples that can be filtered with the filters option, grouped
+# by the stage of the reading process where they are known. Every filter is
+# evaluated at its stage, so samples rejected by the first stages are never
+# parsed:
+#     'file' : path of the data file, before opening it.
+#     'input_files' : simulation time (stability.txt) and graph and routing
+#         files (input_files.txt) of the sample, before decoding the rest of
+#         its lines.
+#     'header' : global values, maxAvgLambda and network size of the sample,
+#         parsed from the first values of its lines (see _parse_sample_header).
+#     'sample' : the Sample instance, after parsing it (its routing matrix
+#         and topology object are not set yet).
+FILTER_STAGES = collections.OrderedDict([
+    ('file', ('file',)),
+    ('input_files', ('sim_time', 'graph_file', 'routing_file')),
+    ('header', ('global_packets', 'global_losses', 'global_delay', 'maxAvgLambda', 'net_size')),
+    ('sample', ('sample',))])
+
+# Version of the iterator state returned by DatanetAPI.state_dict
+STATE_VERSION = 2
+
+# Options of DatanetAPI saved in the iterator state (see state_dict), besides
+# the groups of OPTION_GROUPS. Filters and callbacks can not be saved.
+STATE_OPTIONS = ('data_folder', 'intensity_values', 'shuffle')
+
+# Version of the format of the manifest of data_folder (see the manifest
+# option). Manifests with a different version are rebuilt.
+MANIFEST_VERSION = 1
+
+# Directories whose modification time is less than this number of seconds
+# older than the moment they are listed are listed again the next time, as
+# files added in the same tick of the clock would not change it.
+MANIFEST_RACY_SECONDS = 2
+
+class DatanetAPI:
+    """
+    Class containing all the functionalities to read the dataset line by line
+    by means of an iteratos, and generate a Sample instance with the
+    information gathered.
+    """
+    
+    def __init__ (self, data_folder, intensity_values = [], shuffle=False, archive=None, parallel=None,
+                  parsing=None, shuffling=None, sharding=None, cache=None, follow=None, filters=None,
+                  stats=False, stats_callback=None):
+        """
+        Initialization of the PasringTool instance
+
+        Parameters
+        ----------
+        data_folder : str
+            Folder where the dataset is stored.
+        dict_queue : Queue
+            Auxiliar data structures used to conveniently move information
+            between the file where they are read, and the matrix where they
+            are located.
+        intensity_values : int or array [x, y]
+            User-defined intensity values used to constrain the reading process
+            to these/this value/range of values.
+        shuffle: boolean
+            Specify if all files should be shuffled. By default false
+        archive: ArchiveOptions
+            How the data files are decompressed: streaming, checkpoints,
+            checkpoint_spacing and gzip_backend. By default
+            ArchiveOptions()
+        parallel: ParallelOptions
+            How the data files are read in the background: num_workers,
+            ordered, queue_size and prefetch. By default ParallelOptions(),
+            i.e., files are read by the process iterating over the samples
+        parsing: ParsingOptions
+            How the samples are parsed: array_mode, lazy, fields and
+            compact. By default ParsingOptions()
+        shuffling: ShuffleOptions
+            How the samples are mixed: seed, interleave and shuffle_buffer.
+            By default ShuffleOptions()
+        sharding: ShardOptions
+            Shard of the dataset to read: rank, world_size,
+            loader_worker_id, num_loader_workers and drop_remainder. By
+            default ShardOptions(), i.e., no sharding
+        cache: CacheOptions
+            Files generated from the dataset and data kept in memory:
+            cache_dir, use_index, use_store, topology_cache, max_topologies,
+            max_topology_memory, manifest, epoch_cache_size and
+            epoch_cache_policy. By default CacheOptions()
+        follow: FollowOptions
+            If given, the iterator keeps waiting for new data files once all
+            of them were read, checking for them every interval seconds
+            until timeout. By default None, i.e., no follow mode
+        filters: dictionary
+            Predicates of the samples to produce, indexed by the value they
+            receive (see add_filter). By default no filters
+        stats: boolean
+            Specify if the reading process should be instrumented, keeping
+            the counters in the stats attribute (a ReaderStats instance).
+            The read_stats counters are only updated with this option. By
+            default false
+        stats_callback: function
+            Function called as callback(event, stats) after reading every
+            data file and at the end of the iteration, instead of printing
+            the progress messages (see ReaderStats). Implies stats. By
+            default None
+
+        The options of every group are available as attributes of the
+        instance with the same names (follow_interval and follow_timeout for
+        those of follow, whose follow attribute is a boolean).
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        self.data_folder = data_folder
+        self.dict_queue = queue.Queue()
+        self.intensity_values = intensity_values
+        self.shuffle = shuffle
+        groups = {'archive': archive, 'parallel': parallel, 'parsing': parsing, 'shuffling': shuffling,
+                  'sharding': sharding, 'cache': cache, 'follow': follow}
+        for group, cls in OPTION_GROUPS.items():
+            options = groups[group]
+            if (options is None):
+                options = cls()
+            elif (not isinstance(options, cls)):
+                raise TypeError("%s must be a %s instance" % (group, cls.__name__))
+            for name, value in options.as_dict().items():
+                setattr(self, cls.prefix + name, value)
+        self.follow = follow is not None
+        self._gzip_checkpoints = {}
+        self.epoch = 0
+        self._sample_list = None
+        # Dataset index, only loaded with the use_index option
+        self._index = {}
+        # Position of the current iteration (see state_dict), and iterator
+        # state to resume in the next iteration (see load_state_dict)
+        self._position = None
+        self._resume_state = None
+        # Graphs and routing paths used by the last samples, indexed by
+        # ('graph' or 'routing', dataset directory, file name). They are kept
+        # for the next epochs.
+        self._topologies = _LRUCache(self.max_topologies, self.max_topology_memory)
+        self.filters = {}
+        for key, predicate in (filters or {}).items():
+            self.add_filter(key, predicate)
+        # Segments of the columnar store opened last, indexed by (dataset
+        # directory, file name)
+        self._store_segments = _LRUCache(self.max_store_segments)
+        # Whether every dataset directory has a store, probed once
+        self._store_roots = {}
+        self._archive_cache = None
+        self.read_stats = {'archives': 0,
+                           'archive_bytes': 0,
+                           'compressed_bytes': 0,
+                           'decompressed_bytes': 0,
+                           'read_time': 0.0}
+        # Directories of data_folder (see _scan_manifest), loaded the first
+        # time they are needed, and size of the data files found
+        self._manifest = None
+        self._data_file_sizes = {}
+        if (self.follow and self._num_shards() > 1):
+            raise ValueError("The follow option can not be used with shards")
+        # Created here so that it is shared by all the copies of this instance
+        if (self.epoch_cache_size > 0):
+            self._epoch_cache = _EpochCache(self.epoch_cache_size, self.epoch_cache_policy,
+                                            self.max_epoch_cache_files)
+        else:
+            self._epoch_cache = None
+        # Instrumentation of the reading process, only if requested
+        if (stats or stats_callback is not None):
+            self.stats = ReaderStats(self.read_stats, stats_callback)
+        else:
+            self.stats = None
+
+    def get_options(self, group):
+        """
+        Returns the options of the group (a key of OPTION_GROUPS) of this
+        instance as a new config object, or None for follow without follow
+        mode.
+        """
+        
+        cls = OPTION_GROUPS[group]
+        if (group == 'follow' and not self.follow):
+            return None
+        return cls(**{name: getattr(self, cls.prefix + name) for name in cls.names})
+
+    # Maximum number of bytes of a file of an archive that the streaming reader
+    # keeps in memory before spilling it to a temporary file.
+    spool_max_size = 64 * 1024 * 1024
+
+    # Maximum number of data files whose gzip checkpoints are kept in memory.
+    max_checkpoint_archives = 16
+
+    # Size of the read buffer of the files opened with gzip checkpoints.
+    checkpoint_buffer_size = 64 * 1024
+
+    # Maximum number of segments of the columnar store kept open.
+    max_store_segments = 64
+
+    # Maximum number of data files in the epoch cache.
+    max_epoch_cache_files = 16384
+
+    def _open_gzip(self, path, compressed):
+        """
+        Returns a seekable raw file object (a _GzipCheckpointReader) with the
+        decompressed content of the data file path, whose compressed bytes
+        are read from compressed. Seeks are served from the gzip checkpoints
+        of the file, which are recorded in memory the first time it is
+        decompressed and shared by all the file objects opened by this
+        instance. It is not buffered, so that the positions left by seeks
+        are those where the reads continue later.
+        """
+        
+        stat = os.stat(path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        checkpoints = self._gzip_checkpoints.pop(path, None)
+        if (checkpoints is None or checkpoints[0] != key):
+            checkpoints = (key, [], [])
+            if (len(self._gzip_checkpoints) >= self.max_checkpoint_archives):
+                del self._gzip_checkpoints[next(iter(self._gzip_checkpoints))]
+        # Reinserted to keep the most recently used files at the end
+        self._gzip_checkpoints[path] = checkpoints
+        return _GzipCheckpointReader(compressed, self.checkpoint_spacing, checkpoints[1], checkpoints[2])
+
+    def _open_archive(self, path, streaming=None, file_names=None, member_offsets=None):
+        """
+        Opens a dataset archive and returns a file object for each of the
+        files listed in SAMPLE_FILES.
+
+        Parameters
+        ----------
+        path : str
+            Path of the data file (see ARCHIVE_CODECS) or data directory.
+        streaming : boolean
+            Whether to read the archive in a single pass. By default, the
+            streaming option of this instance.
+        file_names : list
+            Files of the archive to open. By default all the files in
+            SAMPLE_FILES, except flowSimulationResults.txt if the
+            'flow_performance' field was not requested.
+        member_offsets : dictionary
+            If given and streaming, the offset of the content of each opened
+            file in the decompressed archive is stored in it.
+
+        Returns
+        -------
+        files : dictionary
+            Dictionary where keys are the names in SAMPLE_FILES and values are
+            file objects placed at the first line of the file, or None if the
+            archive does not contain it.
+        close : function
+            Function releasing all the resources used to read the archive and
+            updating read_stats.
+
+        """
+        
+        stats = self.stats
+        # Bytes and times are only measured with the stats option
+        start = time.perf_counter() if stats is not None else None
+        if (file_names is None):
+            file_names = [f for f in SAMPLE_FILES if f != "flowSimulationResults.txt" or 'flow_performance' in self.fields]
+        codec = self._get_codec(path)
+        if (codec is None):
+            return self._open_directory(path, file_names, start)
+        raw = open(path, 'rb')
+        compressed = _CountingReader(raw) if stats is not None else raw
+        reader = None
+        decompressed = None
+        if (streaming is None):
+            streaming = self.streaming
+        # Only gzip streams can be read seeking back and forth
+        streaming = streaming or not isinstance(codec, GzipCodec)
+        files = dict.fromkeys(SAMPLE_FILES)
+        try:
+            if (streaming):
+                # Single sequential pass over the compressed stream. Each file
+                # is buffered so that its lines can be later consumed in
+                # parallel with the lines of the other files without seeking.
+                reader = codec.open_reader(compressed)
+                decompressed = _CountingReader(reader, stats, 'decompress') if stats is not None else reader
+                tar = tarfile.open(fileobj=decompressed, mode='r|')
+                dir_info = tar.next()
+                for member in tar:
+                    dir_name, file_name = os.path.split(member.name)
+                    if (member.isfile() and dir_name == dir_info.name and file_name in file_names):
+                        if (member_offsets is not None):
+                            member_offsets[file_name] = member.offset_data
+                        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_max_size)
+                        shutil.copyfileobj(tar.extractfile(member), spool)
+                        spool.seek(0)
+                        files[file_name] = spool
+                tar.close()
+                reader.close()
+                raw.close()
+            else:
+                if (self.checkpoints):
+                    # Files are read in parallel, seeking back and forth over
+                    # the decompressed archive using the gzip checkpoints. The
+                    # files opened by tarfile are buffered.
+                    reader = self._open_gzip(path, compressed)
+                    decompressed = _CountingReader(reader, stats, 'decompress') if stats is not None else reader
+                else:
+                    # tarfile's gzip reader, decompressing the archive again
+                    # from its start when seeking back
+                    reader = gzip.GzipFile(fileobj=compressed, mode='rb')
+                    if (stats is not None):
+                        decompressed = _CountingReader(reader, stats, 'decompress', rewinds=True)
+                    else:
+                        decompressed = reader
+                tar = tarfile.open(fileobj=decompressed, mode='r:')
+                dir_info = tar.next()
+                names = tar.getnames()
+                for file_name in file_names:
+                    if (dir_info.name+"/"+file_name in names):
+                        files[file_name] = tar.extractfile(dir_info.name+"/"+file_name)
+        except:
+            raw.close()
+            raise
+        if (stats is not None):
+            elapsed = time.perf_counter() - start
+            self.read_stats['read_time'] += elapsed
+            stats.add_time('open', elapsed)
+        
+        def close():
+            for f in files.values():
+                if (f is not None):
+                    f.close()
+            if (not streaming):
+                tar.close()
+                reader.close()
+                raw.close()
+            if (stats is None):
+                return
+            self.read_stats['archives'] += 1
+            self.read_stats['archive_bytes'] += os.path.getsize(path)
+            self.read_stats['compressed_bytes'] += compressed.bytes_read
+            if (not streaming and self.checkpoints):
+                self.read_stats['decompressed_bytes'] += reader.bytes_decompressed
+            else:
+                self.read_stats['decompressed_bytes'] += decompressed.bytes_inflated
+        
+        return (files, close)
+
+    def _open_directory(self, path, file_names, start):
+        """
+        Opens the files file_names of an uncompressed data directory, and
+        returns them as _open_archive. start is the value of
+        time.perf_counter() when _open_archive was called, or None without
+        the stats option.
+        """
+        
+        files = dict.fromkeys(SAMPLE_FILES)
+        try:
+            for file_name in file_names:
+                if (os.path.isfile(os.path.join(path, file_name))):
+                    files[file_name] = open(os.path.join(path, file_name), 'rb')
+        except:
+            for f in files.values():
+                if (f is not None):
+                    f.close()
+            raise
+        if (self.stats is not None):
+            self.stats.add_time('open', time.perf_counter() - start)
+        
+        def close():
+            for f in files.values():
+                if (f is not None):
+                    if (self.stats is not None):
+                        self.read_stats['compressed_bytes'] += f.tell()
+                    f.close()
+            if (self.stats is None):
+                return
+            self.read_stats['archives'] += 1
+            self.read_stats['archive_bytes'] += _stat_data_file(path).st_size
+        
+        return (files, close)
+
+    def _get_codec(self, path):
+        """
+        Returns the ArchiveCodec of the data file path, or None if it is an
+        uncompressed directory.
+        """
+        
+        codec = _find_codec(path)
+        if (isinstance(codec, GzipCodec) and self.gzip_backend is not None):
+            return GzipCodec(self.gzip_backend)
+        return codec
+
+    def _readRoutingFile(self, routing_file, netSize):
+        """
+        Pending to compare against getSrcPortDst
+
+        Parameters
+        ----------
+        routing_file : str
+            File where the routing information is located.
+        netSize : int
+            Number of nodes in the network.
+
+        Returns
+        -------
+        R : netSize x netSize matrix
+            Matrix where each  [i,j] states what port node i should use to
+            reach node j.
+
+        """
+        
+        with open(routing_file,"r") as fd:
+            # Every line ends with a separator
+            R = numpy.fromstring(fd.read().rstrip().rstrip(','), dtype=numpy.int64, sep=',')
+        if (R.size != netSize * netSize):
+            raise ValueError("Routing file %s does not have %d ports" % (routing_file, netSize * netSize))
+        return (R.reshape(netSize, netSize))
+
+    def _getRoutingSrcPortDst(self, G):
+        """
+        Return a dictionary of dictionaries with the format:
+        node_port_dst[node][port] = next_node
+
+        Parameters
+        ----------
+        G : TYPE
+            DESCRIPTION.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        node_port_dst = {}
+        for node in G:
+            port_dst = {}
+            node_port_dst[node] = port_dst
+            for destination in G[node].keys():
+                port = G[node][destination][0]['port']
+                node_port_dst[node][port] = destination
+        return(node_port_dst)
+
+    def _get_port_table(self, G):
+        """
+        Returns a NxP int array where [node,port] is the node connected to
+        the given port of node, or -1 if the port is not used, being P the
+        number of ports of the node with more ports.
+        """
+        
+        if (isinstance(G, Topology)):
+            ports = numpy.stack([G.edge_src, G.edge_attrs['port'], G.edge_dst], axis=1).astype(numpy.int64)
+        else:
+            edges = [(src, port, dst) for src, dst, port in G.edges(data='port')]
+            ports = numpy.array(edges, dtype=numpy.int64).reshape(-1, 3)
+        table = numpy.full((G.number_of_nodes(), ports[:,1].max(initial=-1) + 1), -1, dtype=numpy.int64)
+        table[ports[:,0], ports[:,1]] = ports[:,2]
+        return table
+
+    def _create_routing_paths(self, G, routing_file):
+        """
+        Returns a RoutingPaths instance with the paths between all the pairs
+        of nodes given by routing_file. The routing file is parsed into a
+        next-hop table, and paths are computed for all the pairs at once.
+        """
+        
+        netSize = G.number_of_nodes()
+        R = self._readRoutingFile(routing_file, netSize)
+        ports = self._get_port_table(G)
+        next_hop = numpy.full((netSize, netSize), -1, dtype=numpy.int64)
+        used = R != -1
+        src = numpy.nonzero(used)[0]
+        if (numpy.any(R[used] >= ports.shape[1]) or numpy.any(R[used] < 0)):
+            raise ValueError("Unknown port in routing file %s" % routing_file)
+        next_hop[used] = ports[src, R[used]]
+        if (numpy.any(next_hop[used] == -1)):
+            raise ValueError("Unknown port in routing file %s" % routing_file)
+        nodes, offsets = _routing_paths_from_next_hops(next_hop)
+        return RoutingPaths(nodes, offsets, netSize)
+
+    def _create_routing_matrix(self, G,routing_file):
+        """
+
+        Parameters
+        ----------
+        G : graph
+            Graph representing the network.
+        routing_file : str
+            File where the information about routing is located.
+
+        Returns
+        -------
+        MatrixPath : NxN Matrix
+            Matrix where each cell [i,j] contains the path to go from node
+            i to node j.
+
+        """
+        return (self._create_routing_paths(G, routing_file).get_matrix())
+
+    def _generate_routings_dic(self, path,G):
+        """
+        Return a dictionary with routing matrices generated from the 
+        routing files found in path
+ 
+        Parameters
+        ----------
+        path : str
+            Direcotory where the routing files are located.
+ 
+        Returns
+        -------
+        Returns a dictionary where keys are the names of routing files found in 
+        path and the values are the routing matrices generated from the routing 
+        files.
+         
+        """
+        routings_dic = {}
+        for routing_file in os.listdir(path):
+            R = self._create_routing_matrix(G,path+"/"+routing_file)
+            routings_dic[routing_file] = R
+        
+        return routings_dic
+
+    def _check_intensity(self, file):
+        """
+        
+
+        Parameters
+        ----------
+        file : str
+            Name of the data file that needs to be filtered by intensity.
+
+        Returns
+        -------
+        2 if the range of intensities treates in the file satisfies the needs
+        of the user.
+        1 if there may be lines in the file that do not fulfill the user
+        requirements.
+        0 if the file does not fulfill the user-defined intensity requirements.
+
+        """
+        
+        aux = file.split('_')
+        aux = aux[2]
+        aux = aux.split('-')
+        aux = list(map(int, aux))
+#        User introduced range of intensities
+        if(len(self.intensity_values) > 1):
+            if(len(aux) > 1):
+                if(aux[0] >= self.intensity_values[0]) and (aux[1] <= self.intensity_values[1]):
+                    return 2
+                elif(aux[0] > self.intensity_values[1]) or (self.intensity_values[0] > aux[1]):
+                    return 0
+                else:
+                    return 1
+                    
+            else:
+                if(aux[0] >= self.intensity_values[0] and aux[0] <= self.intensity_values[1]):
+                    return 2
+                else: 
+                    return 0
+#        User introduced single intensity
+        elif (len(self.intensity_values) == 1):
+            if(len(aux) == 1 and self.intensity_values[0] == aux[0]):
+                return 2
+            return 0
+        else:
+            return 2
+
+    def add_filter(self, key, predicate):
+        """
+        Adds a filter to the samples produced by the iterator, replacing the
+        previous filter of the same value, if any. Only the samples for which
+        all the filters return true are produced.
+
+        Parameters
+        ----------
+        key : str
+            Value of the samples to filter, one of the keys in FILTER_STAGES.
+        predicate : function
+            Function receiving the value of a sample and returning whether the
+            sample is accepted. 'sample' filters can not be used with len or
+            indexing (ValueError is raised, see _get_sample_list). It must be
+            picklable (e.g., a function defined at module level) to be used by the worker processes of
+            compute_statistics and build_store, or if the start method of
+            multiprocessing is not 'fork'.
+
+        """
+        
+        if (not any(key in keys for keys in FILTER_STAGES.values())):
+            raise ValueError("Unknown filter: %s" % key)
+        self.filters[key] = predicate
+        self._sample_list = None
+
+    def _has_filters(self, stage):
+        """
+        Returns whether there are filters evaluated at a stage of
+        FILTER_STAGES.
+        """
+        
+        return any(key in self.filters for key in FILTER_STAGES[stage])
+
+    def _check_filters(self, stage, values):
+        """
+        Returns whether the filters of a stage of FILTER_STAGES accept a
+        sample, given a dictionary with its values (at least those of the
+        stage).
+        """
+        
+        for key in FILTER_STAGES[stage]:
+            predicate = self.filters.get(key)
+            if (predicate is not None and not predicate(values[key])):
+                return False
+        return True
+
+    def set_epoch(self, epoch):
+        """
+        Sets the epoch number used, together with seed, to shuffle the
+        dataset. Calling it before iterating over the dataset of every epoch
+        makes each epoch produce a different (but reproducible) order.
+        """
+        
+        self.epoch = epoch
+        self._sample_list = None
+        self._resume_state = None
+        # Stores built since the last epoch are detected
+        self._store_roots = {}
+
+    def _epoch_random(self):
+        """
+        Returns the random number generator used to shuffle the current
+        epoch. It is seeded with the hash of (seed, epoch), which does not
+        depend on the process, so that nearby seeds do not give the same
+        orders in different epochs (as seed + epoch would).
+        """
+        
+        return random.Random(hash((self.seed, self.epoch)))
+
+    def _get_data_files(self, rng=None):
+        """
+        Walks data_folder looking for dataset directories, i.e., directories
+        with a "graphs" and a "routings" subdirectory (using the manifest, if
+        the manifest option is set). If shuffle is set, the files found are
+        shuffled with rng (by default, the generator returned by
+        _epoch_random).
+
+        Returns
+        -------
+        tuple_files : list
+            List of (root, file) tuples with the data files found, in the
+            order they are read (i.e., shuffled if shuffle is set).
+        roots : list
+            List of dataset directories found.
+
+        """
+        
+        tuple_files, roots = self._find_data_files()
+        if self.shuffle:
+            if (rng is None):
+                rng = self._epoch_random()
+            rng.shuffle(tuple_files)
+        
+        return (tuple_files, roots)
+
+    def _find_data_files(self):
+        """
+        Same as _get_data_files, but the files are never shuffled.
+        """
+        
+        manifest = self.manifest
+        if (manifest is None):
+            manifest = self.cache_dir is not None
+        if (manifest):
+            return self._scan_manifest()
+        tuple_files = []
+        roots = []
+        for root, dirs, files in os.walk(self.data_folder):
+            if ("graphs" not in dirs or "routings" not in dirs):
+                continue
+            roots.append(root)
+            # Extend the list of files to process
+            data_files = _list_data_files(root, dirs, files)
+            tuple_files.extend([(root, f) for f in data_files])
+            # Data directories do not contain datasets
+            dirs[:] = [d for d in dirs if d not in data_files]
+        return (tuple_files, roots)
+
+    def _scan_manifest(self):
+        """
+        Finds the dataset directories and data files of data_folder in the
+        same order as os.walk, using the manifest of data_folder: a
+        directory is only listed again if its modification time changed
+        (i.e., entries were added, removed or renamed in it). The data files
+        of directories not listed again are checked with their own size and
+        modification time, since rewriting a file does not change the
+        modification time of its directory. The manifest is loaded from the
+        cache directory of data_folder (see cache_dir) the first time, kept
+        in memory, and saved when it changes.
+
+        Returns
+        -------
+        The same tuple_files and roots as _get_data_files, not shuffled.
+
+        """
+        
+        if (self._manifest is None):
+            self._manifest = {}
+            try:
+                with open(self._cache_path(self.data_folder, "manifest.json")) as f:
+                    data = json.load(f)
+                if (data['version'] == MANIFEST_VERSION):
+                    self._manifest = data['directories']
+            except (OSError, ValueError, KeyError):
+                pass
+        old = self._manifest
+        new = {}
+        tuple_files = []
+        roots = []
+        sizes = {}
+        changed = [False]
+        
+        def scan(path, rel):
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                return
+            entry = old.get(rel)
+            if (entry is None or entry['mtime_ns'] != mtime_ns):
+                entry = self._list_manifest_directory(path, mtime_ns)
+                if (entry is None):
+                    return
+                changed[0] = True
+            elif (entry['dataset']):
+                files = []
+                for f, size, file_mtime_ns in entry['files']:
+                    try:
+                        stat = _stat_data_file(os.path.join(path, f))
+                    except (OSError, ValueError):
+                        changed[0] = True
+                        continue
+                    if (stat.st_size != size or stat.st_mtime_ns != file_mtime_ns):
+                        changed[0] = True
+                    files.append([f, stat.st_size, stat.st_mtime_ns])
+                entry = dict(entry, files=files)
+            new[rel] = entry
+            if (entry['dataset']):
+                roots.append(path)
+                for f, size, _ in entry['files']:
+                    tuple_files.append((path, f))
+                    sizes[(path, f)] = size
+            for d in entry['dirs']:
+                scan(os.path.join(path, d), os.path.join(rel, d))
+        
+        scan(self.data_folder, "")
+        self._data_file_sizes = sizes
+        if (changed[0] or len(new) != len(old)):
+            self._manifest = new
+            try:
+                data = {'version': MANIFEST_VERSION, 'directories': new}
+                _atomic_write(self._cache_path(self.data_folder, "manifest.json"), json.dumps(data).encode())
+            except OSError:
+                pass
+        return (tuple_files, roots)
+
+    def _list_manifest_directory(self, path, mtime_ns):
+        """
+        Lists the directory path and returns its manifest entry: its
+        modification time ('mtime_ns', None if it may change again in the
+        same tick of the clock), whether it is a dataset directory
+        ('dataset'), its data files, with their size and modification time
+        ('files') and the subdirectories that may contain datasets ('dirs').
+        Returns None if the directory can not be listed.
+        """
+        
+        dirs = []
+        files = []
+        links = set()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if (is_dir):
+                        dirs.append(entry.name)
+                        if (entry.is_symlink()):
+                            links.add(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError:
+            return None
+        if (time.time_ns() - mtime_ns < MANIFEST_RACY_SECONDS * 1e9):
+            mtime_ns = None
+        entry = {'mtime_ns': mtime_ns, 'dataset': "graphs" in dirs and "routings" in dirs, 'files': [], 'dirs': []}
+        # As os.walk, symbolic links to directories are not followed
+        subdirs = [d for d in dirs if d not in links]
+        if (entry['dataset']):
+            for f in _list_data_files(path, dirs, files):
+                try:
+                    stat = _stat_data_file(os.path.join(path, f))
+                except (OSError, ValueError):
+                    continue
+                entry['files'].append([f, stat.st_size, stat.st_mtime_ns])
+            # Data directories, graphs, routings and the cache directory do
+            # not contain datasets
+            data_files = set(f for f, _, _ in entry['files'])
+            subdirs = [d for d in subdirs if d not in data_files and d not in ("graphs", "routings", ".datanetAPI")]
+        entry['dirs'] = subdirs
+        return entry
+
+    def _data_file_size(self, root, file):
+        """
+        Returns the size of a data file, from the manifest if available.
+        """
+        
+        size = self._data_file_sizes.get((root, file))
+        if (size is None):
+            size = _stat_data_file(os.path.join(root, file)).st_size
+        return size
+
+    def _wait_new_files(self, seen, rng):
+        """
+        Waits until new data files appear in data_folder (see the follow
+        option), checking every follow_interval seconds. Files are only
+        returned once their size and modification time did not change
+        between two checks, so that files being written are not read.
+
+        Parameters
+        ----------
+        seen : list
+            List of (root, file) tuples with the data files already found.
+        rng : random.Random
+            Random number generator used to shuffle the new files, if
+            shuffle is set.
+
+        Returns
+        -------
+        List of (root, file) tuples with the new data files, or None if no
+        new data file appeared in follow_timeout seconds.
+
+        """
+        
+        seen = set(seen)
+        last = {}
+        start = time.monotonic()
+        while (True):
+            time.sleep(self.follow_interval)
+            tuple_files, _ = self._find_data_files()
+            stats = {}
+            new_files = []
+            for root, file in tuple_files:
+                if ((root, file) in seen):
+                    continue
+                try:
+                    stats[(root, file)] = _stat_data_file(os.path.join(root, file))
+                except (OSError, ValueError):
+                    continue
+                if (last.get((root, file)) == stats[(root, file)]):
+                    new_files.append((root, file))
+            last = stats
+            if (len(new_files) > 0):
+                if (self.shuffle):
+                    rng.shuffle(new_files)
+                return new_files
+            if (self.follow_timeout is not None and time.monotonic() - start >= self.follow_timeout):
+                return None
+
+    def _cached(self, root, name, sources, build, directory="topologies", enabled=None):
+        """
+        Returns the object generated by build() from the files in sources.
+        The object is saved (see _dump_cached) in the given directory of the
+        cache directory of root (see cache_dir), in a file whose name
+        includes a hash of the path, size and modification time of the
+        sources, so that it is only built again when the sources change.
+        Files are written atomically, so the cache can be shared by
+        concurrent processes. Errors writing the cache are ignored, e.g., if
+        the dataset directory is read-only. If enabled is false (by default,
+        the topology_cache option), the object is built without using the
+        cache.
+        """
+        
+        if (enabled is None):
+            enabled = self.topology_cache
+            if (enabled is None):
+                enabled = self.cache_dir is not None
+        if (not enabled):
+            return build()
+        key = []
+        for source in sources:
+            stat = _stat_data_file(source)
+            key.append((os.path.abspath(source), stat.st_size, stat.st_mtime_ns))
+        key = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        path = self._cache_path(root, os.path.join(directory, "%s.%s.npz" % (name, key)))
+        try:
+            with open(path, 'rb') as f:
+                obj = _load_cached(f)
+            if (self.stats is not None):
+                self.stats.count_cache('disk', True)
+            return obj
+        except Exception:
+            pass
+        if (self.stats is not None):
+            self.stats.count_cache('disk', False)
+        obj = build()
+        try:
+            _atomic_write(path, _dump_cached(obj))
+            # Remove the entries of older versions of the sources
+            directory = os.path.dirname(path)
+            for cache_file in os.listdir(directory):
+                if (cache_file.startswith(name + ".") and cache_file != os.path.basename(path)):
+                    os.unlink(os.path.join(directory, cache_file))
+        except (OSError, TypeError):
+            # TypeError: objects with attributes that cannot be saved
+            pass
+        return obj
+
+    def _read_topology(self, path):
+        """
+        Returns the Topology instance of the GML file path. Files that the
+        fast reader (_read_gml_topology) does not support are read with
+        networkx.
+        """
+        
+        try:
+            return _read_gml_topology(path)
+        except ValueError:
+            return Topology.from_networkx(networkx.read_gml(path, destringizer=int))
+
+    def _get_topology(self, root, graph_file):
+        """
+        Returns the Topology of the GML file graph_file of the dataset
+        directory root. Topologies are read the first time they are used,
+        and kept in a LRU cache (see max_topologies and max_topology_memory).
+        """
+        
+        key = ('topology', root, graph_file)
+        t = self._topologies.get(key)
+        if (self.stats is not None):
+            self.stats.count_cache('topologies', t is not None)
+        if (t is None):
+            start = time.perf_counter() if self.stats is not None else None
+            path = os.path.join(root, "graphs", graph_file)
+            t = self._cached(root, "topology_"+graph_file, [path], lambda: self._read_topology(path))
+            self._topologies.put(key, t, t.nbytes)
+            if (self.stats is not None):
+                self.stats.add_time('graph', time.perf_counter() - start)
+        return t
+
+    def _get_routing_paths(self, root, routing_file, graph_file):
+        """
+        Returns the RoutingPaths of the routing file routing_file of the
+        dataset directory root, whose ports are those of the graph in
+        graph_file. They are kept in the same LRU cache as the topologies.
+        """
+        
+        # XXX We considerer that all graphs using the same routing file have the same topology
+        key = ('routing', root, routing_file)
+        routing_paths = self._topologies.get(key)
+        if (self.stats is not None):
+            self.stats.count_cache('topologies', routing_paths is not None)
+        if (routing_paths is None):
+            start = time.perf_counter() if self.stats is not None else None
+            path = os.path.join(root, "routings", routing_file)
+            routing_paths = self._cached(root, "routing_"+routing_file,
+                                         [path, os.path.join(root, "graphs", graph_file)],
+                                         lambda: self._create_routing_paths(self._get_topology(root, graph_file), path))
+            self._topologies.put(key, routing_paths, routing_paths.nodes.nbytes + routing_paths.offsets.nbytes)
+            if (self.stats is not None):
+                self.stats.add_time('routing', time.perf_counter() - start)
+        return routing_paths
+
+    def _read_samples(self, root, file, feasibility_of_file, start=0, stop=None, skip=()):
+        """
+        Reads the samples of a data file. The samples are processed but their
+        routing matrix and topology object are not set.
+
+        Parameters
+        ----------
+        root : str
+            Directory where the data file is located.
+        file : str
+            Name of the data file.
+        feasibility_of_file : int
+            Value returned by _check_intensity for this file.
+        start, stop : int
+            Range of lines of the data file to read. By default, all of them.
+            If the dataset index is loaded (see use_index), the files are
+            placed directly at line start.
+        skip : collection
+            Lines (after start) whose samples are not produced, e.g., because
+            they were already produced before resuming the iteration.
+
+        Yields
+        ------
+        s : Sample
+            Sample instance containing information about the last line read
+            from the data file.
+
+        """
+        
+        stats = self.stats
+        segment = self._get_store_segment(root, file)
+        if (stats is not None and self.use_store):
+            stats.count_cache('store', segment is not None)
+        if (segment is None and self._epoch_cache is not None):
+            segment = self._get_epoch_cache_segment(root, file)
+        if (segment is not None):
+            yield from self._read_store_samples(root, file, segment, feasibility_of_file, start, stop, skip)
+            return
+        # The samples share the same path string
+        path = os.path.join(root, file)
+        files, close_archive = self._open_archive(path)
+        try:
+            results_file = files["simulationResults.txt"]
+            traffic_file = files["traffic.txt"]
+            status_file = files["stability.txt"]
+            input_files = files["input_files.txt"]
+            flowresults_file = files["flowSimulationResults.txt"]
+            input_files_filters = self._has_filters('input_files')
+            header_filters = self._has_filters('header')
+            line = 0
+            entry = self._index.get(root, {}).get(file) if start > 0 else None
+            if (entry is not None):
+                # Seek to the first line instead of reading all the previous ones
+                if (start >= len(entry['samples'])):
+                    return
+                for name, offset in zip(SAMPLE_FILES, entry['samples'][start][-1]):
+                    if (files[name] is not None and offset is not None):
+                        files[name].seek(offset)
+                line = start
+            while(stop is None or line < stop):
+                # The longest lines are only decoded for the samples accepted
+                # by the intensity range and the 'input_files' filters
+                if (stats is not None):
+                    read_start = time.perf_counter()
+                results_line = results_file.readline()
+                traffic_line = traffic_file.readline()
+                if (flowresults_file):
+                    flowresults_line = flowresults_file.readline()
+                else:
+                    flowresults_line = None
+                status_line = status_file.readline().decode()[:-1]
+                input_files_line = input_files.readline().decode()[:-1]
+                if (stats is not None):
+                    read_end = time.perf_counter()
+                    self.read_stats['read_time'] += read_end - read_start
+                    stats.add_time('readline', read_end - read_start)
+                
+                if (len(results_line) <= 2) or (len(traffic_line) <= 1):
+                    break
+                line += 1
+                if (line <= start or line - 1 in skip):
+                    continue
+                
+                if (not ";OK;" in status_line):
+                    self._report_removed(status_line)
+                    continue;
+                
+                if (feasibility_of_file == 1):
+                    ptr = traffic_line.find(b'|')
+                    specific_intensity = float(traffic_line[0:ptr])
+                    if(specific_intensity < self.intensity_values[0]) or (specific_intensity > self.intensity_values[1]):
+                        if (stats is not None):
+                            stats.skip('intensity', read_end)
+                        continue
+                
+                if (input_files_filters):
+                    used_files = input_files_line.split(';')
+                    values = {'sim_time': float(status_line.split(';')[0]),
+                              'graph_file': used_files[1],
+                              'routing_file': used_files[2]}
+                    if (not self._check_filters('input_files', values)):
+                        if (stats is not None):
+                            stats.skip('filter', read_end)
+                        continue
+                
+                s = self._new_sample(path, line - 1)
+                s._results_line = results_line.decode()[:-2]
+                s._traffic_line = traffic_line.decode()[:-1]
+                if (flowresults_line is not None):
+                    s._flowresults_line = flowresults_line.decode()[:-2]
+                else:
+                    s._flowresults_line = None
+                s._status_line = status_line
+                s._input_files_line = input_files_line
+                
+                if (header_filters):
+                    header = _parse_sample_header(s._results_line, s._traffic_line, s._status_line)
+                    values = dict(zip(('global_packets', 'global_losses', 'global_delay'), header['global']),
+                                  maxAvgLambda=header['maxAvgLambda'], net_size=header['net_size'])
+                    if (not self._check_filters('header', values)):
+                        if (stats is not None):
+                            stats.skip('filter', read_end)
+                        continue
+                
+                if (stats is not None):
+                    parse_start = time.perf_counter()
+                    stats.add_time('check', parse_start - read_end)
+                self._process_sample(s)
+                if (stats is not None):
+                    stats.add_time('parse', time.perf_counter() - parse_start)
+                if ('sample' in self.filters and not self.filters['sample'](s)):
+                    if (stats is not None):
+                        stats.skip('filter')
+                    continue
+                if (stats is not None):
+                    stats.samples['yielded'] += 1
+                yield s
+        finally:
+            close_archive()
+
+    def _read_store_samples(self, root, file, segment, feasibility_of_file, start=0, stop=None, skip=()):
+        """
+        Same as _read_samples, but the samples are read from a segment of the
+        columnar store (see build_store). Their arrays are views of the
+        memory-mapped columns of the segment.
+        """
+        
+        path = os.path.join(root, file)
+        stats = self.stats
+        columns = segment.columns
+        lines = columns['line']
+        removed = [(line, status) for line, status in segment.meta['removed']
+                   if line >= start and (stop is None or line < stop)]
+        fields = [f for f in ARRAY_FIELDS if f in self.fields]
+        filtered = self._has_filters('input_files') or self._has_filters('header')
+        row = numpy.searchsorted(lines, start)
+        end = len(segment) if stop is None else numpy.searchsorted(lines, stop)
+        for row in range(row, end):
+            while (len(removed) > 0 and removed[0][0] < lines[row]):
+                self._report_removed(removed.pop(0)[1])
+            if (lines[row] in skip):
+                continue
+            if (stats is not None):
+                check_start = time.perf_counter()
+            if (feasibility_of_file == 1):
+                specific_intensity = columns['maxAvgLambda'][row]
+                if(specific_intensity < self.intensity_values[0]) or (specific_intensity > self.intensity_values[1]):
+                    if (stats is not None):
+                        stats.skip('intensity', check_start)
+                    continue
+            if (filtered):
+                values = self._store_filter_values(segment, row)
+                if (not self._check_filters('input_files', values) or not self._check_filters('header', values)):
+                    if (stats is not None):
+                        stats.skip('filter', check_start)
+                    continue
+            if (stats is not None):
+                store_start = time.perf_counter()
+                stats.add_time('check', store_start - check_start)
+            s = self._new_sample(path, int(lines[row]))
+            self._set_store_sample(s, segment, row, fields)
+            if (stats is not None):
+                stats.add_time('store', time.perf_counter() - store_start)
+            if ('sample' in self.filters and not self.filters['sample'](s)):
+                if (stats is not None):
+                    stats.skip('filter')
+                continue
+            if (stats is not None):
+                stats.samples['yielded'] += 1
+            yield s
+        for _, status in removed:
+            self._report_removed(status)
+
+    def _store_filter_values(self, segment, row):
+        """
+        Returns a dictionary with the values of the 'input_files' and
+        'header' stages of FILTER_STAGES of a row of a segment of the
+        columnar store.
+        """
+        
+        columns = segment.columns
+        values = dict(zip(('global_packets', 'global_losses', 'global_delay'), columns['global'][row].tolist()))
+        values['maxAvgLambda'] = float(columns['maxAvgLambda'][row])
+        values['net_size'] = int(columns['net_size'][row])
+        values['sim_time'] = float(columns['sim_time'][row])
+        values['graph_file'] = segment.meta['graphs'][columns['graph'][row]]
+        values['routing_file'] = segment.meta['routings'][columns['routing'][row]]
+        return values
+
+    def _set_store_sample(self, s, segment, row, fields):
+        """
+        Sets the values of the Sample instance s from a row of a segment of
+        the columnar store.
+        """
+        
+        arrays = segment.get_arrays(row, fields)
+        s._arrays = arrays
+        s._graph_file = segment.meta['graphs'][segment.columns['graph'][row]]
+        s._routing_file = segment.meta['routings'][segment.columns['routing'][row]]
+        s._set_global_packets(arrays['global'][0])
+        s._set_global_losses(arrays['global'][1])
+        s._set_global_delay(arrays['global'][2])
+        s.maxAvgLambda = arrays['maxAvgLambda']
+
+    def compute_statistics(self, fields=('AvgDelay', 'Jitter', 'PktsDrop', 'AvgBw', 'PktsGen'),
+                           levels=('global', 'path', 'flow', 'tos'), quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99),
+                           bins=50, relative_accuracy=0.01, cache=True):
+        """
+        Computes statistics of the samples of the dataset (e.g., for feature
+        normalization), reading the data files in parallel using worker
+        processes as the index (see _get_index). Samples are selected as in
+        the iterator (intensity range, shards...). Every data file is
+        summarized with mergeable accumulators (count, mean and variance
+        with Welford's algorithm, minimum, maximum, and a sketch estimating
+        quantiles and histograms with a relative error of at most
+        relative_accuracy), which are merged into the statistics of the
+        dataset. The accumulators of every data file are cached in the
+        'statistics' directory of the cache directory (see cache_dir), so
+        only the data files that changed are read again.
+
+        Parameters
+        ----------
+        fields : list
+            Measurements to summarize, from PERF_COLUMNS.
+        levels : list
+            Aggregation levels to compute:
+                'global' : values of every sample in STATS_GLOBAL_VALUES
+                    (global packets, losses and delay, and maxAvgLambda).
+                'path' : measurements of every src-dst pair with different
+                    src and dst (needs the 'performance' field).
+                'flow' : measurements of every flow of those pairs (needs the
+                    'flow_performance' field).
+                'tos' : measurements of the flows, separately for every ToS
+                    (needs the 'flow_performance' and 'traffic' fields).
+        quantiles : list
+            Quantiles to estimate, between 0 and 1.
+        bins : int
+            Number of bins of the histograms.
+        relative_accuracy : float
+            Maximum relative error of the estimated quantiles.
+        cache : boolean
+            Whether to use the cached accumulators. By default true.
+
+        Returns
+        -------
+        Dictionary with the number of 'samples' and an entry for every level:
+        a dictionary with the statistics of every field (of every value in
+        STATS_GLOBAL_VALUES for 'global'), and for 'tos' a dictionary with
+        those of every ToS. The statistics of a field are the dictionary
+        returned by _StatsAccumulator.summary: 'count', 'mean', 'std', 'min',
+        'max', 'quantiles' (dictionary indexed by quantile) and 'histogram'
+        ('counts' and 'edges' of the bins).
+
+        """
+        
+        for field in fields:
+            if (field not in PERF_COLUMNS):
+                raise ValueError("Unknown field: %s" % field)
+        for level in levels:
+            if (level not in ('global', 'path', 'flow', 'tos')):
+                raise ValueError("Unknown level: %s" % level)
+        fields = tuple(fields)
+        levels = tuple(levels)
+        tuple_files, _ = self._get_data_files()
+        tasks = self._get_tasks(tuple_files)
+        num_workers = self.num_workers if self.num_workers > 0 else (os.cpu_count() or 1)
+        num_workers = min(num_workers, len(tasks))
+        if (num_workers > 1):
+            with multiprocessing.get_context().Pool(num_workers) as pool:
+                partials = pool.starmap(_task_statistics_worker, [(self, task, fields, levels, relative_accuracy, cache)
+                                                                  for task in tasks])
+        else:
+            partials = [self._task_statistics(task, fields, levels, relative_accuracy, cache) for task in tasks]
+        
+        samples = 0
+        accumulators = {}
+        for partial_samples, partial in partials:
+            samples += partial_samples
+            for key, accumulator in partial.items():
+                if (key in accumulators):
+                    accumulators[key].merge(accumulator)
+                else:
+                    accumulators[key] = accumulator
+        
+        statistics = {'samples': samples}
+        for level in levels:
+            statistics[level] = {}
+        for key in sorted(accumulators, key=repr):
+            summary = accumulators[key].summary(quantiles, bins)
+            if (key[0] == 'tos'):
+                statistics['tos'].setdefault(key[1], {})[key[2]] = summary
+            else:
+                statistics[key[0]][key[1]] = summary
+        return statistics
+
+    def _task_statistics(self, task, fields, levels, relative_accuracy, cache):
+        """
+        Returns the number of samples and the accumulators of the samples of
+        a task (see _get_tasks) for compute_statistics, using the cached ones
+        if cache is true and the data file did not change.
+
+        Returns
+        -------
+        samples : int
+            Number of samples read.
+        accumulators : dictionary
+            _StatsAccumulator instances indexed by (level, field), or by
+            ('tos', ToS, field) for the 'tos' level.
+
+        """
+        
+        root, file = task[:2]
+        config = (STATS_VERSION, task, tuple(self.intensity_values), fields, levels, relative_accuracy)
+        name = "%s.%s" % (file, hashlib.sha1(repr(config).encode()).hexdigest()[:16])
+        return self._cached(root, name, [os.path.join(root, file)],
+                            lambda: self._read_task_statistics(task, fields, levels, relative_accuracy),
+                            directory="statistics", enabled=cache and len(self.filters) == 0)
+
+    def _read_task_statistics(self, task, fields, levels, relative_accuracy):
+        """
+        Reads the samples of a task and returns them summarized as
+        _task_statistics.
+        """
+        
+        # Only the arrays of the fields needed by the levels are parsed
+        needed = {'global': (), 'path': ('performance',), 'flow': ('flow_performance',),
+                  'tos': ('flow_performance', 'traffic')}
+        reader = copy.copy(self)
+        reader.fields = tuple(f for f in SAMPLE_FIELDS if any(f in needed[level] for level in levels))
+        reader.array_mode = True
+        columns = [PERF_COLUMNS.index(field) for field in fields]
+        values = collections.defaultdict(list)
+        samples = 0
+        for s in reader._read_samples(*task):
+            samples += 1
+            if ('global' in levels):
+                for name, value in zip(STATS_GLOBAL_VALUES, s._get_arrays()['global'] + (s.maxAvgLambda,)):
+                    values[('global', name)].append(value)
+            if ('path' in levels):
+                agg = s._get_arrays('performance')['agg']
+                paths = agg[~numpy.eye(agg.shape[0], dtype=bool)]
+                for field, column in zip(fields, columns):
+                    values[('path', field)].append(paths[:,column])
+            if ('flow' in levels or 'tos' in levels):
+                arrays = s._get_arrays('flow_performance')
+                net_size = arrays['net_size']
+                pairs = numpy.repeat(numpy.arange(net_size*net_size), numpy.diff(arrays['flow_offsets']))
+                selected = pairs // net_size != pairs % net_size
+                flows = arrays['flows'][selected]
+                if ('flow' in levels):
+                    for field, column in zip(fields, columns):
+                        values[('flow', field)].append(flows[:,column])
+                if ('tos' in levels):
+                    arrays = s._get_arrays('traffic')
+                    tos = arrays['traffic'][arrays['traffic_offsets'][1:]-1][selected]
+                    for value in numpy.unique(tos):
+                        rows = flows[tos == value]
+                        for field, column in zip(fields, columns):
+                            values[('tos', int(value), field)].append(rows[:,column])
+        
+        accumulators = {}
+        for key, chunks in values.items():
+            accumulators[key] = _StatsAccumulator(relative_accuracy)
+            if (key[0] == 'global'):
+                accumulators[key].update(chunks)
+            else:
+                accumulators[key].update(numpy.concatenate(chunks))
+        return (samples, accumulators)
+
+    def build_store(self):
+        """
+        Converts the data files of the dataset into a columnar binary store,
+        which is used instead of the data files from then on (see use_store).
+        The store holds the samples of every data file already parsed into
+        arrays, so reading them needs neither decompression nor parsing. It
+        is written in the 'store' directory of the cache directory of every
+        dataset directory (see cache_dir), with a segment per data file.
+        Segments of data files whose modification time or size changed are
+        rebuilt, using worker processes as the index (see _get_index).
+
+        Returns
+        -------
+        Number of segments built.
+
+        """
+        
+        tuple_files, _ = self._get_data_files()
+        stale = [(root, file) for root, file in tuple_files if self._get_store_segment(root, file) is None]
+        num_workers = self.num_workers if self.num_workers > 0 else (os.cpu_count() or 1)
+        num_workers = min(num_workers, len(stale))
+        if (num_workers > 1):
+            with multiprocessing.get_context().Pool(num_workers) as pool:
+                pool.starmap(_build_store_segment_worker, [(self, root, file) for root, file in stale])
+        else:
+            for root, file in stale:
+                self._build_store_segment(root, file)
+        self._store_roots = {}
+        return len(stale)
+
+    def _build_store_segment(self, root, file):
+        """
+        Reads all the lines of a data file and writes them into its segment
+        of the columnar store (see _StoreSegment).
+        """
+        
+        meta, columns = self._read_store_columns(root, file)
+        _write_store_segment(self._cache_path(root, os.path.join("store", file)), meta, columns)
+
+    def _read_store_columns(self, root, file):
+        """
+        Reads all the lines of a data file and returns the meta and columns
+        of its segment of the columnar store, as given to
+        _write_store_segment.
+        """
+        
+        path = os.path.join(root, file)
+        stat = _stat_data_file(path)
+        meta = {'version': STORE_VERSION, 'mtime': stat.st_mtime, 'size': stat.st_size,
+                'graphs': [], 'routings': [], 'removed': []}
+        names = {'graphs': {}, 'routings': {}}
+        columns = {name: [] for name in STORE_SCALARS + STORE_ARRAYS}
+        files, close_archive = self._open_archive(path, streaming=True, file_names=SAMPLE_FILES)
+        try:
+            line = 0
+            while(True):
+                lines = {}
+                for name in SAMPLE_FILES:
+                    if (files[name] is not None):
+                        lines[name] = files[name].readline().decode()
+                results_line = lines["simulationResults.txt"][:-2]
+                traffic_line = lines["traffic.txt"][:-1]
+                if (len(results_line) == 0) or (len(traffic_line) == 0):
+                    break
+                status_line = lines["stability.txt"][:-1]
+                if (not ";OK;" in status_line):
+                    meta['removed'].append([line, status_line])
+                    line += 1
+                    continue
+                flowresults_line = lines["flowSimulationResults.txt"][:-2] if "flowSimulationResults.txt" in lines else None
+                arrays = _parse_sample_arrays(results_line, traffic_line, flowresults_line, status_line)
+                used_files = lines["input_files.txt"][:-1].split(';')
+                for key, name in (('graphs', used_files[1]), ('routings', used_files[2])):
+                    if (name not in names[key]):
+                        names[key][name] = len(meta[key])
+                        meta[key].append(name)
+                columns['line'].append(line)
+                columns['global'].append(arrays['global'])
+                columns['maxAvgLambda'].append(arrays['maxAvgLambda'])
+                columns['sim_time'].append(arrays['sim_time'])
+                columns['net_size'].append(arrays['net_size'])
+                columns['graph'].append(names['graphs'][used_files[1]])
+                columns['routing'].append(names['routings'][used_files[2]])
+                arrays['agg'] = arrays['agg'].reshape((-1, len(PERF_COLUMNS)))
+                for name in STORE_ARRAYS:
+                    columns[name].append(arrays[name])
+                line += 1
+        finally:
+            close_archive()
+        
+        columns['line'] = numpy.array(columns['line'], dtype=numpy.int64)
+        columns['global'] = numpy.array(columns['global'], dtype=numpy.float64).reshape((-1, 3))
+        columns['maxAvgLambda'] = numpy.array(columns['maxAvgLambda'], dtype=numpy.float64)
+        columns['sim_time'] = numpy.array(columns['sim_time'], dtype=numpy.float64)
+        columns['net_size'] = numpy.array(columns['net_size'], dtype=numpy.int64)
+        columns['graph'] = numpy.array(columns['graph'], dtype=numpy.int32)
+        columns['routing'] = numpy.array(columns['routing'], dtype=numpy.int32)
+        return (meta, columns)
+
+    def _get_store_segment(self, root, file):
+        """
+        Returns the _StoreSegment of a data file, or None if the store is not
+        used or the data file has no segment or changed after the segment was
+        built. Whether the dataset directory has a store is only checked the
+        first time, so that reading datasets without store does not look for
+        the segment of every data file.
+        """
+        
+        if (not self.use_store):
+            return None
+        if (root not in self._store_roots):
+            self._store_roots[root] = os.path.isdir(self._cache_path(root, "store"))
+        if (not self._store_roots[root]):
+            return None
+        path = self._cache_path(root, os.path.join("store", file))
+        stat = _stat_data_file(os.path.join(root, file))
+        segment = self._store_segments.get((root, file))
+        if (segment is None or segment.meta['mtime'] != stat.st_mtime or segment.meta['size'] != stat.st_size):
+            try:
+                with open(os.path.join(path, "meta.json")) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if (meta.get('version') != STORE_VERSION or meta['mtime'] != stat.st_mtime or meta['size'] != stat.st_size):
+                return None
+            segment = _StoreSegment.load(path, meta)
+            self._store_segments.put((root, file), segment)
+        return segment
+
+    def _get_epoch_cache_segment(self, root, file):
+        """
+        Returns the segment of a data file in the epoch cache (see
+        _EpochCache). The first time, all the lines of the data file are
+        parsed into a segment, which is added to the cache if it fits.
+        Returns None if the cache is full and the data file is not in it, so
+        that the data file is read as usual.
+        """
+        
+        stat = _stat_data_file(os.path.join(root, file))
+        key = (os.path.abspath(os.path.join(root, file)), stat.st_size, stat.st_mtime_ns)
+        segment = self._epoch_cache.get(key)
+        if (self.stats is not None):
+            self.stats.count_cache('epoch', segment is not None)
+        if (segment is None and not self._epoch_cache.full() and self._epoch_cache.lock is not None):
+            meta, columns = self._read_store_columns(root, file)
+            segment = self._epoch_cache.put(key, meta, columns)
+            if (segment is None):
+                # Too large for the cache, but already parsed
+                segment = _StoreSegment.from_columns(meta, columns)
+        return segment
+
+    def clear_epoch_cache(self):
+        """
+        Removes all the data files from the epoch cache (see
+        epoch_cache_size), releasing its shared memory once the samples read
+        from it are no longer used.
+        """
+        
+        if (self._epoch_cache is not None):
+            self._epoch_cache.clear()
+
+    def _new_sample(self, path, line):
+        """
+        Returns a new Sample instance read from the given line of the data
+        file path.
+        """
+        
+        s = CompactSample() if (self.compact) else Sample()
+        s._set_data_set_file_name(path)
+        s._line = line
+        if (len(self.fields) != len(SAMPLE_FIELDS)):
+            s._fields = self.fields
+        return s
+
+    def _process_sample(self, s):
+        """
+        Processes the lines read from the dataset for the Sample instance s.
+        """
+        
+        used_files = s._input_files_line.split(';')
+        s._graph_file = used_files[1]
+        s._routing_file = used_files[2]
+        
+        if (self.array_mode):
+            self._process_flow_results_traffic_arrays(s._results_line, s._traffic_line, s._flowresults_line, s._status_line, s)
+            if (self.compact and not self.lazy):
+                # All the requested sections were parsed
+                s._results_line = s._traffic_line = s._flowresults_line = None
+                s._status_line = s._input_files_line = None
+        else:
+            self._process_flow_results_traffic_line(s._results_line, s._traffic_line, s._flowresults_line, s._status_line, s)
+
+    def _report_progress(self, done, total):
+        """
+        Reports that done out of total data files were read, printing it or
+        calling the callback of stats.
+        """
+        
+        if (self.stats is not None):
+            self.stats.files_done = done
+            self.stats.files_total = total
+            if (self.stats.callback is not None):
+                self.stats.report('file')
+                return
+        print("Progress check: %d/%d" % (done,total))
+
+    def _report_removed(self, status_line):
+        """
+        Reports a sample removed because its simulation was unstable.
+        """
+        
+        if (self.stats is not None):
+            self.stats.skip('unstable')
+            if (self.stats.callback is not None):
+                return
+        print ("Removed iteration: "+status_line)
+
+    def _set_sample_topology(self, s, root):
+        """
+        Sets the routing matrix and the topology object of a Sample instance
+        read from a data file of the directory root.
+        """
+        
+        if ('routing' in self.fields):
+            s._set_routing_paths(self._get_routing_paths(root, s._routing_file, s._graph_file))
+        if ('topology' in self.fields):
+            s._set_topology(self._get_topology(root, s._graph_file))
+
+    def __iter__(self):
+        """
+        
+
+        Yields
+        ------
+        s : Sample
+            Sample instance containing information about the last line read
+            from the dataset.
+
+        """
+        
+        rng = self._epoch_random()
+        position = self._resume_state
+        self._resume_state = None
+        if (position is None):
+            tuple_files, roots = self._get_data_files(rng)
+            tasks = self._get_tasks(tuple_files)
+            position = {'files': tuple_files, 'tasks': tasks, 'lines': {}, 'done': set()}
+        elif (self.use_index):
+            self._index = self._get_index(position['files'])
+        self._position = position
+        while (True):
+            # Index in position['tasks'] of the tasks still to be read
+            pending = [i for i in range(len(position['tasks'])) if i not in position['done']]
+            tasks = [self._get_resumed_task(i) for i in pending]
+            
+            if (self.num_workers > 0):
+                samples = self._iter_parallel(tasks, len(position['files']))
+            else:
+                samples = self._iter_serial(tasks, len(position['files']), rng)
+            if (self.shuffle_buffer > 1):
+                samples = self._shuffle_samples(samples, rng)
+            if (self.prefetch > 0):
+                samples = self._prefetch_samples(samples)
+            lines = position['lines']
+            for idx, s in samples:
+                idx = pending[idx]
+                if (s is None):
+                    # All the samples of the task were produced
+                    position['done'].add(idx)
+                    lines.pop(idx, None)
+                    continue
+                if (idx not in lines):
+                    lines[idx] = [0, set()]
+                if (self.shuffle_buffer > 1):
+                    # Samples of the same file are produced out of order
+                    lines[idx][1].add(s._line)
+                else:
+                    lines[idx][0] = s._line + 1
+                yield s
+            if (not self.follow):
+                break
+            # Read the data files added to data_folder since the last check
+            new_files = self._wait_new_files(position['files'], rng)
+            if (new_files is None):
+                break
+            position['files'] = position['files'] + new_files
+            position['tasks'] = position['tasks'] + self._get_tasks(position['files'], len(position['files']) - len(new_files))
+        if (self.stats is not None):
+            self.stats.report('end')
+
+    def _get_resumed_task(self, idx):
+        """
+        Returns the task idx of the current iteration (see _get_tasks),
+        starting after the last line produced and skipping the lines
+        already produced according to the iteration position.
+        """
+        
+        root, file, feasibility_of_file, *lines = self._position['tasks'][idx]
+        start, stop = lines if len(lines) > 0 else (0, None)
+        if (idx not in self._position['lines']):
+            return (root, file, feasibility_of_file, start, stop)
+        resume_line, produced = self._position['lines'][idx]
+        return (root, file, feasibility_of_file, max(start, resume_line), stop, frozenset(produced))
+
+    def state_dict(self):
+        """
+        Returns the position of the current iteration as a dictionary that
+        can be saved as JSON, and later passed to load_state_dict (or
+        from_state_dict) to resume the iteration after the last sample
+        produced. Calling it before the first sample of an iteration returns
+        the position of its start.
+
+        Returns
+        -------
+        Dictionary with the keys below:
+            'version' : STATE_VERSION.
+            'options' : options of the reader in STATE_OPTIONS, the
+                options of every group of OPTION_GROUPS as a dictionary
+                (None for follow without follow mode), and stats.
+            'seed', 'epoch' : seed and epoch of the iteration.
+            'files' : list of [root, file] with the data files found, in
+                the order they are read (i.e., shuffled if shuffle is set),
+                or None if the iteration did not start.
+            'tasks' : list of the data files (or ranges of lines, see
+                _get_tasks) read by this instance, as lists.
+            'lines' : list of [task, line, produced] for the tasks partially
+                read, where line is the first line not read yet and
+                produced the lines after it already produced (only with
+                shuffle_buffer).
+            'done' : list of the tasks completely read.
+
+        """
+        
+        options = {name: getattr(self, name) for name in STATE_OPTIONS}
+        for group in OPTION_GROUPS:
+            group_options = self.get_options(group)
+            options[group] = group_options.as_dict() if group_options is not None else None
+        options['parsing']['fields'] = list(self.fields)
+        options['stats'] = self.stats is not None
+        state = {'version': STATE_VERSION, 'options': options, 'seed': self.seed, 'epoch': self.epoch,
+                 'files': None, 'tasks': None, 'lines': [], 'done': []}
+        position = self._resume_state if self._resume_state is not None else self._position
+        if (position is not None):
+            state['files'] = [list(f) for f in position['files']]
+            state['tasks'] = [list(t) for t in position['tasks']]
+            state['lines'] = [[idx, line, sorted(produced)] for idx, (line, produced) in sorted(position['lines'].items())]
+            state['done'] = sorted(position['done'])
+        return state
+
+    def load_state_dict(self, state):
+        """
+        Makes the next iteration resume the iteration whose position state
+        was returned by state_dict: the data files are read in the same
+        order, starting from the file and line where it was interrupted.
+        Only the data files being read when the position was saved are read
+        from their beginning (or directly from the line, with the use_index
+        option), so no other data file is decompressed again. The samples
+        produced are those not produced before, in the same order if
+        interleave is 1, shuffle_buffer is 0, and, with num_workers, ordered
+        is set.
+
+        The options of this instance are not changed, except seed and epoch,
+        but filters must be the same to produce the same samples. Use
+        from_state_dict to create an instance with the saved options.
+        """
+        
+        if (state.get('version') != STATE_VERSION):
+            raise ValueError("Unsupported iterator state version: %s" % state.get('version'))
+        self.seed = state['seed']
+        self.set_epoch(state['epoch'])
+        if (state['files'] is not None):
+            self._resume_state = {'files': [tuple(f) for f in state['files']],
+                                  'tasks': [tuple(t) for t in state['tasks']],
+                                  'lines': {idx: [line, set(produced)] for idx, line, produced in state['lines']},
+                                  'done': set(state['done'])}
+
+    @classmethod
+    def from_state_dict(cls, state, **options):
+        """
+        Returns a new instance with the options saved in state (see
+        state_dict), or those given in options (e.g., filters or
+        stats_callback, which are not saved), that resumes the iteration of
+        state.
+        """
+        
+        if (state.get('version') != STATE_VERSION):
+            raise ValueError("Unsupported iterator state version: %s" % state.get('version'))
+        saved = dict(state['options'])
+        for group, group_cls in OPTION_GROUPS.items():
+            if (saved[group] is not None):
+                saved[group] = group_cls(**saved[group])
+        reader = cls(**dict(saved, **options))
+        reader.load_state_dict(state)
+        return reader
+
+    def _get_tasks(self, tuple_files, first=0):
+        """
+        Returns the list of (root, file, feasibility_of_file) tuples of the
+        data files in tuple_files with samples in the intensity range, or the
+        (root, file, feasibility_of_file, start, stop) tuples of the shard of
+        this instance if the dataset is split into shards. Only the files
+        from first on are considered (the previous ones were already read in
+        follow mode).
+        """
+        
+        if (self._num_shards() > 1):
+            return self._get_shard_tasks()
+        if (self.use_index):
+            index = self._get_index(tuple_files)
+            self._index = index
+        filtered = self._has_filters('input_files') or self._has_filters('header')
+        tasks = []
+        for root, file in tuple_files[first:]:
+            if (not self._check_filters('file', {'file': os.path.join(root, file)})):
+                continue
+            if (len(self.intensity_values) == 0): feasibility_of_file = 2
+            else: feasibility_of_file = self._check_intensity(file)
+            if ((feasibility_of_file == 1 or filtered) and self.use_index):
+                # Skip files without samples in the intensity range or
+                # accepted by the filters
+                rows = index[root][file]['samples']
+                if (not any(self._is_selected(row, feasibility_of_file) for row in rows)):
+                    continue
+            if(feasibility_of_file != 0):
+                tasks.append((root, file, feasibility_of_file))
+        return tasks
+
+    def _iter_serial(self, tasks, total_files, rng):
+        """
+        Reads the data files in tasks in the calling process. Up to
+        interleave files are kept open, and every sample is taken from one of
+        them chosen at random with rng. With interleave=1, files are read one
+        after the other.
+
+        Parameters
+        ----------
+        tasks : list
+            List of (root, file, feasibility_of_file) tuples to read, or
+            (root, file, feasibility_of_file, start, stop[, skip]) tuples to
+            read only a range of lines (see _read_samples).
+        total_files : int
+            Number of data files found, used in the progress messages.
+        rng : random.Random
+            Random number generator used to choose the next file to read.
+
+        Yields
+        ------
+        (idx, s) : tuple
+            Sample instance s read from one of the open data files, whose
+            index in tasks is idx. s is None once all the samples of the data
+            file were produced.
+
+        """
+        
+        ctr = 0
+        pending = enumerate(tasks)
+        # List of [index, task, sample generator, iteration] of the open files
+        active = []
+        try:
+            while(True):
+                while (len(active) < max(1, self.interleave)):
+                    idx, task = next(pending, (None, None))
+                    if (task is None):
+                        break
+                    active.append([idx, task, self._read_samples(*task), 0])
+                if (len(active) == 0):
+                    break
+                i = rng.randrange(len(active)) if len(active) > 1 else 0
+                idx, (root, file, *_), samples, it = active[i]
+                try:
+                    s = next(samples, None)
+                    if (s is not None):
+                        self._set_sample_topology(s, root)
+                except:
+                    if (self.stats is not None):
+                        self.stats.skip('error')
+                    traceback.print_exc()
+                    print ("Error in the file:" +file)
+                    print ("     iteration: " +str(it))
+                    exit()
+                if (s is None):
+                    del active[i]
+                    ctr += 1
+                    self._report_progress(ctr, total_files)
+                    yield (idx, None)
+                    continue
+                active[i][3] += 1
+                yield (idx, s)
+        finally:
+            for _, _, samples, _ in active:
+                samples.close()
+
+    def _shuffle_samples(self, samples, rng):
+        """
+        Shuffles a stream of (idx, s) samples (see _iter_serial) using a
+        buffer of shuffle_buffer samples: once the buffer is full, every new
+        sample replaces a random sample of the buffer, which is yielded. The
+        remaining samples are yielded in random order at the end of the
+        stream. The (idx, None) item of a data file is yielded after all
+        its samples.
+        """
+        
+        buffer = []
+        # Number of samples of each data file in the buffer, and data files
+        # completely read whose samples are still in the buffer
+        buffered = collections.Counter()
+        finished = set()
+        
+        def release(item):
+            idx = item[0]
+            buffered[idx] -= 1
+            yield item
+            if (buffered[idx] == 0 and idx in finished):
+                finished.discard(idx)
+                yield (idx, None)
+        
+        for item in samples:
+            idx, s = item
+            if (s is None):
+                if (buffered[idx] > 0):
+                    finished.add(idx)
+                else:
+                    yield item
+                continue
+            buffered[idx] += 1
+            if (len(buffer) < self.shuffle_buffer):
+                buffer.append(item)
+                continue
+            i = rng.randrange(len(buffer))
+            buffer[i], item = item, buffer[i]
+            yield from release(item)
+        rng.shuffle(buffer)
+        for item in buffer:
+            yield from release(item)
+
+    def _prefetch_samples(self, samples):
+        """
+        Runs the samples generator in a background thread, which reads up to
+        prefetch samples in advance and hands them over through a bounded
+        queue. Exceptions raised by the generator (including the exit of a
+        reading error) are raised again by the consumer. When the consumer
+        stops iterating, the thread is stopped and closes the generator, so
+        that its files and workers are released.
+        """
+        
+        buffer = queue.Queue(self.prefetch)
+        stop = threading.Event()
+        
+        def put(item):
+            # Waits for space in the buffer unless the consumer stopped
+            while (not stop.is_set()):
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def produce():
+            try:
+                for s in samples:
+                    if (not put(('sample', s))):
+                        return
+                put(('done', None))
+            except BaseException as e:
+                put(('error', e))
+            finally:
+                samples.close()
+        
+        producer = threading.Thread(target=produce, name="datanetAPI-prefetch", daemon=True)
+        producer.start()
+        try:
+            while (True):
+                kind, payload = buffer.get()
+                if (kind == 'sample'):
+                    yield payload
+                elif (kind == 'done'):
+                    break
+                else:
+                    raise payload
+        finally:
+            stop.set()
+            # Unblock the producer if it is waiting for space in the buffer
+            while (True):
+                try:
+                    buffer.get_nowait()
+                except queue.Empty:
+                    break
+            producer.join()
+
+    def batches(self, batch_size, drop_last=False):
+        """
+        Iterates over the dataset in batches of samples packed into arrays
+        (see collate). The samples are produced by the iterator of this
+        instance, so all its options (shuffle, num_workers...) apply.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of samples of every batch.
+        drop_last : boolean
+            Whether to skip the last batch if it has less than batch_size
+            samples. By default false.
+
+        Yields
+        ------
+        batch : dictionary
+            Dictionary of arrays returned by collate.
+
+        """
+        
+        samples = []
+        for s in self:
+            samples.append(s)
+            if (len(samples) == batch_size):
+                yield self.collate(samples)
+                samples = []
+        if (len(samples) > 0 and not drop_last):
+            yield self.collate(samples)
+
+    def collate(self, samples):
+        """
+        Packs a list of samples into arrays with the paths and links of all
+        of them, as used by graph neural networks. Paths are the src-dst
+        pairs with different src and dst, in src-dst order. Paths and links
+        of all the samples are numbered consecutively, sample after sample.
+        Samples need the 'performance', 'routing' and 'topology' fields.
+
+        Returns
+        -------
+        Dictionary with the following keys, where P and L are the total
+        number of paths and links of the batch:
+            'path_features' : Px11 array with the PERF_COLUMNS of every path
+                (aggregate bandwidth and packets, delay, jitter, drops...).
+            'path_src', 'path_dst' : source and destination node of every
+                path, numbered within its sample.
+            'link_capacity' : bandwidth of every link.
+            'path_links' : links traversed by every path, one path after the
+                other, and 'path_link_offsets' (P+1 elements), where the
+                links of path p are
+                path_links[path_link_offsets[p]:path_link_offsets[p+1]].
+            'path_link_positions' : position of every element of path_links
+                in its path.
+            'link_paths' : paths traversing every link, one link after the
+                other, and 'link_path_offsets' (L+1 elements), where the paths
+                of link l are
+                link_paths[link_path_offsets[l]:link_path_offsets[l+1]].
+            'path_sample', 'link_sample' : sample of every path and link.
+            'sample_path_offsets', 'sample_link_offsets' : arrays of B+1
+                elements with the first path and link of every sample.
+            'maxAvgLambda' : maxAvgLambda of every sample.
+
+        """
+        
+        parts = {'path_features': [], 'path_src': [], 'path_dst': [], 'link_capacity': [],
+                 'path_links': [], 'path_link_offsets': [numpy.zeros(1, dtype=numpy.int64)],
+                 'path_link_positions': []}
+        n_paths = [0]
+        n_links = [0]
+        for s in samples:
+            topology = s.get_topology()
+            if (topology is None or s.get_routing_paths() is None):
+                raise ValueError("Samples need the 'routing' and 'topology' fields")
+            links = s.get_routing_paths().get_links(topology)
+            agg = s.get_performance_array()
+            parts['path_features'].append(agg[links['path_src'], links['path_dst']])
+            parts['path_src'].append(links['path_src'])
+            parts['path_dst'].append(links['path_dst'])
+            parts['link_capacity'].append(numpy.asarray(topology.edge_attrs['bandwidth'], dtype=numpy.float64))
+            parts['path_links'].append(links['path_links'] + n_links[-1])
+            parts['path_link_offsets'].append(links['path_link_offsets'][1:] + parts['path_link_offsets'][-1][-1])
+            parts['path_link_positions'].append(links['path_link_positions'])
+            n_paths.append(n_paths[-1] + len(links['path_src']))
+            n_links.append(n_links[-1] + len(topology.edge_src))
+        
+        batch = {key: numpy.concatenate(value) for key, value in parts.items()}
+        batch['sample_path_offsets'] = numpy.array(n_paths, dtype=numpy.int64)
+        batch['sample_link_offsets'] = numpy.array(n_links, dtype=numpy.int64)
+        batch['path_sample'] = numpy.repeat(numpy.arange(len(samples)), numpy.diff(batch['sample_path_offsets']))
+        batch['link_sample'] = numpy.repeat(numpy.arange(len(samples)), numpy.diff(batch['sample_link_offsets']))
+        # Paths traversing every link, sorting the links of every path
+        hop_paths = numpy.repeat(numpy.arange(n_paths[-1]), numpy.diff(batch['path_link_offsets']))
+        order = numpy.argsort(batch['path_links'], kind='stable')
+        batch['link_paths'] = hop_paths[order]
+        batch['link_path_offsets'] = numpy.zeros(n_links[-1] + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(batch['path_links'], minlength=n_links[-1]), out=batch['link_path_offsets'][1:])
+        batch['maxAvgLambda'] = numpy.array([s.get_maxAvgLambda() for s in samples])
+        return batch
+
+    def _iter_parallel(self, tasks, total_files):
+        """
+        Reads the data files in tasks using num_workers processes. Each worker
+        reads and processes whole data files and sends the samples back
+        through a bounded queue shared by all the workers. Routing matrices
+        and topology objects are set by the consumer.
+
+        Workers take the next file from a shared queue when they finish the
+        previous one, and files are put in the queue largest first, so that
+        the largest files do not delay the end of the iteration. In unordered
+        mode, all the files are queued at once and samples are yielded as
+        soon as they arrive. In ordered mode, only the files in a window of
+        2*num_workers files starting at the first file not yielded yet are
+        queued (largest first), and the samples of the files read ahead of
+        this file are kept in a reorder buffer until it is done, so that
+        samples are yielded in the same order as the serial reader and the
+        buffer never holds more than the samples of the window.
+
+        Parameters
+        ----------
+        tasks : list
+            List of (root, file, feasibility_of_file) tuples to read, or
+            (root, file, feasibility_of_file, start, stop[, skip]) tuples to
+            read only a range of lines (see _read_samples).
+        total_files : int
+            Number of data files found, used in the progress messages.
+
+        Yields
+        ------
+        (idx, s) : tuple
+            Sample instance s read by one of the workers from the data file
+            tasks[idx], or None once all its samples were produced.
+
+        """
+        
+        ctx = multiprocessing.get_context()
+        num_workers = self.num_workers
+        task_queue = ctx.Queue()
+        result_queue = ctx.Queue(self.queue_size)
+        window = 2 * num_workers if self.ordered else len(tasks)
+        # Files not queued yet, largest first, and first file not in them
+        candidates = []
+        next_task = 0
+        # First file not yielded yet (ordered mode), samples read ahead of it
+        # and files already read
+        current = 0
+        buffers = {}
+        finished = set()
+        
+        def schedule():
+            nonlocal next_task
+            while (next_task < min(current + window, len(tasks))):
+                heapq.heappush(candidates, (-self._data_file_size(*tasks[next_task][:2]), next_task))
+                next_task += 1
+            while (len(candidates) > 0):
+                _, idx = heapq.heappop(candidates)
+                task_queue.put((idx,) + tasks[idx])
+            if (next_task == len(tasks)):
+                for _ in range(num_workers):
+                    task_queue.put(None)
+                next_task += 1
+        
+        schedule()
+        workers = [ctx.Process(target=_parallel_reader_worker, args=(self, task_queue, result_queue), daemon=True)
+                   for _ in range(num_workers)]
+        for w in workers:
+            w.start()
+        
+        try:
+            ctr = 0
+            exited = 0
+            its = [0] * len(tasks)
+            while (exited < num_workers):
+                kind, task, payload = result_queue.get()
+                if (kind == 'sample'):
+                    s = pickle.loads(payload)
+                    self._set_sample_topology(s, tasks[task][0])
+                    its[task] += 1
+                    if (self.ordered and task != current):
+                        buffers.setdefault(task, []).append(s)
+                    else:
+                        yield (task, s)
+                elif (kind == 'done'):
+                    finished.add(task)
+                    if (not self.ordered):
+                        ctr += 1
+                        self._report_progress(ctr, total_files)
+                        yield (task, None)
+                        continue
+                    while (current in finished):
+                        ctr += 1
+                        self._report_progress(ctr, total_files)
+                        yield (current, None)
+                        current += 1
+                        for s in buffers.pop(current, []):
+                            yield (current, s)
+                        schedule()
+                elif (kind == 'error'):
+                    error, trace = payload
+                    if (self.stats is not None):
+                        self.stats.skip('error')
+                    print (trace, end='')
+                    print ("Error in the file:" +tasks[task][1])
+                    print ("     iteration: " +str(its[task]))
+                    raise pickle.loads(error)
+                elif (kind == 'exit'):
+                    exited += 1
+                    read_stats, stats = payload
+                    for key in read_stats:
+                        self.read_stats[key] += read_stats[key]
+                    if (self.stats is not None):
+                        self.stats.merge(stats)
+        finally:
+            for w in workers:
+                if (w.is_alive()):
+                    w.terminate()
+                w.join()
+
+    def _cache_path(self, root, name):
+        """
+        Returns the path of the file name generated from the dataset
+        directory root (see the cache_dir option).
+        """
+        
+        if (self.cache_dir is None):
+            return os.path.join(root, ".datanetAPI", name)
+        key = hashlib.sha1(os.path.abspath(root).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, key, name)
+
+    def _build_archive_index(self, root, file):
+        """
+        Reads a data file and returns its index entry.
+
+        Returns
+        -------
+        Dictionary with the mtime and size of the file, a 'members'
+        dictionary with the offset of each one of the files in SAMPLE_FILES
+        in the decompressed archive, and a 'samples' list with an entry for
+        every line of the data file. Each entry is a list
+        with the values in INDEX_COLUMNS, where 'ok' states whether the
+        simulation was stable and 'offsets' contains the byte offset of the
+        line in each one of the files in SAMPLE_FILES (None if missing).
+        Values other than 'ok' are None for lines that could not be parsed.
+
+        """
+        
+        path = os.path.join(root, file)
+        stat = _stat_data_file(path)
+        members = {}
+        files, close_archive = self._open_archive(path, streaming=True, file_names=SAMPLE_FILES,
+                                                  member_offsets=members)
+        samples = []
+        try:
+            while(True):
+                offsets = []
+                lines = {}
+                for name in SAMPLE_FILES:
+                    if (files[name] is None):
+                        offsets.append(None)
+                        lines[name] = None
+                    else:
+                        offsets.append(files[name].tell())
+                        lines[name] = files[name].readline().decode()
+                results_line = lines["simulationResults.txt"][:-2]
+                traffic_line = lines["traffic.txt"][:-1]
+                if (len(results_line) == 0) or (len(traffic_line) == 0):
+                    break
+                status_line = lines["stability.txt"][:-1]
+                ok = ";OK;" in status_line
+                try:
+                    header = _parse_sample_header(results_line, traffic_line, status_line)
+                    used_files = lines["input_files.txt"][:-1].split(';')
+                    samples.append([ok, header['maxAvgLambda']] + list(header['global']) +
+                                   [header['sim_time'], header['net_size'], used_files[1], used_files[2], offsets])
+                except (ValueError, IndexError):
+                    if (ok):
+                        raise
+                    samples.append([ok] + [None] * (len(INDEX_COLUMNS) - 2) + [offsets])
+        finally:
+            close_archive()
+        return {'mtime': stat.st_mtime, 'size': stat.st_size, 'members': members, 'samples': samples}
+
+    def _get_index(self, tuple_files):
+        """
+        Returns the index of the data files in tuple_files, loading it from
+        the index files of the dataset directories (or from the index kept
+        in memory by the instance, if any). Entries of data files whose
+        modification time or size changed are rebuilt using worker
+        processes, entries of data files that no longer exist are removed,
+        and the index files are updated. Errors writing the index
+        files are ignored, e.g., if the dataset directory is read-only, and
+        the index is only kept in memory.
+
+        Returns
+        -------
+        Dictionary where index[root][file] is the entry returned by
+        _build_archive_index for the data file.
+
+        """
+        
+        index = {}
+        stale = []
+        for root, file in tuple_files:
+            if (root not in index):
+                index[root] = dict(self._index.get(root, {}))
+                if (len(index[root]) == 0):
+                    try:
+                        with open(self._cache_path(root, "index.json")) as f:
+                            data = json.load(f)
+                        if (data['version'] == INDEX_VERSION):
+                            index[root] = data['archives']
+                    except (OSError, ValueError, KeyError):
+                        pass
+            stat = _stat_data_file(os.path.join(root, file))
+            entry = index[root].get(file)
+            if (entry is None or entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size):
+                stale.append((root, file))
+        
+        if (len(stale) > 0):
+            num_workers = self.num_workers if self.num_workers > 0 else (os.cpu_count() or 1)
+            num_workers = min(num_workers, len(stale))
+            if (num_workers > 1):
+                with multiprocessing.get_context().Pool(num_workers) as pool:
+                    entries = pool.starmap(_build_archive_index_worker, [(self, root, file) for root, file in stale])
+            else:
+                entries = [self._build_archive_index(root, file) for root, file in stale]
+            for (root, file), entry in zip(stale, entries):
+                index[root][file] = entry
+        
+        files = {}
+        for root, file in tuple_files:
+            files.setdefault(root, set()).add(file)
+        for root in index:
+            # Entries of other data files of the directory are kept, e.g.,
+            # those of the other shards (see _get_shard_tasks)
+            removed = [file for file in index[root] if file not in files[root] and
+                       not os.path.exists(os.path.join(root, file))]
+            for file in removed:
+                del index[root][file]
+            if (len(removed) > 0 or any(r == root for r, _ in stale)):
+                data = {'version': INDEX_VERSION, 'archives': index[root]}
+                try:
+                    _atomic_write(self._cache_path(root, "index.json"), json.dumps(data).encode())
+                except OSError:
+                    pass
+        return index
+
+    def _is_selected(self, row, feasibility_of_file):
+        """
+        Returns whether a line of a data file, described by its index entry
+        row, is produced by the iterator.
+        """
+        
+        if (not row[0]):
+            return False
+        if (feasibility_of_file == 1):
+            if (row[1] < self.intensity_values[0]) or (row[1] > self.intensity_values[1]):
+                return False
+        if (len(self.filters) > 0):
+            values = dict(zip(INDEX_COLUMNS, row))
+            return self._check_filters('input_files', values) and self._check_filters('header', values)
+        return True
+
+    def _get_sample_list(self):
+        """
+        Returns a list of (root, file, line) tuples with the location of the
+        samples produced by the iterator, in the same order. The list is
+        computed the first time it is needed from the dataset index of the
+        data files of the shard of this instance (see _get_shard_files).
+        ValueError is raised if there are 'sample' filters, since all the
+        samples would have to be parsed.
+        
+        With the drop_remainder option, the list of all the samples is
+        instead cut into as many contiguous ranges of the same length as
+        shards, dropping the last samples if needed, and only the range of
+        the shard of this instance is returned. This needs the index of all
+        the data files.
+        """
+        
+        if (self._sample_list is None):
+            if ('sample' in self.filters):
+                raise ValueError("'sample' filters can not be used with len or indexing")
+            num_shards = self._num_shards()
+            equal_shards = self.drop_remainder and num_shards > 1
+            shard_files = self._get_shard_files(1 if equal_shards else num_shards)
+            self._index.update(self._get_index([(root, file) for root, file, _, _, _ in shard_files]))
+            sample_list = []
+            for root, file, feasibility_of_file, begin, end in shard_files:
+                for line in self._get_shard_lines(root, file, feasibility_of_file, begin, end):
+                    sample_list.append((root, file, line))
+            if (equal_shards):
+                # Every shard takes a contiguous range of the same length
+                shard = self.rank * self.num_loader_workers + self.loader_worker_id
+                shard_size = len(sample_list) // num_shards
+                sample_list = sample_list[shard*shard_size:(shard+1)*shard_size]
+            self._sample_list = sample_list
+        return self._sample_list
+
+    def _num_shards(self):
+        """
+        Returns the number of shards the dataset is split into, one for each
+        loader worker of each rank.
+        """
+        
+        return self.world_size * self.num_loader_workers
+
+    def _get_shard_files(self, num_shards):
+        """
+        Returns the data files of the shard of this instance when the dataset
+        is split into num_shards shards, without using the dataset index. The
+        data files with samples in the intensity range (in the order of the
+        current epoch) are cut into num_shards contiguous ranges of the same
+        number of files, where the file at each end of a range may be split
+        between consecutive shards. Hence, with at least as many files as
+        shards, shards are whole data files plus at most one partial file at
+        each end, and no sample is dropped, but shards may have different
+        numbers of samples.
+
+        Returns
+        -------
+        List of (root, file, feasibility_of_file, begin, end) tuples, where
+        begin and end are the fractions (between 0 and 1) of the samples of
+        the file taken by the shard (see _get_shard_lines).
+
+        """
+        
+        shard = self.rank * self.num_loader_workers + self.loader_worker_id if num_shards > 1 else 0
+        tuple_files, _ = self._get_data_files()
+        files = []
+        for root, file in tuple_files:
+            if (len(self.intensity_values) == 0): feasibility_of_file = 2
+            else: feasibility_of_file = self._check_intensity(file)
+            if (feasibility_of_file != 0 and self._check_filters('file', {'file': os.path.join(root, file)})):
+                files.append((root, file, feasibility_of_file))
+        # The shard takes the files from start to end (positions in files)
+        start = fractions.Fraction(shard * len(files), num_shards)
+        end = fractions.Fraction((shard + 1) * len(files), num_shards)
+        shard_files = []
+        for i in range(math.floor(start), math.ceil(end)):
+            shard_files.append(files[i] + (max(start - i, 0), min(end - i, 1)))
+        return shard_files
+
+    def _get_shard_lines(self, root, file, feasibility_of_file, begin, end):
+        """
+        Returns the lines of the samples of a data file selected by the
+        dataset index (see _is_selected), which must be loaded, from the
+        fraction begin to the fraction end of them (see _get_shard_files).
+        Consecutive shards thus take consecutive lines.
+        """
+        
+        rows = self._index[root][file]['samples']
+        lines = [line for line, row in enumerate(rows) if self._is_selected(row, feasibility_of_file)]
+        return lines[math.floor(begin * len(lines)):math.floor(end * len(lines))]
+
+    def _get_shard_tasks(self):
+        """
+        Returns the list of tasks (see _get_tasks) with the data files of the
+        shard of this instance: (root, file, feasibility_of_file) for the
+        whole files, and (root, file, feasibility_of_file, start, stop) with
+        the range of lines of the partial files. Only the partial files are
+        indexed (or all the data files, with the drop_remainder option, see
+        _get_sample_list).
+        """
+        
+        if (self.drop_remainder):
+            tasks = []
+            for root, file, line in self._get_sample_list():
+                if (len(tasks) > 0 and tasks[-1][:2] == (root, file)):
+                    tasks[-1][4] = line + 1
+                else:
+                    if (len(self.intensity_values) == 0): feasibility_of_file = 2
+                    else: feasibility_of_file = self._check_intensity(file)
+                    tasks.append([root, file, feasibility_of_file, line, line + 1])
+            return [tuple(task) for task in tasks]
+        shard_files = self._get_shard_files(self._num_shards())
+        partial = [(root, file) for root, file, _, begin, end in shard_files if begin > 0 or end < 1]
+        if (len(partial) > 0):
+            self._index.update(self._get_index(partial))
+        tasks = []
+        for root, file, feasibility_of_file, begin, end in shard_files:
+            if (begin == 0 and end == 1):
+                tasks.append((root, file, feasibility_of_file))
+                continue
+            lines = self._get_shard_lines(root, file, feasibility_of_file, begin, end)
+            if (len(lines) > 0):
+                tasks.append((root, file, feasibility_of_file, lines[0], lines[-1] + 1))
+        return tasks
+
+    def __len__(self):
+        """
+        Returns the number of samples produced by the iterator.
+        """
+        
+        return len(self._get_sample_list())
+
+    def __getitem__(self, i):
+        """
+        Returns the i-th sample produced by the iterator. The data file of the
+        sample is decompressed and kept open, so that reading other samples
+        from the same file is fast. With the checkpoints option, the lines of
+        the sample are instead read seeking directly to them in the data
+        file (see _open_gzip).
+        """
+        
+        root, file, line = self._get_sample_list()[i]
+        path = os.path.join(root, file)
+        segment = self._get_store_segment(root, file)
+        if (segment is None and self._epoch_cache is not None):
+            segment = self._get_epoch_cache_segment(root, file)
+        if (segment is not None):
+            s = self._new_sample(path, line)
+            self._set_store_sample(s, segment, numpy.searchsorted(segment.columns['line'], line),
+                                   [f for f in ARRAY_FIELDS if f in self.fields])
+            self._set_sample_topology(s, root)
+            return s
+        hit = self._archive_cache is not None and self._archive_cache[0] == path
+        if (self.stats is not None):
+            self.stats.count_cache('archive', hit)
+        if (not hit):
+            self._close_archive_cache()
+            if (self.checkpoints and isinstance(self._get_codec(path), GzipCodec)):
+                self._archive_cache = (path,) + self._open_checkpointed_archive(path)
+            else:
+                files, close_archive = self._open_archive(path, streaming=True)
+                self._archive_cache = (path, files, close_archive)
+        files = self._archive_cache[1]
+        
+        entry = self._index[root][file]
+        lines = dict.fromkeys(SAMPLE_FILES)
+        for name, offset in zip(SAMPLE_FILES, entry['samples'][line][-1]):
+            if (offset is None):
+                continue
+            if (name == "flowSimulationResults.txt" and 'flow_performance' not in self.fields):
+                continue
+            if (not isinstance(files, dict)):
+                # Checkpointed archives are a single decompressed stream
+                files.seek(entry['members'][name] + offset)
+                lines[name] = files.readline().decode()
+            elif (files[name] is not None):
+                files[name].seek(offset)
+                lines[name] = files[name].readline().decode()
+        
+        s = self._new_sample(path, line)
+        s._results_line = lines["simulationResults.txt"][:-2]
+        s._traffic_line = lines["traffic.txt"][:-1]
+        if (lines["flowSimulationResults.txt"] is not None):
+            s._flowresults_line = lines["flowSimulationResults.txt"][:-2]
+        s._status_line = lines["stability.txt"][:-1]
+        s._input_files_line = lines["input_files.txt"][:-1]
+        self._process_sample(s)
+        self._set_sample_topology(s, root)
+        return s
+
+    def _open_checkpointed_archive(self, path):
+        """
+        Opens a data file for __getitem__ with the checkpoints option, and
+        returns the seekable file object with the decompressed archive and a
+        function closing it and updating read_stats.
+        """
+        
+        stats = self.stats
+        start = time.perf_counter() if stats is not None else None
+        compressed = open(path, 'rb')
+        if (stats is not None):
+            compressed = _CountingReader(compressed)
+        try:
+            gz = io.BufferedReader(self._open_gzip(path, compressed), self.checkpoint_buffer_size)
+        except:
+            compressed.close()
+            raise
+        if (stats is not None):
+            elapsed = time.perf_counter() - start
+            self.read_stats['read_time'] += elapsed
+            stats.add_time('open', elapsed)
+        
+        def close():
+            gz.close()
+            compressed.close()
+            if (stats is None):
+                return
+            self.read_stats['archives'] += 1
+            self.read_stats['archive_bytes'] += os.path.getsize(path)
+            self.read_stats['compressed_bytes'] += compressed.bytes_read
+            self.read_stats['decompressed_bytes'] += gz.raw.bytes_decompressed
+        
+        return (gz, close)
+
+    def _close_archive_cache(self):
+        """
+        Closes the data file kept open by __getitem__.
+        """
+        
+        if (self._archive_cache is not None):
+            self._archive_cache[2]()
+            self._archive_cache = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Queues and open files can not be sent to the worker processes
+        del state['dict_queue']
+        state['_position'] = None
+        state['_resume_state'] = None
+        state['_manifest'] = None
+        state['_data_file_sizes'] = {}
+        state['_archive_cache'] = None
+        state['_gzip_checkpoints'] = {}
+        state['_topologies'] = _LRUCache(self.max_topologies, self.max_topology_memory)
+        state['_store_segments'] = _LRUCache(self.max_store_segments)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.dict_queue = queue.Queue()
+    
+    def _process_flow_results_traffic_line(self, rline, tline, fline, sline, s):
+        """
+        
+
+        Parameters
+        ----------
+        rline : str
+            Last line read in the results file.
+        tline : str
+            Last line read in the traffic file.
+        fline : str
+            Last line read in the flows file.
+        s : Sample
+            Instance of Sample associated with the current iteration.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        q_flows = queue.Queue()
+        first_params = rline.split('|')[0].split(',')
+        first_params = list(map(float, first_params))
+        s._set_global_packets(first_params[0])
+        s._set_global_losses(first_params[1])
+        s._set_global_delay(first_params[2])
+        r = rline[rline.find('|')+1:].split(';')
+        if (fline):
+            f = fline.split(';')
+        else:
+            f = r
+        
+        ptr = tline.find('|')
+        t = tline[ptr+1:].split(';')
+        s.maxAvgLambda = float(tline[:ptr])
+        sim_time  = float(sline.split(';')[0])
+        
+        m_result = []
+        m_traffic = []
+        for i in range(0,len(r), int(math.sqrt(len(r)))):
+            new_result_row = []
+            new_traffic_row = []
+            for j in range(i, i+int(math.sqrt(len(r)))):
+                dict_result_srcdst = {}
+                aux_agg_ = r[j].split(',')
+                aux_agg = list(map(float, aux_agg_))
+                dict_result_agg = {'PktsDrop':aux_agg[2], "AvgDelay":aux_agg[3], "AvgLnDelay":aux_agg[4], "p10":aux_agg[5], "p20":aux_agg[6], "p50":aux_agg[7], "p80":aux_agg[8], "p90":aux_agg[9], "Jitter":aux_agg[10]}
+                
+                lst_result_flows = []
+                aux_result_flows = f[j].split(':')
+                for flow in aux_result_flows:
+                    dict_result_tmp = {}
+                    tmp_result_flow = flow.split(',')
+                    tmp_result_flow = list(map(float, tmp_result_flow))
+                    q_flows.put([tmp_result_flow[0], tmp_result_flow[1]])
+                    dict_result_tmp = {'PktsDrop':tmp_result_flow[2], "AvgDelay":tmp_result_flow[3], "AvgLnDelay":tmp_result_flow[4], "p10":tmp_result_flow[5], "p20":tmp_result_flow[6], "p50":tmp_result_flow[7], "p80":tmp_result_flow[8], "p90":tmp_result_flow[9], "Jitter":tmp_result_flow[10]}
+                    lst_result_flows.append(dict_result_tmp)
+                
+                dict_traffic_srcdst = {}
+                # From kbps to bps
+                dict_traffic_agg = {'AvgBw':aux_agg[0]*1000,
+                                    'PktsGen':aux_agg[1],
+                                    'TotalPktsGen':aux_agg[1]*sim_time}
+                lst_traffic_flows = []
+                aux_traffic_flows = t[j].split(':')
+                for flow in aux_traffic_flows:
+                    dict_traffic = {}
+                    q_values_for_flow = q_flows.get()
+                    tmp_traffic_flow = flow.split(',')
+                    tmp_traffic_flow = list(map(float, tmp_traffic_flow))
+                    offset = self._timedistparams(tmp_traffic_flow,dict_traffic)
+                    if offset != -1:
+                        self._sizedistparams(tmp_traffic_flow, offset, dict_traffic)
+                        # From kbps to bps
+                        dict_traffic['AvgBw'] = q_values_for_flow[0]*1000
+                        dict_traffic['PktsGen'] = q_values_for_flow[1]
+                        dict_traffic['TotalPktsGen'] = sim_time * dict_traffic['PktsGen']
+                        dict_traffic['ToS'] = tmp_traffic_flow[-1]
+                    if (len(dict_traffic.keys())!=0):
+                        lst_traffic_flows.append (dict_traffic)
+                
+                dict_result_srcdst['AggInfo'] = dict_result_agg
+                dict_result_srcdst['Flows'] = lst_result_flows
+                dict_traffic_srcdst['AggInfo'] = dict_traffic_agg
+                dict_traffic_srcdst['Flows'] = lst_traffic_flows
+                new_result_row.append(dict_result_srcdst)
+                new_traffic_row.append(dict_traffic_srcdst)
+                
+            m_result.append(new_result_row)
+            m_traffic.append(new_traffic_row)
+        m_result = numpy.asmatrix(m_result)
+        m_traffic = numpy.asmatrix(m_traffic)
+        s._set_performance_matrix(m_result)
+        s._set_traffic_matrix(m_traffic)
+
+    def _process_flow_results_traffic_arrays(self, rline, tline, fline, sline, s):
+        """
+        Same as _process_flow_results_traffic_line, but lines are parsed in
+        bulk into numpy arrays. The performance_matrix and traffic_matrix of
+        s are built from these arrays the first time they are accessed. Only
+        the requested fields are parsed, and none of them in lazy mode.
+
+        Parameters
+        ----------
+        rline : str
+            Last line read in the results file.
+        tline : str
+            Last line read in the traffic file.
+        fline : str
+            Last line read in the flows file.
+        sline : str
+            Last line read in the stability file.
+        s : Sample
+            Instance of Sample associated with the current iteration.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        if (self.lazy):
+            arrays = _parse_sample_arrays(rline, tline, fline, sline, ())
+        else:
+            arrays = _parse_sample_arrays(rline, tline, fline, sline,
+                                          [f for f in ARRAY_FIELDS if f in self.fields])
+        s._arrays = arrays
+        s._set_global_packets(arrays['global'][0])
+        s._set_global_losses(arrays['global'][1])
+        s._set_global_delay(arrays['global'][2])
+        s.maxAvgLambda = arrays['maxAvgLambda']
+
+    def _timedistparams(self, data, dict_traffic):
+        """
+        
+
+        Parameters
+        ----------
+        data : List
+            List of all the flow traffic parameters to be processed.
+        dict_traffic: dictionary
+            Dictionary to fill with the time distribution information
+            extracted from data
+
+        Returns
+        -------
+        offset : int
+            Number of elements read from the list of parameters data
+
+        """
+        
+        if data[0] == 0: 
+            dict_traffic['TimeDist'] = TimeDist.EXPONENTIAL_T
+            params = {}
+            params['EqLambda'] = data[1]
+            params['AvgPktsLambda'] = data[2]
+            params['ExpMaxFactor'] = data[3]
+            dict_traffic['TimeDistParams'] = params
+            return 4
+        elif data[0] == 1:
+            dict_traffic['TimeDist'] = TimeDist.DETERMINISTIC_T
+            params = {}
+            params['EqLambda'] = data[1]
+            params['AvgPktsLambda'] = data[2]
+            dict_traffic['TimeDistParams'] = params
+            return 3
+        elif data[0] == 2:
+            dict_traffic['TimeDist'] = TimeDist.UNIFORM_T
+            params = {}
+            params['EqLambda'] = data[1]
+            params['MinPktLambda'] = data[2]
+            params['MaxPktLambda'] = data[3]
+            dict_traffic['TimeDistParams'] = params
+            return 4
+        elif data[0] == 3:
+            dict_traffic['TimeDist'] = TimeDist.NORMAL_T
+            params = {}
+            params['EqLambda'] = data[1]
+            params['AvgPktsLambda'] = data[2]
+            params['StdDev'] = data[3]
+            dict_traffic['TimeDistParams'] = params
+            return 4
+        elif data[0] == 4:
+            dict_traffic['TimeDist'] = TimeDist.ONOFF_T
+            params = {}
+            params['EqLambda'] = data[1]
+            params['PktsLambdaOn'] = data[2]
+            params['AvgTOff'] = data[3]
+            params['AvgTOn'] = data[4]
+            params['ExpMaxFactor'] = data[5]
+            dict_traffic['TimeDistParams'] = params
+            return 6
+        elif data[0] == 5:
+            dict_traffic['TimeDist'] = TimeDist.PPBP_T
+            params = {}
+            params['EqLambda'] = data[1]
+            params['BurstGenLambda'] = data[2]
+            params['Bitrate'] = data[3]
+            params['ParetoMinSize'] = data[4]
+            params['ParetoMaxSize'] = data[5]
+            params['ParetoAlfa'] = data[6]
+            params['ExpMaxFactor'] = data[7]
+            dict_traffic['TimeDistParams'] = params
+            return 8
+        else: return -1
+    
+    def _sizedistparams(self, data, starting_point, dict_traffic):
+        """
+        
+
+        Parameters
+        ----------
+        data : List
+            List of all the flow traffic parameters to be processed.
+        starting_point : int
+            Point of the overall traffic file line where the extraction of
+            data regarding the size distribution should start.
+        dict_traffic : dictionary
+            Dictionary to fill with the size distribution information
+            extracted from data
+
+        Returns
+        -------
+        ret : int
+            0 if it finish successfully and -1 otherwise
+
+        """
+        
+        if data[starting_point] == 0:
+            dict_traffic['SizeDist'] = SizeDist.DETERMINISTIC_S
+            params = {}
+            params['AvgPktSize'] = data[starting_point+1]
+            dict_traffic['SizeDistParams'] = params
+        elif data[starting_point] == 1:
+            dict_traffic['SizeDist'] = SizeDist.UNIFORM_S
+            params = {}
+            params['AvgPktSize'] = data[starting_point+1]
+            params['MinSize'] = data[starting_point+2]
+            params['MaxSize'] = data[starting_point+3]
+            dict_traffic['SizeDistParams'] = params
+        elif data[starting_point] == 2:
+            dict_traffic['SizeDist'] = SizeDist.BINOMIAL_S
+            params = {}
+            params['AvgPktSize'] = data[starting_point+1]
+            params['PktSize1'] = data[starting_point+2]
+            params['PktSize2'] = data[starting_point+3]
+            dict_traffic['SizeDistParams'] = params
+        elif data[starting_point] == 3:
+            dict_traffic['SizeDist'] = SizeDist.GENERIC_S
+            params = {}
+            params['AvgPktSize'] = data[starting_point+1]
+            params['NumCandidates'] = data[starting_point+2]
+            for i in range(0, int(data[starting_point+2]) * 2, 2):
+                params["Size_%d"%(i/2)] = data[starting_point+3+i]
+                params["Prob_%d"%(i/2)] = data[starting_point+4+i]
+            dict_traffic['SizeDistParams'] = params
+        else:
+            return -1
+        return 0
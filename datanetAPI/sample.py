@@ -0,0 +1,1194 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Parser of the lines of the data files and the Sample classes.
+
+import numpy, math, collections, types
+from enum import IntEnum
+
+class TimeDist(IntEnum):
+    """
+    Enumeration of the supported time distributions 
+    """
+    EXPONENTIAL_T = 0
+    DETERMINISTIC_T = 1
+    UNIFORM_T = 2
+    NORMAL_T = 3
+    ONOFF_T = 4
+    PPBP_T = 5
+    
+    @staticmethod
+    def getStrig(timeDist):
+        if (timeDist == 0):
+            return ("EXPONENTIAL_T")
+        elif (timeDist == 1):
+            return ("DETERMINISTIC_T")
+        elif (timeDist == 2):
+            return ("UNIFORM_T")
+        elif (timeDist == 3):
+            return ("NORMAL_T")
+        elif (timeDist == 4):
+            return ("ONOFF_T")
+        elif (timeDist == 5):
+            return ("PPBP_T")
+        else:
+            return ("UNKNOWN")
+
+class SizeDist(IntEnum):
+    """
+    Enumeration of the supported size distributions 
+    """
+    DETERMINISTIC_S = 0
+    UNIFORM_S = 1
+    BINOMIAL_S = 2
+    GENERIC_S = 3
+    
+    @staticmethod
+    def getStrig(sizeDist):
+        if (sizeDist == 0):
+            return ("DETERMINISTIC_S")
+        elif (sizeDist == 1):
+            return ("UNIFORM_S")
+        elif (sizeDist == 2):
+            return ("BINOMIAL_S")
+        elif (sizeDist ==3):
+            return ("GENERIC_S")
+        else:
+            return ("UNKNOWN")
+
+# Names of the parameters of each time distribution, in the order they are
+# found in traffic.txt after the distribution identifier
+TIME_DIST_PARAMS = {
+    TimeDist.EXPONENTIAL_T: ('EqLambda', 'AvgPktsLambda', 'ExpMaxFactor'),
+    TimeDist.DETERMINISTIC_T: ('EqLambda', 'AvgPktsLambda'),
+    TimeDist.UNIFORM_T: ('EqLambda', 'MinPktLambda', 'MaxPktLambda'),
+    TimeDist.NORMAL_T: ('EqLambda', 'AvgPktsLambda', 'StdDev'),
+    TimeDist.ONOFF_T: ('EqLambda', 'PktsLambdaOn', 'AvgTOff', 'AvgTOn', 'ExpMaxFactor'),
+    TimeDist.PPBP_T: ('EqLambda', 'BurstGenLambda', 'Bitrate', 'ParetoMinSize',
+                      'ParetoMaxSize', 'ParetoAlfa', 'ExpMaxFactor')}
+
+# Names of the parameters of each size distribution, in the order they are
+# found in traffic.txt after the distribution identifier. GENERIC_S is
+# followed by NumCandidates pairs of Size_i, Prob_i values.
+SIZE_DIST_PARAMS = {
+    SizeDist.DETERMINISTIC_S: ('AvgPktSize',),
+    SizeDist.UNIFORM_S: ('AvgPktSize', 'MinSize', 'MaxSize'),
+    SizeDist.BINOMIAL_S: ('AvgPktSize', 'PktSize1', 'PktSize2'),
+    SizeDist.GENERIC_S: ('AvgPktSize', 'NumCandidates')}
+
+# Columns of the per src-dst pair and per flow performance arrays. AvgBw is
+# given in bits/time unit.
+PERF_COLUMNS = ('AvgBw', 'PktsGen', 'PktsDrop', 'AvgDelay', 'AvgLnDelay',
+                'p10', 'p20', 'p50', 'p80', 'p90', 'Jitter')
+
+_PERF_DICT_KEYS = PERF_COLUMNS[2:]
+
+def _parse_nested_line(body, n_entries):
+    """
+    Parses a line made of n_entries entries separated by ';', where each
+    entry is a list of flows separated by ':' and each flow is a list of
+    values separated by ','.
+
+    Parameters
+    ----------
+    body : str
+        Line to parse. Content after the n_entries-th entry is ignored.
+    n_entries : int
+        Number of entries to read.
+
+    Returns
+    -------
+    values : numpy array
+        All the values of the line.
+    value_offsets : numpy array
+        The values of flow k are values[value_offsets[k]:value_offsets[k+1]].
+    flow_offsets : numpy array
+        The flows of entry e are flows flow_offsets[e] to flow_offsets[e+1]-1.
+
+    """
+    
+    b = numpy.frombuffer(body.encode(), dtype=numpy.uint8)
+    entry_ends = numpy.flatnonzero(b == ord(';'))
+    if (len(entry_ends) >= n_entries):
+        b = b[:entry_ends[n_entries-1]]
+        body = body[:entry_ends[n_entries-1]]
+        entry_ends = entry_ends[:n_entries-1]
+    colons = numpy.flatnonzero(b == ord(':'))
+    commas = numpy.flatnonzero(b == ord(','))
+    if (len(entry_ends) != n_entries-1):
+        raise ValueError("Expected %d entries, found %d" % (n_entries, len(entry_ends)+1))
+    
+    # Flows end at a colon or a semicolon, and have one value more than commas
+    flow_ends = numpy.concatenate((numpy.sort(numpy.concatenate((colons, entry_ends))), [len(b)]))
+    value_offsets = numpy.zeros(len(flow_ends)+1, dtype=numpy.int64)
+    value_offsets[1:] = numpy.searchsorted(commas, flow_ends) + numpy.arange(1, len(flow_ends)+1)
+    # Entries have one flow more than colons
+    entry_ends = numpy.concatenate((entry_ends, [len(b)]))
+    flow_offsets = numpy.zeros(n_entries+1, dtype=numpy.int64)
+    flow_offsets[1:] = numpy.searchsorted(colons, entry_ends) + numpy.arange(1, n_entries+1)
+    
+    values = numpy.fromstring(body.replace(';', ',').replace(':', ','), sep=',')
+    if (len(values) != value_offsets[-1]):
+        raise ValueError("Could not parse all the values of the line")
+    return (values, value_offsets, flow_offsets)
+
+# Sections of a sample that can be parsed into arrays, and the key of the
+# arrays dictionary set when each one is parsed
+ARRAY_FIELDS = ('performance', 'flow_performance', 'traffic')
+
+_ARRAY_FIELD_KEYS = {'performance': 'agg', 'flow_performance': 'flows', 'traffic': 'traffic'}
+
+# Sections of a sample that can be selected with the fields option of
+# DatanetAPI
+SAMPLE_FIELDS = ARRAY_FIELDS + ('routing', 'topology')
+
+def _parse_sample_header(rline, tline, sline):
+    """
+    Parses the values of a sample that do not depend on the src-dst pair,
+    without tokenizing the rest of the lines.
+
+    Returns
+    -------
+    Dictionary with the following keys:
+        'global' : (global_packets, global_losses, global_delay)
+        'maxAvgLambda' : float
+        'sim_time' : float
+        'net_size' : int
+
+    """
+    
+    ptr = rline.find('|')
+    first_params = list(map(float, rline[:ptr].split(',')))
+    return {'global': tuple(first_params[:3]),
+            'maxAvgLambda': float(tline[:tline.find('|')]),
+            'sim_time': float(sline.split(';')[0]),
+            'net_size': int(math.sqrt(rline.count(';', ptr)+1))}
+
+def _parse_sample_section(field, rline, tline, fline, arrays):
+    """
+    Parses a section of a sample into contiguous numpy arrays.
+
+    Parameters
+    ----------
+    field : str
+        Section to parse, one of ARRAY_FIELDS.
+    rline : str
+        Line read in the results file.
+    tline : str
+        Line read in the traffic file.
+    fline : str
+        Line read in the flows file, or None.
+    arrays : dictionary
+        Arrays of the sample parsed so far, including the header.
+
+    Returns
+    -------
+    Dictionary with the following keys:
+        'agg' : NxNx11 array with the PERF_COLUMNS of every src-dst pair.
+            Set when field is 'performance'.
+        'flows' : Fx11 array with the PERF_COLUMNS of every flow. Set when
+            field is 'flow_performance'.
+        'flow_offsets' : array of N*N+1 elements. Flows of the pair src-dst
+            are rows flow_offsets[src*N+dst] to flow_offsets[src*N+dst+1]-1
+            of 'flows'. Set when field is 'flow_performance'.
+        'traffic' : array with the values of every flow in the traffic file.
+            Set when field is 'traffic'.
+        'traffic_offsets' : the values of flow k are
+            traffic[traffic_offsets[k]:traffic_offsets[k+1]]. Set when field
+            is 'traffic'.
+        'traffic_flow_offsets' : same as flow_offsets, for the flows of the
+            traffic file. Set when field is 'traffic'.
+
+    """
+    
+    net_size = arrays['net_size']
+    n_pairs = net_size*net_size
+    if (field == 'performance'):
+        values, _, _ = _parse_nested_line(rline[rline.find('|')+1:], n_pairs)
+        if (len(values) != n_pairs*len(PERF_COLUMNS)):
+            raise ValueError("Unexpected number of values in results line")
+        agg = values.reshape((net_size, net_size, len(PERF_COLUMNS)))
+        # From kbps to bps
+        agg[:,:,0] *= 1000
+        return {'agg': agg}
+    elif (field == 'flow_performance'):
+        if (fline):
+            values, value_offsets, flow_offsets = _parse_nested_line(fline, n_pairs)
+            if (numpy.any(numpy.diff(value_offsets) != len(PERF_COLUMNS))):
+                raise ValueError("Unexpected number of values in flow results line")
+            flows = values.reshape((-1, len(PERF_COLUMNS)))
+            flows[:,0] *= 1000
+            return {'flows': flows, 'flow_offsets': flow_offsets}
+        # Without flows file, every src-dst pair is considered a single flow
+        agg = arrays['agg'] if 'agg' in arrays else _parse_sample_section('performance', rline, tline, fline, arrays)['agg']
+        return {'flows': agg.reshape((n_pairs, len(PERF_COLUMNS))),
+                'flow_offsets': numpy.arange(n_pairs+1, dtype=numpy.int64)}
+    elif (field == 'traffic'):
+        traffic, traffic_offsets, traffic_flow_offsets = _parse_nested_line(tline[tline.find('|')+1:], n_pairs)
+        return {'traffic': traffic,
+                'traffic_offsets': traffic_offsets,
+                'traffic_flow_offsets': traffic_flow_offsets}
+    raise ValueError("Unknown field: %s" % field)
+
+def _parse_sample_arrays(rline, tline, fline, sline, fields=ARRAY_FIELDS):
+    """
+    Parses the lines of a sample into contiguous numpy arrays.
+
+    Parameters
+    ----------
+    rline : str
+        Line read in the results file.
+    tline : str
+        Line read in the traffic file.
+    fline : str
+        Line read in the flows file, or None.
+    sline : str
+        Line read in the stability file.
+    fields : list
+        Sections of the sample to parse (see ARRAY_FIELDS).
+
+    Returns
+    -------
+    Dictionary with the keys returned by _parse_sample_header and by
+    _parse_sample_section for each one of the fields.
+
+    """
+    
+    arrays = _parse_sample_header(rline, tline, sline)
+    for field in fields:
+        if (_ARRAY_FIELD_KEYS[field] not in arrays):
+            arrays.update(_parse_sample_section(field, rline, tline, fline, arrays))
+    return arrays
+
+def _flow_traffic_dict(data, perf, sim_time):
+    """
+    Returns the traffic_matrix dictionary of a flow from the values of the
+    flow in the traffic file (data) and its row of the performance array
+    (perf), or an empty dictionary if the time distribution is unknown.
+    """
+    
+    dict_traffic = {}
+    if (data[0] not in TIME_DIST_PARAMS):
+        return dict_traffic
+    time_dist = TimeDist(int(data[0]))
+    names = TIME_DIST_PARAMS[time_dist]
+    dict_traffic['TimeDist'] = time_dist
+    dict_traffic['TimeDistParams'] = dict(zip(names, data[1:len(names)+1]))
+    offset = len(names)+1
+    if (data[offset] in SIZE_DIST_PARAMS):
+        size_dist = SizeDist(int(data[offset]))
+        names = SIZE_DIST_PARAMS[size_dist]
+        dict_traffic['SizeDist'] = size_dist
+        params = dict(zip(names, data[offset+1:offset+len(names)+1]))
+        if (size_dist == SizeDist.GENERIC_S):
+            for i in range(int(params['NumCandidates'])):
+                params["Size_%d" % i] = data[offset+3+2*i]
+                params["Prob_%d" % i] = data[offset+4+2*i]
+        dict_traffic['SizeDistParams'] = params
+    dict_traffic['AvgBw'] = perf[0]
+    dict_traffic['PktsGen'] = perf[1]
+    dict_traffic['TotalPktsGen'] = sim_time * perf[1]
+    dict_traffic['ToS'] = data[-1]
+    return dict_traffic
+
+# Columns of Sample.flows_table with the parameters of the time and size
+# distributions: all the parameter names of TIME_DIST_PARAMS and
+# SIZE_DIST_PARAMS, in order of appearance
+FLOW_TIME_PARAMS = tuple(collections.OrderedDict.fromkeys(name for names in TIME_DIST_PARAMS.values() for name in names))
+
+FLOW_SIZE_PARAMS = tuple(collections.OrderedDict.fromkeys(name for names in SIZE_DIST_PARAMS.values() for name in names))
+
+def _flows_table(arrays, max_candidates=None):
+    """
+    Builds the table returned by Sample.flows_table from the arrays of a
+    sample with the 'flow_performance' and 'traffic' sections. Parameters
+    are gathered from the traffic array for all the flows with the same
+    distribution at once, looking up their positions in TIME_DIST_PARAMS and
+    SIZE_DIST_PARAMS.
+    """
+    
+    net_size = arrays['net_size']
+    traffic = arrays['traffic']
+    starts = arrays['traffic_offsets'][:-1]
+    ends = arrays['traffic_offsets'][1:]
+    pair_offsets = arrays['traffic_flow_offsets']
+    perf = arrays['flows']
+    n_flows = len(starts)
+    if (len(perf) != n_flows):
+        raise ValueError("Different number of flows in the traffic and flow results files")
+    
+    # Identifier of the distributions, -1 if unknown
+    time_dist = numpy.full(n_flows, -1, dtype=numpy.int64)
+    size_dist = numpy.full(n_flows, -1, dtype=numpy.int64)
+    codes = traffic[starts]
+    params = {name: numpy.full(n_flows, numpy.nan) for name in FLOW_TIME_PARAMS + FLOW_SIZE_PARAMS}
+    size_starts = numpy.zeros(n_flows, dtype=numpy.int64)
+    for dist, names in TIME_DIST_PARAMS.items():
+        rows = numpy.flatnonzero(codes == dist)
+        time_dist[rows] = dist
+        for i, name in enumerate(names):
+            params[name][rows] = traffic[starts[rows]+1+i]
+        size_starts[rows] = starts[rows]+1+len(names)
+    known = numpy.flatnonzero(time_dist >= 0)
+    size_codes = numpy.full(n_flows, -1.0)
+    size_codes[known] = traffic[size_starts[known]]
+    for dist, names in SIZE_DIST_PARAMS.items():
+        rows = numpy.flatnonzero(size_codes == dist)
+        size_dist[rows] = dist
+        for i, name in enumerate(names):
+            params[name][rows] = traffic[size_starts[rows]+1+i]
+    
+    # Candidate sizes and probabilities of GENERIC_S, padded with NaN
+    generic = numpy.flatnonzero(size_dist == SizeDist.GENERIC_S)
+    candidates = params['NumCandidates'][generic].astype(numpy.int64)
+    if (max_candidates is None):
+        max_candidates = int(candidates.max()) if len(candidates) > 0 else 0
+    sizes = numpy.full((n_flows, max_candidates), numpy.nan)
+    probs = numpy.full((n_flows, max_candidates), numpy.nan)
+    for i in range(max_candidates):
+        rows = generic[candidates > i]
+        sizes[rows, i] = traffic[size_starts[rows]+3+2*i]
+        probs[rows, i] = traffic[size_starts[rows]+4+2*i]
+    
+    dtype = ([('src', numpy.int32), ('dst', numpy.int32), ('flow', numpy.int32), ('ToS', numpy.int32),
+              ('TimeDist', numpy.int8), ('SizeDist', numpy.int8)] +
+             [(name, numpy.float64) for name in FLOW_TIME_PARAMS + FLOW_SIZE_PARAMS] +
+             [('Sizes', numpy.float64, (max_candidates,)), ('Probs', numpy.float64, (max_candidates,)),
+              ('AvgBw', numpy.float64), ('PktsGen', numpy.float64), ('TotalPktsGen', numpy.float64)] +
+             [(name, numpy.float64) for name in PERF_COLUMNS[2:]])
+    # Flows with an unknown time distribution (e.g., those of the pairs
+    # with src equal to dst) are skipped, as in traffic_matrix
+    pairs = numpy.repeat(numpy.arange(net_size*net_size), numpy.diff(pair_offsets))[known]
+    pair_offsets = numpy.zeros(net_size*net_size+1, dtype=numpy.int64)
+    pair_offsets[1:] = numpy.cumsum(numpy.bincount(pairs, minlength=net_size*net_size))
+    table = numpy.empty(len(known), dtype=dtype)
+    table['src'] = pairs // net_size
+    table['dst'] = pairs % net_size
+    table['flow'] = numpy.arange(len(known)) - pair_offsets[pairs]
+    table['ToS'] = traffic[ends[known]-1]
+    table['TimeDist'] = time_dist[known]
+    table['SizeDist'] = size_dist[known]
+    for name in FLOW_TIME_PARAMS + FLOW_SIZE_PARAMS:
+        table[name] = params[name][known]
+    table['Sizes'] = sizes[known]
+    table['Probs'] = probs[known]
+    for i, name in enumerate(PERF_COLUMNS):
+        table[name] = perf[known,i]
+    table['TotalPktsGen'] = arrays['sim_time'] * perf[known,1]
+    return table
+
+class _BaseSample:
+    """
+    Methods of the Sample and CompactSample classes (see Sample). It has no
+    instance attributes, so that CompactSample can store them in slots,
+    while Sample keeps its class attributes and an instance dictionary.
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def performance_matrix(self):
+        if (self._performance_matrix is None and (self._results_line is not None or self._arrays is not None)):
+            self._performance_matrix = self._performance_matrix_from_arrays()
+        return self._performance_matrix
+    
+    @performance_matrix.setter
+    def performance_matrix(self, m):
+        self._performance_matrix = m
+    
+    @property
+    def topology_object(self):
+        self._check_field('topology')
+        if (self._topology_object is None and self._topology is not None):
+            return self._topology.to_networkx()
+        return self._topology_object
+    
+    @topology_object.setter
+    def topology_object(self, G):
+        self._topology_object = G
+    
+    @property
+    def routing_matrix(self):
+        self._check_field('routing')
+        if (self._routing_matrix is None and self.routing_paths is not None):
+            return self.routing_paths.get_matrix()
+        return self._routing_matrix
+    
+    @routing_matrix.setter
+    def routing_matrix(self, m):
+        self._routing_matrix = m
+    
+    @property
+    def traffic_matrix(self):
+        if (self._traffic_matrix is None and (self._results_line is not None or self._arrays is not None)):
+            self._traffic_matrix = self._traffic_matrix_from_arrays()
+        return self._traffic_matrix
+    
+    @traffic_matrix.setter
+    def traffic_matrix(self, m):
+        self._traffic_matrix = m
+    
+    def get_global_packets(self):
+        """
+        Return the number of packets transmitted in the network per time unit of this Sample instance.
+        """
+        
+        return self.global_packets
+
+    def get_global_losses(self):
+        """
+        Return the number of packets dropped in the network per time unit of this Sample instance.
+        """
+        
+        return self.global_losses
+    
+    def get_global_delay(self):
+        """
+        Return the average per-packet delay over all the packets transmitted in the network in time units 
+        of this sample instance.
+        """
+        
+        return self.global_delay
+    
+    def get_maxAvgLambda(self):
+        """
+        Returns the maxAvgLamda used in the current iteration. This variable is used in our simulator to define 
+        the overall traffic intensity of the network scenario.
+        """
+        
+        return self.maxAvgLambda
+        
+    def get_performance_matrix(self):
+        """
+        Returns the performance_matrix of this Sample instance.
+        """
+        
+        return self.performance_matrix
+    
+    def get_srcdst_performance(self, src, dst):
+        """
+        
+
+        Parameters
+        ----------
+        src : int
+            Source node.
+        dst : int
+            Destination node.
+
+        Returns
+        -------
+        Dictionary
+            Information stored in the Result matrix for the requested src-dst.
+
+        """
+        return self.performance_matrix[src, dst]
+        
+    def get_traffic_matrix(self):
+        """
+        Returns the traffic_matrix of this Sample instance.
+        """
+        
+        return self.traffic_matrix
+    
+    def get_srcdst_traffic(self, src, dst):
+        """
+        
+
+        Parameters
+        ----------
+        src : int
+            Source node.
+        dst : int
+            Destination node.
+
+        Returns
+        -------
+        Dictionary
+            Information stored in the Traffic matrix for the requested src-dst.
+
+        """
+        
+        return self.traffic_matrix[src, dst]
+        
+    def get_performance_array(self):
+        """
+        Returns a NxNx11 array with the aggregate performance measurements of
+        every src-dst pair. The last dimension follows PERF_COLUMNS.
+        """
+        
+        return self._get_arrays('performance')['agg']
+    
+    def get_delay_matrix(self):
+        """
+        Returns a NxN array with the average per-packet delay of every src-dst
+        pair.
+        """
+        
+        return self._get_arrays('performance')['agg'][:,:,3]
+    
+    def get_jitter_matrix(self):
+        """
+        Returns a NxN array with the jitter of every src-dst pair.
+        """
+        
+        return self._get_arrays('performance')['agg'][:,:,10]
+    
+    def get_drops_matrix(self):
+        """
+        Returns a NxN array with the packets dropped per time unit of every
+        src-dst pair.
+        """
+        
+        return self._get_arrays('performance')['agg'][:,:,2]
+    
+    def get_percentiles_matrix(self):
+        """
+        Returns a NxNx5 array with the percentiles 10, 20, 50, 80 and 90 of the
+        per-packet delay of every src-dst pair.
+        """
+        
+        return self._get_arrays('performance')['agg'][:,:,5:10]
+    
+    def get_avgbw_matrix(self):
+        """
+        Returns a NxN array with the average bandwidth (bits/time unit) of
+        every src-dst pair.
+        """
+        
+        return self._get_arrays('performance')['agg'][:,:,0]
+    
+    def get_pktsgen_matrix(self):
+        """
+        Returns a NxN array with the packets generated per time unit of every
+        src-dst pair.
+        """
+        
+        return self._get_arrays('performance')['agg'][:,:,1]
+    
+    def get_flow_performance_array(self):
+        """
+        Returns a Fx11 array with the performance measurements of every flow,
+        where F is the overall number of flows. The columns follow
+        PERF_COLUMNS and the flows of each src-dst pair are given by
+        get_flow_offsets.
+        """
+        
+        return self._get_arrays('flow_performance')['flows']
+    
+    def get_flow_offsets(self):
+        """
+        Returns an array of N*N+1 elements. The flows of the src-dst pair are
+        the rows flow_offsets[src*N+dst] to flow_offsets[src*N+dst+1]-1 of
+        the array returned by get_flow_performance_array.
+        """
+        
+        return self._get_arrays('flow_performance')['flow_offsets']
+    
+    def get_routing_matrix(self):
+        """
+        Returns the routing_matrix of this Sample instance.
+        """
+        
+        return self.routing_matrix
+    
+    def get_routing_paths(self):
+        """
+        Returns the RoutingPaths instance with the paths of all the src-dst
+        pairs of this Sample instance, or None if only its routing_matrix was
+        set.
+        """
+        
+        self._check_field('routing')
+        return self.routing_paths
+    
+    def get_srcdst_routing(self, src, dst):
+        """
+        
+
+        Parameters
+        ----------
+        src : int
+            Source node.
+        dst : int
+            Destination node.
+
+        Returns
+        -------
+        Dictionary
+            Information stored in the Routing matrix for the requested src-dst.
+
+        """
+        self._check_field('routing')
+        if (self._routing_matrix is None and self.routing_paths is not None):
+            return self.routing_paths.get_path(src, dst).tolist()
+        return self.routing_matrix[src, dst]
+        
+    def get_topology_object(self):
+        """
+        Returns the topology in networkx format of this Sample instance.
+        """
+        
+        return self.topology_object
+    
+    def get_topology(self):
+        """
+        Returns the Topology instance with the nodes and links of this Sample
+        instance in arrays, or None if only its topology_object was set.
+        """
+        
+        self._check_field('topology')
+        return self._topology
+    
+    def get_network_size(self):
+        """
+        Returns the number of nodes of the topology. If the topology was not
+        read (see the fields option of DatanetAPI), it is the number of
+        nodes of the results of the sample.
+        """
+        if (self._topology is not None):
+            return self._topology.net_size
+        if (self._topology_object is None and not self._has_field('topology')):
+            return self._get_arrays()['net_size']
+        return self.topology_object.number_of_nodes()
+    
+    def get_node_properties(self, id):
+        """
+        
+
+        Parameters
+        ----------
+        id : int
+            Node identifier.
+
+        Returns
+        -------
+        Dictionary with the parameters of the node
+        None if node doesn't exist
+        The dictionary is a copy when the topology is kept in arrays (the
+        default), so changing it does not change the topology. It is the
+        node dictionary of the networkx graph only if topology_object was
+        set directly.
+
+        """
+        self._check_field('topology')
+        if (self._topology is not None):
+            return self._topology.get_node_properties(id)
+        res = None
+        
+        if id in self.topology_object.nodes:
+            res = self.topology_object.nodes[id] 
+        
+        return res
+    
+    def get_link_properties(self, src, dst):
+        """
+        
+
+        Parameters
+        ----------
+        src : int
+            Source node.
+        dst : int
+            Destination node.
+
+        Returns
+        -------
+        Dictionary with the parameters of the link
+        None if no link exist between src and dst
+        The dictionary is a copy when the topology is kept in arrays (the
+        default), so changing it does not change the topology. It is the
+        link dictionary of the networkx graph only if topology_object was
+        set directly.
+
+        """
+        self._check_field('topology')
+        if (self._topology is not None):
+            return self._topology.get_link_properties(src, dst)
+        res = None
+        
+        if dst in self.topology_object[src]:
+            res = self.topology_object[src][dst][0] 
+        
+        return res
+    
+    def get_srcdst_link_bandwidth(self, src, dst):
+        """
+        
+
+        Parameters
+        ----------
+        src : int
+            Source node.
+        dst : int
+            Destination node.
+
+        Returns
+        -------
+        Bandwidth in bits/time unit of the link between nodes src-dst or -1 if not connected
+
+        """
+        self._check_field('topology')
+        if (self._topology is not None):
+            link = self._topology.get_link_properties(src, dst)
+            return -1 if link is None else float(link['bandwidth'])
+        if dst in self.topology_object[src]:
+            cap = float(self.topology_object[src][dst][0]['bandwidth'])
+        else:
+            cap = -1
+            
+        return cap
+        
+        
+    def flows_table(self, max_candidates=None):
+        """
+        Returns a structured numpy array with a row per flow of the sample,
+        in src-dst order, with the following columns:
+            'src', 'dst', 'flow' : src-dst pair and index of the flow in the
+                'Flows' list of the pair.
+            'ToS' : type of service of the flow.
+            'TimeDist', 'SizeDist' : value of the TimeDist and SizeDist of
+                the flow (-1 if the size distribution is unknown).
+            FLOW_TIME_PARAMS, FLOW_SIZE_PARAMS : a column for every parameter
+                of the distributions (e.g., 'EqLambda', 'AvgPktSize'), NaN
+                if not used by the distributions of the flow.
+            'Sizes', 'Probs' : arrays with the candidate sizes and their
+                probabilities of GENERIC_S distributions, padded with NaN.
+            'AvgBw', 'PktsGen', 'TotalPktsGen' : traffic generated by the
+                flow.
+            'PktsDrop', 'AvgDelay', 'AvgLnDelay', 'p10', 'p20', 'p50', 'p80',
+                'p90', 'Jitter' : performance measurements of the flow.
+        As in traffic_matrix, flows with an unknown time distribution are
+        skipped. The table is built directly from the arrays of the sample,
+        and needs the 'flow_performance' and 'traffic' fields.
+
+        Parameters
+        ----------
+        max_candidates : int
+            Length of the 'Sizes' and 'Probs' columns. By default, the
+            largest number of candidates of the GENERIC_S flows of the sample,
+            so use it to get tables with the same columns for all samples.
+
+        """
+        
+        return _flows_table(self._get_arrays('flow_performance', 'traffic'), max_candidates)
+    
+    def _has_field(self, field):
+        """
+        Returns True if the section field of the sample was read from the
+        dataset.
+        """
+        
+        return self._fields is None or field in self._fields
+    
+    def _check_field(self, field):
+        """
+        Raises ValueError if the section field of the sample was not read
+        from the dataset.
+        """
+        
+        if (not self._has_field(field)):
+            raise ValueError("Field '%s' was not read from the dataset" % field)
+    
+    def _get_arrays(self, *fields):
+        """
+        Returns the dictionary of arrays of this Sample instance, parsing the
+        requested sections of the sample (see ARRAY_FIELDS) if they were not
+        parsed yet.
+        """
+        
+        if (self._arrays is None):
+            self._arrays = _parse_sample_header(self._results_line, self._traffic_line, self._status_line)
+        for field in fields:
+            if (_ARRAY_FIELD_KEYS[field] not in self._arrays):
+                self._check_field(field)
+                self._arrays.update(_parse_sample_section(field, self._results_line, self._traffic_line,
+                                                          self._flowresults_line, self._arrays))
+        return self._arrays
+    
+    def _performance_matrix_from_arrays(self):
+        """
+        Builds the performance_matrix of this Sample instance from its arrays.
+        If the flow results were not read, the flows of every src-dst pair
+        are a single flow with the aggregate measurements of the pair, as
+        for datasets without flowSimulationResults files.
+        """
+        
+        if (self._has_field('flow_performance')):
+            arrays = self._get_arrays('performance', 'flow_performance')
+        else:
+            arrays = self._get_arrays('performance')
+        net_size = arrays['agg'].shape[0]
+        agg = arrays['agg'].reshape((net_size*net_size, -1))[:,2:].tolist()
+        if ('flows' in arrays):
+            flows = arrays['flows'][:,2:].tolist()
+            flow_offsets = arrays['flow_offsets'].tolist()
+        else:
+            flows = agg
+            flow_offsets = list(range(net_size*net_size+1))
+        m_result = []
+        for i in range(net_size):
+            new_result_row = []
+            for j in range(i*net_size, (i+1)*net_size):
+                lst_result_flows = [dict(zip(_PERF_DICT_KEYS, flow)) for flow in flows[flow_offsets[j]:flow_offsets[j+1]]]
+                new_result_row.append({'AggInfo': dict(zip(_PERF_DICT_KEYS, agg[j])),
+                                       'Flows': lst_result_flows})
+            m_result.append(new_result_row)
+        return numpy.asmatrix(m_result)
+    
+    def _traffic_matrix_from_arrays(self):
+        """
+        Builds the traffic_matrix of this Sample instance from its arrays.
+        """
+        
+        arrays = self._get_arrays('performance', 'flow_performance', 'traffic')
+        sim_time = arrays['sim_time']
+        net_size = arrays['agg'].shape[0]
+        agg = arrays['agg'].reshape((net_size*net_size, -1))[:,:2].tolist()
+        flows = arrays['flows'][:,:2].tolist()
+        traffic = arrays['traffic'].tolist()
+        traffic_offsets = arrays['traffic_offsets'].tolist()
+        traffic_flow_offsets = arrays['traffic_flow_offsets'].tolist()
+        m_traffic = []
+        for i in range(net_size):
+            new_traffic_row = []
+            for j in range(i*net_size, (i+1)*net_size):
+                lst_traffic_flows = []
+                for k in range(traffic_flow_offsets[j], traffic_flow_offsets[j+1]):
+                    dict_traffic = _flow_traffic_dict(traffic[traffic_offsets[k]:traffic_offsets[k+1]], flows[k], sim_time)
+                    if (len(dict_traffic.keys())!=0):
+                        lst_traffic_flows.append(dict_traffic)
+                dict_traffic_agg = {'AvgBw':agg[j][0],
+                                    'PktsGen':agg[j][1],
+                                    'TotalPktsGen':agg[j][1]*sim_time}
+                new_traffic_row.append({'AggInfo': dict_traffic_agg,
+                                        'Flows': lst_traffic_flows})
+            m_traffic.append(new_traffic_row)
+        return numpy.asmatrix(m_traffic)
+    
+    def _set_data_set_file_name(self,file):
+        """
+        Sets the data set file from where the sample is extracted.
+        """
+        self.data_set_file = file
+        
+    def _set_performance_matrix(self, m):
+        """
+        Sets the performance_matrix of this Sample instance.
+        """
+        
+        self.performance_matrix = m
+        
+    def _set_traffic_matrix(self, m):
+        """
+        Sets the traffic_matrix of this Sample instance.
+        """
+        
+        self.traffic_matrix = m
+        
+    def _set_routing_matrix(self, m):
+        """
+        Sets the traffic_matrix of this Sample instance.
+        """
+        
+        self.routing_matrix = m
+        
+    def _set_routing_paths(self, paths):
+        """
+        Sets the routing_paths of this Sample instance.
+        """
+        
+        self.routing_paths = paths
+        
+    def _set_topology_object(self, G):
+        """
+        Sets the topology_object of this Sample instance.
+        """
+        
+        self.topology_object = G
+        
+    def _set_topology(self, t):
+        """
+        Sets the Topology instance of this Sample instance.
+        """
+        
+        self._topology = t
+        
+    def _set_global_packets(self, x):
+        """
+        Sets the global_packets of this Sample instance.
+        """
+        
+        self.global_packets = x
+        
+    def _set_global_losses(self, x):
+        """
+        Sets the global_losses of this Sample instance.
+        """
+        
+        self.global_losses = x
+        
+    def _set_global_delay(self, x):
+        """
+        Sets the global_delay of this Sample instance.
+        """
+        
+        self.global_delay = x
+        
+    def _get_data_set_file_name(self):
+        """
+        Gets the data set file from where the sample is extracted.
+        """
+        return self.data_set_file
+    
+    def _get_path_for_srcdst(self, src, dst):
+        """
+        Returns the path between node src and node dst.
+        """
+        
+        return self.routing_matrix[src, dst]
+    
+    def _get_timedis_for_srcdst (self, src, dst):
+        """
+        Returns the time distribution of traffic between node src and node dst.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)['TimeDist']
+    
+    def _get_eqlambda_for_srcdst (self, src, dst):
+        """
+        Returns the equivalent lambda for the traffic between node src and node
+        dst.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)['EqLambda']
+    
+    def _get_timedistparams_for_srcdst (self, src, dst):
+        """
+        Returns the time distribution parameters for the traffic between node
+        src and node dst.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)['TimeDistParams']
+    
+    def _get_sizedist_for_srcdst (self, src, dst):
+        """
+        Returns the size distribution of traffic between node src and node dst.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)['SizeDist']
+    
+    def _get_avgpktsize_for_srcdst_flow (self, src, dst):
+        """
+        Returns the average packet size for the traffic between node src and
+        node dst.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)['AvgPktSize']
+    
+    def _get_sizedistparams_for_srcdst (self, src, dst):
+        """
+        Returns the time distribution of traffic between node src and node dst.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)['SizeDistParams']
+    
+    def _get_resultdict_for_srcdst (self, src, dst):
+        """
+        Returns the dictionary with all the information for the communication
+        between node src and node dst regarding communication parameters.
+        """
+        
+        return self.get_srcdst_performance(src, dst)
+    
+    def _get_trafficdict_for_srcdst (self, src, dst):
+        """
+        Returns the dictionary with all the information for the communication
+        between node src and node dst regarding size and time distribution
+        parameters.
+        """
+        
+        return self.get_srcdst_traffic(src, dst)
+
+class Sample(_BaseSample):
+    """
+    Class used to contain the results of a single iteration in the dataset
+    reading process.
+    
+    ...
+    
+    Attributes
+    ----------
+    global_packets : double
+        Overall number of packets transmitteds in network
+    global_losses : double
+        Overall number of packets lost in network
+    global_delay : double
+        Overall delay in network
+    maxAvgLambda: double
+        This variable is used in our simulator to define the overall traffic 
+        intensity  of the network scenario
+    performance_matrix : NxN matrix
+        Matrix where each cell [i,j] contains aggregated and flow-level
+        information about transmission parameters between source i and
+        destination j.
+    traffic_matrix : NxN matrix
+        Matrix where each cell [i,j] contains aggregated and flow-level
+        information about size and time distributions between source i and
+        destination j.
+    routing_matrix : NxN matrix
+        Matrix where each cell [i,j] contains the path, if it exists, between
+        source i and destination j.
+    routing_paths : RoutingPaths
+        Paths between all the src-dst pairs in compressed form. The
+        routing_matrix is a view of these paths built when accessed.
+    topology_object : 
+        Network topology using networkx format.
+    """
+    
+    global_packets = None
+    global_losses = None
+    global_delay = None
+    maxAvgLambda = None
+    
+    routing_paths = None
+    
+    _topology_object = None
+    # Topology instance, whose networkx graph is only built when the
+    # topology_object is requested
+    _topology = None
+    
+    _results_line = None
+    _traffic_line = None
+    _input_files_line = None
+    _status_line = None
+    _flowresults_line = None
+    _routing_file = None
+    _graph_file = None
+    # Line of the data file where the sample was read (0 for the first one)
+    _line = None
+    
+    _performance_matrix = None
+    _traffic_matrix = None
+    _routing_matrix = None
+    # Dictionary returned by _parse_sample_arrays, filled as sections of the
+    # sample are parsed
+    _arrays = None
+    # Sections of the sample read from the dataset (see SAMPLE_FIELDS), or
+    # None if all of them were read
+    _fields = None
+
+def _read_only(value):
+    """
+    Returns a read-only copy of value, where dictionaries are replaced by
+    read-only views (types.MappingProxyType) and lists by tuples.
+    """
+    
+    if (isinstance(value, dict)):
+        return types.MappingProxyType({k: _read_only(v) for k, v in value.items()})
+    if (isinstance(value, list)):
+        return tuple(_read_only(v) for v in value)
+    return value
+
+class CompactSample(_BaseSample):
+    """
+    Sample with a small memory footprint, produced by DatanetAPI with the
+    compact option. It has the methods of Sample, but it is not a subclass
+    of it.
+    
+    Attributes are stored in slots, without an instance dictionary, so new
+    attributes can not be added to its instances. The lines read from the
+    dataset are released once the sample is parsed (except in lazy mode,
+    where they are needed to parse the sample on demand). Measurements are
+    only kept in the arrays of the sample: the performance_matrix and
+    traffic_matrix are built from them every time they are accessed,
+    without keeping them, and get_srcdst_performance and get_srcdst_traffic
+    only build the dictionaries of the requested src-dst pair, returned as
+    read-only views (dictionaries are types.MappingProxyType instances and
+    lists are tuples).
+    """
+    
+    __slots__ = ('global_packets', 'global_losses', 'global_delay', 'maxAvgLambda', 'routing_paths',
+                 'data_set_file', '_topology_object', '_topology', '_results_line', '_traffic_line',
+                 '_input_files_line', '_status_line', '_flowresults_line', '_routing_file', '_graph_file',
+                 '_line', '_performance_matrix', '_traffic_matrix', '_routing_matrix', '_arrays', '_fields')
+    
+    def __init__(self):
+        for name in CompactSample.__slots__:
+            setattr(self, name, None)
+    
+    @property
+    def performance_matrix(self):
+        if (self._performance_matrix is None and (self._results_line is not None or self._arrays is not None)):
+            return self._performance_matrix_from_arrays()
+        return self._performance_matrix
+    
+    @performance_matrix.setter
+    def performance_matrix(self, m):
+        self._performance_matrix = m
+    
+    @property
+    def traffic_matrix(self):
+        if (self._traffic_matrix is None and (self._results_line is not None or self._arrays is not None)):
+            return self._traffic_matrix_from_arrays()
+        return self._traffic_matrix
+    
+    @traffic_matrix.setter
+    def traffic_matrix(self, m):
+        self._traffic_matrix = m
+    
+    def get_srcdst_performance(self, src, dst):
+        """
+        Returns a read-only view of the dictionary of the performance_matrix
+        for the requested src-dst, built from the arrays of the sample.
+        """
+        
+        if (self._performance_matrix is not None):
+            return self._performance_matrix[src, dst]
+        arrays = self._get_arrays('performance', 'flow_performance')
+        pair = src * arrays['agg'].shape[0] + dst
+        flow_offsets = arrays['flow_offsets']
+        flows = arrays['flows'][flow_offsets[pair]:flow_offsets[pair+1], 2:].tolist()
+        return _read_only({'AggInfo': dict(zip(_PERF_DICT_KEYS, arrays['agg'][src, dst, 2:].tolist())),
+                           'Flows': [dict(zip(_PERF_DICT_KEYS, flow)) for flow in flows]})
+    
+    def get_srcdst_traffic(self, src, dst):
+        """
+        Returns a read-only view of the dictionary of the traffic_matrix for
+        the requested src-dst, built from the arrays of the sample.
+        """
+        
+        if (self._traffic_matrix is not None):
+            return self._traffic_matrix[src, dst]
+        arrays = self._get_arrays('performance', 'flow_performance', 'traffic')
+        sim_time = arrays['sim_time']
+        pair = src * arrays['agg'].shape[0] + dst
+        traffic = arrays['traffic']
+        traffic_offsets = arrays['traffic_offsets']
+        traffic_flow_offsets = arrays['traffic_flow_offsets']
+        lst_traffic_flows = []
+        for k in range(traffic_flow_offsets[pair], traffic_flow_offsets[pair+1]):
+            dict_traffic = _flow_traffic_dict(traffic[traffic_offsets[k]:traffic_offsets[k+1]].tolist(),
+                                              arrays['flows'][k, :2].tolist(), sim_time)
+            if (len(dict_traffic.keys())!=0):
+                lst_traffic_flows.append(dict_traffic)
+        agg = arrays['agg'][src, dst, :2].tolist()
+        return _read_only({'AggInfo': {'AvgBw': agg[0], 'PktsGen': agg[1], 'TotalPktsGen': agg[1]*sim_time},
+                           'Flows': lst_traffic_flows})
@@ -0,0 +1,314 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Statistics of the values of the dataset (see DatanetAPI.compute_statistics)
+# and instrumentation of the reader (see ReaderStats).
+
+import numpy, math, time
+
+class _StatsAccumulator:
+    """
+    Mergeable streaming statistics of a set of values: count, mean and
+    variance (Welford's algorithm, merging batches with Chan's formula),
+    minimum, maximum, and a sketch with the number of values in buckets of
+    exponentially growing width, so that quantiles and histograms are
+    estimated with a bounded relative error (DDSketch). Accumulators of
+    disjoint sets of values can be merged.
+    
+    ...
+    
+    Attributes
+    ----------
+    relative_accuracy : float
+        Maximum relative error of the quantiles.
+    count, mean, m2, min, max : float
+        Number of values, mean, sum of squared differences from the mean,
+        minimum and maximum.
+    buckets : dictionary
+        Number of values in every bucket, indexed by a signed bucket number:
+        bucket i > 0 holds the positive values in (gamma**(i-1), gamma**i],
+        bucket -i the negative values in [-gamma**i, -gamma**(i-1)), and
+        bucket 0 the zeros, where gamma depends on relative_accuracy. Bucket
+        numbers are shifted to keep the sign of the values.
+    """
+    
+    # Bucket numbers of the values are shifted by this offset, so that
+    # buckets of values smaller than 1 are positive numbers too
+    _bucket_offset = 1 << 20
+    
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = {}
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    
+    def update(self, values):
+        """
+        Adds the values in an array. NaN values are ignored.
+        """
+        
+        values = numpy.asarray(values, dtype=numpy.float64).ravel()
+        values = values[~numpy.isnan(values)]
+        if (len(values) == 0):
+            return
+        mean = values.mean()
+        self._merge_moments(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+        magnitudes = numpy.abs(values)
+        indexes = numpy.zeros(len(values), dtype=numpy.int64)
+        nonzero = magnitudes > 0
+        indexes[nonzero] = numpy.ceil(numpy.log(magnitudes[nonzero]) / math.log(self._gamma)) + self._bucket_offset
+        indexes *= numpy.sign(values).astype(numpy.int64)
+        for index, n in zip(*numpy.unique(indexes, return_counts=True)):
+            self.buckets[int(index)] = self.buckets.get(int(index), 0) + int(n)
+    
+    def merge(self, other):
+        """
+        Adds the values of another accumulator with the same
+        relative_accuracy.
+        """
+        
+        if (other.count == 0):
+            return
+        self._merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+    
+    def _merge_moments(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(minimum))
+        self.max = max(self.max, float(maximum))
+    
+    def _bucket_values(self):
+        """
+        Returns the sorted bucket numbers, the value representing each bucket
+        and the number of values in each bucket.
+        """
+        
+        indexes = numpy.array(sorted(self.buckets), dtype=numpy.int64)
+        counts = numpy.array([self.buckets[i] for i in indexes], dtype=numpy.float64)
+        exponents = numpy.abs(indexes) - self._bucket_offset
+        values = numpy.sign(indexes) * 2 * self._gamma ** exponents.astype(numpy.float64) / (self._gamma + 1)
+        return (indexes, values, counts)
+    
+    def quantile(self, q):
+        """
+        Returns an estimate of the quantile q (between 0 and 1) of the values.
+        """
+        
+        if (self.count == 0):
+            return math.nan
+        _, values, counts = self._bucket_values()
+        rank = q * (self.count - 1)
+        value = values[numpy.searchsorted(numpy.cumsum(counts), rank, side='right')]
+        return float(min(max(value, self.min), self.max))
+    
+    def histogram(self, bins=50):
+        """
+        Returns an estimate of the histogram of the values with bins bins of
+        the same width between the minimum and the maximum, as a (counts,
+        edges) tuple as numpy.histogram.
+        """
+        
+        if (self.count == 0):
+            return (numpy.zeros(bins, dtype=numpy.int64), numpy.linspace(0, 1, bins+1))
+        _, values, counts = self._bucket_values()
+        values = numpy.clip(values, self.min, self.max)
+        counts, edges = numpy.histogram(values, bins, (self.min, self.max), weights=counts)
+        return (counts.astype(numpy.int64), edges)
+    
+    def summary(self, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99), bins=50):
+        """
+        Returns a dictionary with the 'count', 'mean', 'std' (standard
+        deviation), 'min' and 'max' of the values, their 'quantiles' (a
+        dictionary indexed by the quantiles requested) and their 'histogram'
+        (a dictionary with the 'counts' and 'edges' of its bins).
+        """
+        
+        counts, edges = self.histogram(bins)
+        return {'count': self.count,
+                'mean': float(self.mean) if self.count > 0 else math.nan,
+                'std': math.sqrt(self.m2 / self.count) if self.count > 0 else math.nan,
+                'min': self.min if self.count > 0 else math.nan,
+                'max': self.max if self.count > 0 else math.nan,
+                'quantiles': {q: self.quantile(q) for q in quantiles},
+                'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()}}
+
+# Version of the statistics computed by DatanetAPI.compute_statistics. Cached
+# statistics of a different version are computed again.
+STATS_VERSION = 1
+
+# Values of the samples aggregated in the 'global' level of the statistics
+STATS_GLOBAL_VALUES = ('global_packets', 'global_losses', 'global_delay', 'maxAvgLambda')
+
+def _ignore_reader_event(event, stats):
+    """
+    Callback of the copies of ReaderStats sent to other processes.
+    """
+    
+    pass
+
+# Stages of the reading process timed by ReaderStats:
+#     'open' : opening the data files (in streaming mode, this includes
+#         decompressing the whole file).
+#     'decompress' : reading decompressed data from the data files (part of
+#         'open' in streaming mode, and of 'readline' otherwise).
+#     'readline' : reading the lines of the samples.
+#     'check' : stability check, intensity range and filters of the samples
+#         before parsing them (see FILTER_STAGES).
+#     'parse' : parsing the samples.
+#     'store' : reading the samples from the columnar store.
+#     'graph' : loading the graphs not found in the topology cache.
+#     'routing' : building the routing paths not found in the topology cache
+#         (including loading their graph, if needed).
+READER_STAGES = ('open', 'decompress', 'readline', 'check', 'parse', 'store', 'graph', 'routing')
+
+# Reasons why the lines of the data files are skipped by the reader:
+# unstable simulation, out of the intensity range, rejected by the filters
+# or error while reading the data file.
+SKIP_REASONS = ('unstable', 'intensity', 'filter', 'error')
+
+class ReaderStats:
+    """
+    Instrumentation of the reading process of a DatanetAPI instance, enabled
+    with its stats option and available in its stats attribute. Counters are
+    updated while reading, so they can be read at any time. With the
+    parallel reader, the counters of the worker processes are added when
+    they finish.
+
+    Attributes
+    ----------
+    times : dictionary
+        Cumulative wall time (seconds) of every stage of READER_STAGES.
+        Stages may be nested (see READER_STAGES).
+    calls : dictionary
+        Number of times every stage of READER_STAGES was timed.
+    samples : dictionary
+        Number of samples produced ('yielded'), and of lines of the data
+        files skipped for every reason in SKIP_REASONS.
+    caches : dictionary
+        Number of [hits, misses] of every cache: 'topologies' (graphs and
+        routing paths kept in memory), 'disk' (graphs and routing paths
+        cached in the cache directory, and dataset statistics), 'store'
+        (data files read from the columnar store), 'epoch' (data files read
+        from the epoch cache) and 'archive' (data file kept open by
+        __getitem__).
+    io : dictionary
+        The read_stats dictionary of the reader, with the number of data
+        files and bytes read.
+    files_done, files_total : int
+        Number of data files read and found in the last iteration.
+    callback : function
+        If given, called as callback(event, stats) instead of printing the
+        progress messages, where stats is the dictionary returned by as_dict
+        and event is 'file' after reading every data file, or 'end' after
+        reading all of them. The messages of the removed (unstable)
+        samples are not printed either.
+
+    """
+    
+    def __init__(self, io=None, callback=None):
+        self.io = io if io is not None else {}
+        self.callback = callback
+        self.reset()
+    
+    def reset(self):
+        """
+        Sets all the counters, except those of io, to 0.
+        """
+        
+        self.times = dict.fromkeys(READER_STAGES, 0.0)
+        self.calls = dict.fromkeys(READER_STAGES, 0)
+        self.samples = dict.fromkeys(('yielded',) + SKIP_REASONS, 0)
+        self.caches = {}
+        self.files_done = 0
+        self.files_total = 0
+    
+    def add_time(self, stage, seconds):
+        self.times[stage] += seconds
+        self.calls[stage] += 1
+    
+    def skip(self, reason, check_start=None):
+        """
+        Counts a line skipped for reason, adding the time since check_start
+        (if given) to the 'check' stage.
+        """
+        
+        self.samples[reason] += 1
+        if (check_start is not None):
+            self.add_time('check', time.perf_counter() - check_start)
+    
+    def count_cache(self, name, hit):
+        counts = self.caches.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+    
+    def merge(self, other):
+        """
+        Adds the counters of other, a ReaderStats instance, except those of
+        io.
+        """
+        
+        for stage in READER_STAGES:
+            self.times[stage] += other.times[stage]
+            self.calls[stage] += other.calls[stage]
+        for key in self.samples:
+            self.samples[key] += other.samples[key]
+        for name, (hits, misses) in other.caches.items():
+            counts = self.caches.setdefault(name, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+    
+    def as_dict(self):
+        """
+        Returns a copy of the counters as a dictionary with the keys 'stages'
+        (time and calls of every stage), 'samples', 'caches' (hits, misses
+        and hit_rate of every cache), 'io' and 'files' (done and total).
+        """
+        
+        return {'stages': {stage: {'time': self.times[stage], 'calls': self.calls[stage]} for stage in READER_STAGES},
+                'samples': dict(self.samples),
+                'caches': {name: {'hits': hits, 'misses': misses,
+                                  'hit_rate': hits / (hits + misses) if hits + misses > 0 else None}
+                           for name, (hits, misses) in self.caches.items()},
+                'io': dict(self.io),
+                'files': {'done': self.files_done, 'total': self.files_total}}
+    
+    def report(self, event):
+        """
+        Calls the callback, if any, with event and the counters.
+        """
+        
+        if (self.callback is not None):
+            self.callback(event, self.as_dict())
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Callbacks are only called by the main process, and may not be
+        # picklable. Copies keep quiet if a callback was given.
+        if (self.callback is not None):
+            state['callback'] = _ignore_reader_event
+        return state
@@ -0,0 +1,561 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Caches of the reader: LRU cache of topologies, cache directory, columnar
+# store of parsed samples and shared memory epoch cache.
+
+import os, numpy, atexit, collections, ctypes, hashlib, io, json, multiprocessing, shutil, tempfile, types
+from multiprocessing import shared_memory
+from .sample import PERF_COLUMNS
+from .stats import _StatsAccumulator
+from .topology import Topology, RoutingPaths
+
+class _LRUCache:
+    """
+    Cache keeping the most recently used values, up to max_items values and
+    up to max_bytes bytes (as given by the size of each value when added).
+    None means no limit.
+    """
+    
+    def __init__(self, max_items=None, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._values = collections.OrderedDict()
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def get(self, key):
+        """
+        Returns the value of key, or None if it is not in the cache.
+        """
+        
+        if (key not in self._values):
+            return None
+        self._values.move_to_end(key)
+        return self._values[key][0]
+    
+    def put(self, key, value, nbytes=0):
+        """
+        Adds a value of nbytes bytes, evicting the least recently used values
+        if needed. The new value is always kept.
+        """
+        
+        if (key in self._values):
+            self.nbytes -= self._values.pop(key)[1]
+        self._values[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while (len(self._values) > 1 and
+               ((self.max_items is not None and len(self._values) > self.max_items) or
+                (self.max_bytes is not None and self.nbytes > self.max_bytes))):
+            _, (_, evicted_bytes) = self._values.popitem(last=False)
+            self.nbytes -= evicted_bytes
+
+def _atomic_write(path, data):
+    """
+    Writes data (bytes) to path. The file is first written to a temporary
+    file in the same directory and then renamed, so that concurrent readers
+    never see a partially written file.
+    """
+    
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except:
+        os.unlink(tmp_path)
+        raise
+
+# Classes of the objects saved in the cache directory (see _dump_cached)
+_CACHED_CLASSES = {cls.__name__: cls for cls in (Topology, RoutingPaths, _StatsAccumulator)}
+
+def _encode_cached(obj, arrays):
+    """
+    Returns obj as a JSON-serializable value for _dump_cached, adding its
+    numeric arrays to the dictionary arrays. Only numbers, strings, None,
+    lists, tuples, dictionaries, arrays and the classes of _CACHED_CLASSES
+    are supported.
+    """
+    
+    if (obj is None or isinstance(obj, (bool, int, float, str))):
+        return obj
+    if (isinstance(obj, numpy.generic)):
+        return obj.item()
+    if (isinstance(obj, list)):
+        return [_encode_cached(v, arrays) for v in obj]
+    if (isinstance(obj, tuple)):
+        return {'tuple': [_encode_cached(v, arrays) for v in obj]}
+    if (isinstance(obj, dict)):
+        return {'dict': [[_encode_cached(k, arrays), _encode_cached(v, arrays)] for k, v in obj.items()]}
+    if (isinstance(obj, numpy.ndarray)):
+        if (obj.dtype == object):
+            return {'objects': [_encode_cached(v, arrays) for v in obj.tolist()]}
+        name = "array_%d" % len(arrays)
+        arrays[name] = obj
+        return {'array': name}
+    if (_CACHED_CLASSES.get(type(obj).__name__) is type(obj)):
+        state = obj.__getstate__() if hasattr(type(obj), '__getstate__') else obj.__dict__
+        return {'object': type(obj).__name__, 'state': _encode_cached(state, arrays)}
+    raise TypeError("Cannot cache objects of type %s" % type(obj).__name__)
+
+def _decode_cached(value, arrays):
+    """
+    Returns the object encoded by _encode_cached.
+    """
+    
+    if (isinstance(value, list)):
+        return [_decode_cached(v, arrays) for v in value]
+    if (not isinstance(value, dict)):
+        return value
+    if ('tuple' in value):
+        return tuple(_decode_cached(v, arrays) for v in value['tuple'])
+    if ('dict' in value):
+        return {_decode_cached(k, arrays): _decode_cached(v, arrays) for k, v in value['dict']}
+    if ('objects' in value):
+        column = numpy.empty(len(value['objects']), dtype=object)
+        column[:] = [_decode_cached(v, arrays) for v in value['objects']]
+        return column
+    if ('array' in value):
+        return arrays[value['array']]
+    cls = _CACHED_CLASSES[value['object']]
+    obj = cls.__new__(cls)
+    state = _decode_cached(value['state'], arrays)
+    if (hasattr(cls, '__setstate__')):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+    return obj
+
+def _dump_cached(obj):
+    """
+    Returns obj (see _encode_cached) serialized as a .npz file, with its
+    numeric arrays as .npy files and the rest as JSON. Unlike pickle,
+    loading the file with _load_cached cannot run code, so cache files can
+    be read even if other users can write them.
+    """
+    
+    arrays = {}
+    value = _encode_cached(obj, arrays)
+    arrays['cached'] = numpy.frombuffer(json.dumps(value).encode(), dtype=numpy.uint8)
+    f = io.BytesIO()
+    numpy.savez(f, **arrays)
+    return f.getvalue()
+
+def _load_cached(f):
+    """
+    Returns the object of a file written by _dump_cached.
+    """
+    
+    with numpy.load(f, allow_pickle=False) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+    return _decode_cached(json.loads(arrays.pop('cached').tobytes().decode()), arrays)
+
+# Version of the format of the columnar store. Segments with a different
+# version are rebuilt.
+STORE_VERSION = 1
+
+# Columns of the columnar store with a value per sample
+STORE_SCALARS = ('line', 'global', 'maxAvgLambda', 'sim_time', 'net_size', 'graph', 'routing')
+
+# Columns of the columnar store with an array per sample (see
+# _parse_sample_section), stored one after the other along the first axis
+STORE_ARRAYS = ('agg', 'flows', 'flow_offsets', 'traffic', 'traffic_offsets', 'traffic_flow_offsets')
+
+# Arrays of the columnar store needed by each one of the ARRAY_FIELDS
+_STORE_FIELD_ARRAYS = {'performance': ('agg',),
+                       'flow_performance': ('flows', 'flow_offsets'),
+                       'traffic': ('traffic', 'traffic_offsets', 'traffic_flow_offsets')}
+
+class _StoreSegment:
+    """
+    Samples of a data file in the columnar store. Every column is a .npy file
+    of the segment directory, memory-mapped when the segment is opened (see
+    load), so the arrays of the samples are views of the files that are only
+    read from disk when they are used. Segments are also kept in shared
+    memory by the epoch cache (see _EpochCache).
+    
+    ...
+    
+    Attributes
+    ----------
+    meta : dictionary
+        Content of the meta.json file of the segment: 'version', 'mtime' and
+        'size' of the data file, 'graphs' and 'routings' (names of the files
+        used by the samples, indexed by the 'graph' and 'routing' columns) and
+        'removed' (list of [line, status line] of the unstable simulations).
+    columns : dictionary
+        Memory-mapped array of every column in STORE_SCALARS and
+        STORE_ARRAYS. Row k of the STORE_SCALARS describes the sample at
+        line 'line'[k] of the data file.
+    offsets : dictionary
+        For every column in STORE_ARRAYS, the array of the sample in row k
+        is column[offsets[k]:offsets[k+1]].
+    """
+    
+    def __init__(self, meta, columns, offsets):
+        self.meta = meta
+        self.columns = columns
+        self.offsets = offsets
+    
+    @classmethod
+    def load(cls, path, meta):
+        """
+        Opens the segment written in the directory path, whose meta.json
+        file contains meta.
+        """
+        
+        columns = {}
+        offsets = {}
+        for name in STORE_SCALARS + STORE_ARRAYS:
+            columns[name] = numpy.load(os.path.join(path, name + ".npy"), mmap_mode='r')
+        for name in STORE_ARRAYS:
+            offsets[name] = numpy.load(os.path.join(path, name + ".offsets.npy"))
+        return cls(meta, columns, offsets)
+    
+    @classmethod
+    def from_columns(cls, meta, columns):
+        """
+        Returns a segment kept in memory with the columns given as to
+        _write_store_segment.
+        """
+        
+        arrays = {name: columns[name] for name in STORE_SCALARS}
+        offsets = {}
+        for name in STORE_ARRAYS:
+            arrays[name], offsets[name] = _concatenate_store_column(name, columns[name])
+        return cls(meta, arrays, offsets)
+    
+    def __len__(self):
+        return len(self.columns['line'])
+    
+    def get_arrays(self, row, fields):
+        """
+        Returns the arrays dictionary (see _parse_sample_arrays) of the sample
+        in row, with the sections in fields.
+        """
+        
+        net_size = int(self.columns['net_size'][row])
+        arrays = {'global': tuple(float(v) for v in self.columns['global'][row]),
+                  'maxAvgLambda': float(self.columns['maxAvgLambda'][row]),
+                  'sim_time': float(self.columns['sim_time'][row]),
+                  'net_size': net_size}
+        for field in fields:
+            for name in _STORE_FIELD_ARRAYS[field]:
+                offsets = self.offsets[name]
+                arrays[name] = self.columns[name][offsets[row]:offsets[row+1]]
+        if ('agg' in arrays):
+            arrays['agg'] = arrays['agg'].reshape((net_size, net_size, len(PERF_COLUMNS)))
+        return arrays
+
+def _concatenate_store_column(name, arrays):
+    """
+    Returns the values of a column in STORE_ARRAYS given the list with the
+    array of every sample, and the offsets of the array of every sample.
+    """
+    
+    offsets = numpy.zeros(len(arrays)+1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum([len(a) for a in arrays])
+    if (len(arrays) > 0):
+        values = numpy.concatenate(arrays)
+    elif (name in ('agg', 'flows')):
+        values = numpy.zeros((0, len(PERF_COLUMNS)))
+    else:
+        values = numpy.zeros(0)
+    return (values, offsets)
+
+def _write_store_segment(path, meta, columns):
+    """
+    Writes a segment of the columnar store in the directory path. columns is
+    a dictionary with the array of every column in STORE_SCALARS and a list
+    with the array of every sample for every column in STORE_ARRAYS. Files
+    are written in a temporary directory, which is then renamed, so that
+    readers never see a partially written segment.
+    """
+    
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=directory, prefix=".tmp_")
+    try:
+        for name in STORE_SCALARS:
+            numpy.save(os.path.join(tmp_path, name + ".npy"), columns[name])
+        for name in STORE_ARRAYS:
+            values, offsets = _concatenate_store_column(name, columns[name])
+            numpy.save(os.path.join(tmp_path, name + ".offsets.npy"), offsets)
+            numpy.save(os.path.join(tmp_path, name + ".npy"), values)
+        with open(os.path.join(tmp_path, "meta.json"), 'w') as f:
+            json.dump(meta, f)
+        if (os.path.isdir(path)):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+    except:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+def _shared_array(shm, dtype, shape, offset, writeable=False):
+    """
+    Returns a numpy array of the given dtype and shape at offset of the
+    multiprocessing.shared_memory block shm. The array keeps shm alive
+    without exporting its buffer, so the block is released when it is no
+    longer used by any array.
+    """
+    
+    # The temporary ctypes object is the only export of the buffer
+    address = ctypes.addressof(ctypes.c_char.from_buffer(shm.buf))
+    holder = types.SimpleNamespace(shm=shm)
+    holder.__array_interface__ = {'version': 3, 'shape': tuple(shape), 'typestr': dtype.str,
+                                  'descr': dtype.descr, 'data': (address + offset, not writeable)}
+    return numpy.asarray(holder)
+
+class _SharedStoreSegment(_StoreSegment):
+    """
+    Segment of the columnar store (see _StoreSegment) kept in a
+    multiprocessing.shared_memory block by the epoch cache. The block starts
+    with the length of a JSON header (8 bytes) and the header, with the meta
+    of the segment and the dtype, shape and offset of every column, followed
+    by the columns. The columns are read-only views of the block.
+    """
+    
+    # Alignment of the columns in the block
+    alignment = 64
+    
+    def __init__(self, shm):
+        length = int(numpy.frombuffer(shm.buf[:8], dtype=numpy.uint64)[0])
+        header = json.loads(bytes(shm.buf[8:8+length]).decode())
+        start = self._data_offset(length)
+        arrays = {}
+        for name, (dtype, shape, offset) in header['layout'].items():
+            arrays[name] = _shared_array(shm, numpy.dtype(dtype), shape, start + offset)
+        columns = {name: arrays[name] for name in STORE_SCALARS + STORE_ARRAYS}
+        offsets = {name: arrays[name + ".offsets"] for name in STORE_ARRAYS}
+        _StoreSegment.__init__(self, header['meta'], columns, offsets)
+    
+    @classmethod
+    def _data_offset(cls, length):
+        return -(-(8 + length) // cls.alignment) * cls.alignment
+    
+    @classmethod
+    def pack(cls, meta, columns):
+        """
+        Returns the header and the arrays of the block of a segment with the
+        columns given as to _write_store_segment, and the size of the block.
+        """
+        
+        arrays = {name: numpy.ascontiguousarray(columns[name]) for name in STORE_SCALARS}
+        for name in STORE_ARRAYS:
+            values, offsets = _concatenate_store_column(name, columns[name])
+            arrays[name] = numpy.ascontiguousarray(values)
+            arrays[name + ".offsets"] = offsets
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            layout[name] = [array.dtype.str, list(array.shape), size]
+            size += -(-array.nbytes // cls.alignment) * cls.alignment
+        header = json.dumps({'meta': meta, 'layout': layout}).encode()
+        return (header, arrays, cls._data_offset(len(header)) + max(size, 1))
+    
+    @classmethod
+    def write(cls, shm, header, arrays):
+        """
+        Writes the header and arrays returned by pack into the block shm.
+        """
+        
+        shm.buf[:8] = numpy.array([len(header)], dtype=numpy.uint64).tobytes()
+        shm.buf[8:8+len(header)] = header
+        start = cls._data_offset(len(header))
+        layout = json.loads(header.decode())['layout']
+        for name, array in arrays.items():
+            offset = start + layout[name][2]
+            shm.buf[offset:offset+array.nbytes] = array.reshape(-1).view(numpy.uint8)
+
+class _EpochCache:
+    """
+    Cache of the parsed samples of the data files in shared memory (see the
+    epoch_cache_size option), shared by all the processes reading the
+    dataset with copies of the same DatanetAPI instance, e.g., the workers
+    of the parallel reader or those of a data loader. The samples of every
+    data file are kept as a segment of the columnar store in its own
+    multiprocessing.shared_memory block (see _SharedStoreSegment), so the
+    arrays of the samples read from the cache are views of the block.
+    
+    A registry, also in shared memory and protected by a lock, records the
+    name, size and last use of the blocks in the cache. When a new block
+    does not fit in max_bytes, the least recently used blocks are removed
+    with the 'lru' policy, and the block is not cached with the 'pin'
+    policy, which keeps the first data files cached. Removed blocks are
+    unlinked, but remain available to the processes still using them.
+    """
+    
+    # Values of the header of the registry: clock (number of uses), bytes
+    # used and whether a block was refused by the 'pin' policy
+    _HEADER = 3
+    _ENTRY = numpy.dtype([('name', 'S32'), ('nbytes', 'i8'), ('last_used', 'i8')])
+    
+    def __init__(self, max_bytes, policy, max_files):
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.max_files = max_files
+        self.lock = multiprocessing.Lock()
+        # Names of the blocks of this cache start with a random prefix
+        self.prefix = "dn%s_" % os.urandom(4).hex()
+        self.registry = shared_memory.SharedMemory(create=True, size=self._HEADER*8 + max_files*self._ENTRY.itemsize)
+        self.owner = os.getpid()
+        self._init_registry()
+        atexit.register(self._remove)
+    
+    def _init_registry(self):
+        self.header = _shared_array(self.registry, numpy.dtype(numpy.int64), (self._HEADER,), 0, True)
+        self.entries = _shared_array(self.registry, self._ENTRY, (self.max_files,), self._HEADER*8, True)
+        # Segments of the blocks used by this process, by name
+        self.segments = {}
+    
+    def __getstate__(self):
+        state = {'max_bytes': self.max_bytes, 'policy': self.policy, 'max_files': self.max_files,
+                 'prefix': self.prefix, 'registry': self.registry, 'owner': self.owner}
+        # Locks can only be sent to new processes. Other copies do not use
+        # the cache (e.g., those sent to a pool of workers).
+        state['lock'] = self.lock if multiprocessing.context.get_spawning_popen() is not None else None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_registry()
+    
+    def _name(self, key):
+        return self.prefix + hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    
+    def _find(self, name):
+        rows = numpy.flatnonzero(self.entries['name'] == name.encode())
+        return rows[0] if len(rows) > 0 else None
+    
+    def _attach(self, name):
+        segment = self.segments.get(name)
+        if (segment is None):
+            try:
+                segment = _SharedStoreSegment(shared_memory.SharedMemory(name=name))
+            except FileNotFoundError:
+                return None
+            self.segments[name] = segment
+        return segment
+    
+    def _evict(self, row):
+        name = self.entries['name'][row].decode()
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.header[1] -= self.entries['nbytes'][row]
+        self.entries[row] = (b'', 0, 0)
+        self.segments.pop(name, None)
+    
+    def full(self):
+        """
+        Returns whether no more data files can be cached.
+        """
+        
+        return self.policy == 'pin' and self.header[2] != 0
+    
+    def get(self, key):
+        """
+        Returns the _SharedStoreSegment of the data file identified by key,
+        or None if it is not in the cache.
+        """
+        
+        if (self.lock is None):
+            return None
+        name = self._name(key)
+        with self.lock:
+            row = self._find(name)
+            if (row is None):
+                self.segments.pop(name, None)
+                return None
+            self.header[0] += 1
+            self.entries['last_used'][row] = self.header[0]
+            return self._attach(name)
+    
+    def put(self, key, meta, columns):
+        """
+        Adds the segment with the given meta and columns (as given to
+        _write_store_segment) of the data file identified by key to the
+        cache, and returns its _SharedStoreSegment, or None if it was not
+        cached.
+        """
+        
+        if (self.lock is None):
+            return None
+        name = self._name(key)
+        header, arrays, nbytes = _SharedStoreSegment.pack(meta, columns)
+        if (nbytes > self.max_bytes):
+            return None
+        with self.lock:
+            if (self._find(name) is not None):
+                # Cached by another process in the meantime
+                return self._attach(name)
+            while (True):
+                used = self.entries['nbytes'] > 0
+                if (self.header[1] + nbytes <= self.max_bytes and not used.all()):
+                    break
+                if (self.policy == 'pin' or not used.any()):
+                    self.header[2] = 1
+                    return None
+                last_used = numpy.where(used, self.entries['last_used'], numpy.iinfo(numpy.int64).max)
+                self._evict(numpy.argmin(last_used))
+            try:
+                shm = shared_memory.SharedMemory(name=name, create=True, size=nbytes)
+            except (FileExistsError, OSError):
+                return None
+            _SharedStoreSegment.write(shm, header, arrays)
+            self.header[0] += 1
+            self.header[1] += nbytes
+            self.entries[numpy.argmin(used)] = (name.encode(), nbytes, self.header[0])
+            segment = _SharedStoreSegment(shm)
+            self.segments[name] = segment
+            # Forget the blocks removed by other processes
+            cached = set(n.decode() for n in self.entries['name'][self.entries['nbytes'] > 0])
+            for n in [n for n in self.segments if n not in cached]:
+                del self.segments[n]
+            return segment
+    
+    def clear(self):
+        """
+        Removes all the blocks from the cache.
+        """
+        
+        if (self.lock is None):
+            return
+        with self.lock:
+            for row in numpy.flatnonzero(self.entries['nbytes'] > 0):
+                self._evict(row)
+            self.header[:] = 0
+    
+    def _remove(self):
+        # Called at exit by the process that created the cache
+        if (os.getpid() != self.owner):
+            return
+        try:
+            self.clear()
+            self.registry.unlink()
+        except (OSError, ValueError):
+            pass
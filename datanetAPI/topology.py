@@ -0,0 +1,490 @@
+'''
+ *
+ * Copyright (C) 2020 Universitat Politècnica de Catalunya.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at:
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+'''
+
+# -*- coding: utf-8 -*-
+
+# Topologies and routing paths of the samples, read from the graph and routing
+# files of the datasets.
+
+import numpy, networkx, html, re
+
+def _routing_paths_from_next_hops(next_hop):
+    """
+    Computes the paths between all the pairs of nodes given a next-hop table,
+    advancing all the pairs at the same time.
+
+    Parameters
+    ----------
+    next_hop : NxN int array
+        Array where next_hop[i,j] is the node after node i in the path to node
+        j, or -1 if i is j.
+
+    Returns
+    -------
+    nodes : int array
+        Nodes of all the paths, in src-dst order (row-major), one after the
+        other. Every path starts at src and ends at dst.
+    offsets : int array
+        Array of N*N+1 elements where the path between src and dst is
+        nodes[offsets[src*N+dst]:offsets[src*N+dst+1]].
+
+    """
+    
+    net_size = next_hop.shape[0]
+    dst = numpy.tile(numpy.arange(net_size), net_size)
+    node = numpy.repeat(numpy.arange(net_size), net_size)
+    pairs = numpy.arange(net_size * net_size)
+    # Node of every step of the pairs that reached it
+    steps = [(pairs, node)]
+    while (True):
+        node = next_hop[node, dst]
+        active = node != -1
+        if (not active.any()):
+            break
+        if (len(steps) > net_size):
+            raise ValueError("Routing loop between nodes %d and %d" % divmod(int(pairs[active][0]), net_size))
+        pairs, node, dst = pairs[active], node[active], dst[active]
+        steps.append((pairs, node))
+    
+    lengths = numpy.zeros(net_size * net_size, dtype=numpy.int64)
+    for pairs, _ in steps:
+        lengths[pairs] += 1
+    offsets = numpy.zeros(net_size * net_size + 1, dtype=numpy.int64)
+    numpy.cumsum(lengths, out=offsets[1:])
+    nodes = numpy.empty(offsets[-1], dtype=numpy.int64)
+    for step, (pairs, node) in enumerate(steps):
+        nodes[offsets[pairs] + step] = node
+    return (nodes, offsets)
+
+# Tokens of the subset of GML used by the graph files: "key value" pairs
+# where value is a number, a string or "[", and "]".
+_GML_TOKEN = re.compile(r'\s*(?:([A-Za-z][0-9A-Za-z_]*)\s+(?:(\[)|"([^"\n]*)"|([^\s\["\]]+))|(\]))')
+
+_GML_INT = re.compile(r'[+-]?[0-9]+$')
+
+_GML_REAL = re.compile(r'[+-]?(?:[0-9]*\.[0-9]+|[0-9]+\.[0-9]*|INF)(?:[Ee][+-]?[0-9]+)?$')
+
+def _compact_column(values):
+    """
+    Returns the values of an attribute as an int array if all of them are
+    ints, as a float array if all of them are floats, or as an object array
+    otherwise (where None stands for a missing value), so that every value
+    keeps its type (e.g., ints mixed with floats).
+    """
+    
+    kinds = set(type(v) for v in values)
+    if (kinds == {int}):
+        return numpy.array(values, dtype=numpy.int64)
+    if (kinds == {float}):
+        return numpy.array(values, dtype=numpy.float64)
+    column = numpy.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+def _read_gml_topology(path):
+    """
+    Reads a GML graph file into a Topology instance, giving the same nodes,
+    edges and attributes as networkx.read_gml(path, destringizer=int).
+    Only the subset of GML found in the datasets is supported (a directed
+    multigraph with nodes and edges whose attributes are numbers or
+    strings), and ValueError is raised for any other input.
+    """
+    
+    with open(path) as f:
+        text = f.read()
+    graph_attrs = {}
+    nodes = []
+    edges = []
+    current = None
+    depth = 0
+    pos = 0
+    for m in _GML_TOKEN.finditer(text):
+        if (m.start() != pos):
+            break
+        pos = m.end()
+        key, dict_start, string, raw, dict_end = m.groups()
+        if (dict_end is not None):
+            depth -= 1
+            if (depth < 0):
+                raise ValueError("Unbalanced ']' in %s" % path)
+            continue
+        if (dict_start is not None):
+            if (depth == 0 and key == 'graph' and len(graph_attrs) == 0 and len(nodes) == 0):
+                depth = 1
+            elif (depth == 1 and key in ('node', 'edge')):
+                current = {}
+                (nodes if key == 'node' else edges).append(current)
+                depth = 2
+            else:
+                raise ValueError("Unsupported GML list '%s' in %s" % (key, path))
+            continue
+        if (string is not None):
+            value = html.unescape(string)
+            try:
+                value = int(value)
+            except ValueError:
+                if (value in ('()', '[]')):
+                    raise ValueError("Unsupported GML value in %s" % path)
+        elif (_GML_INT.match(raw)):
+            value = int(raw)
+        elif (_GML_REAL.match(raw)):
+            value = float(raw)
+        else:
+            raise ValueError("Unsupported GML value '%s' in %s" % (raw, path))
+        target = graph_attrs if depth == 1 else current
+        if (depth == 0 or key in target):
+            raise ValueError("Unsupported GML key '%s' in %s" % (key, path))
+        target[key] = value
+    if (depth != 0 or len(text[pos:].strip()) > 0):
+        raise ValueError("Unsupported GML syntax in %s" % path)
+    
+    if (not graph_attrs.pop('directed', False) or not graph_attrs.pop('multigraph', False)):
+        raise ValueError("%s is not a directed multigraph" % path)
+    labels = {}
+    for node in nodes:
+        if ('id' not in node or 'label' not in node or node['id'] in labels):
+            raise ValueError("Invalid node in %s" % path)
+        labels[node.pop('id')] = node.pop('label')
+    if (len(set(labels.values())) != len(labels)):
+        raise ValueError("Duplicated node label in %s" % path)
+    keys = set()
+    for edge in edges:
+        if (edge.get('source') not in labels or edge.get('target') not in labels or 'key' not in edge):
+            raise ValueError("Invalid edge in %s" % path)
+        edge['source'] = labels[edge['source']]
+        edge['target'] = labels[edge['target']]
+        key = (edge['source'], edge['target'], edge['key'])
+        if (key in keys):
+            raise ValueError("Duplicated edge in %s" % path)
+        keys.add(key)
+    
+    node_attrs = {}
+    for node in nodes:
+        for name in node:
+            node_attrs.setdefault(name, None)
+    edge_attrs = {}
+    for edge in edges:
+        for name in edge:
+            if (name not in ('source', 'target', 'key')):
+                edge_attrs.setdefault(name, None)
+    return Topology(_compact_column(list(labels.values())),
+                    {name: _compact_column([node.get(name) for node in nodes]) for name in node_attrs},
+                    _compact_column([edge['source'] for edge in edges]),
+                    _compact_column([edge['target'] for edge in edges]),
+                    _compact_column([edge['key'] for edge in edges]),
+                    {name: _compact_column([edge.get(name) for edge in edges]) for name in edge_attrs},
+                    graph_attrs)
+
+class Topology:
+    """
+    Network topology read from a GML graph file, stored in arrays with one
+    element per node or per link. The networkx graph of the topology is only
+    built when requested.
+    
+    ...
+    
+    Attributes
+    ----------
+    nodes : array
+        Identifier of every node.
+    node_attrs : dictionary
+        Array with the value of every node for each node attribute (e.g.,
+        'levelsQoS', 'queueSizes', 'schedulingPolicy', 'schedulingWeights').
+    edge_src, edge_dst, edge_key : array
+        Source node, destination node and key of every link.
+    edge_attrs : dictionary
+        Array with the value of every link for each link attribute (e.g.,
+        'port', 'bandwidth', 'weight').
+    graph_attrs : dictionary
+        Attributes of the graph.
+    net_size : int
+        Number of nodes.
+    """
+    
+    def __init__(self, nodes, node_attrs, edge_src, edge_dst, edge_key, edge_attrs, graph_attrs):
+        self.nodes = nodes
+        self.node_attrs = node_attrs
+        self.edge_src = edge_src
+        self.edge_dst = edge_dst
+        self.edge_key = edge_key
+        self.edge_attrs = edge_attrs
+        self.graph_attrs = graph_attrs
+        self.net_size = len(nodes)
+        self._graph = None
+        self._node_index = None
+        self._link_index = None
+        self._link_table = None
+    
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Returns the Topology instance of a networkx multigraph.
+        """
+        
+        node_names = []
+        for _, data in G.nodes(data=True):
+            for name in data:
+                if (name not in node_names):
+                    node_names.append(name)
+        edges = list(G.edges(keys=True, data=True))
+        edge_names = []
+        for _, _, _, data in edges:
+            for name in data:
+                if (name not in edge_names):
+                    edge_names.append(name)
+        t = cls(_compact_column(list(G.nodes)),
+                {name: _compact_column([data.get(name) for _, data in G.nodes(data=True)]) for name in node_names},
+                _compact_column([e[0] for e in edges]),
+                _compact_column([e[1] for e in edges]),
+                _compact_column([e[2] for e in edges]),
+                {name: _compact_column([e[3].get(name) for e in edges]) for name in edge_names},
+                dict(G.graph))
+        t._graph = G
+        return t
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The networkx graph and the lookup tables are rebuilt when needed
+        state['_graph'] = None
+        state['_node_index'] = None
+        state['_link_index'] = None
+        state['_link_table'] = None
+        return state
+    
+    def __setstate__(self, state):
+        # Pickles of older versions may lack some of the lookup tables
+        self._graph = None
+        self._node_index = None
+        self._link_index = None
+        self._link_table = None
+        self.__dict__.update(state)
+    
+    @property
+    def nbytes(self):
+        """
+        Approximate number of bytes used by the arrays of the topology.
+        """
+        
+        columns = [self.nodes, self.edge_src, self.edge_dst, self.edge_key]
+        columns += list(self.node_attrs.values()) + list(self.edge_attrs.values())
+        # Objects in object arrays are counted as 64 bytes
+        return sum(c.nbytes * (9 if c.dtype == object else 1) for c in columns)
+    
+    def number_of_nodes(self):
+        return self.net_size
+    
+    def to_networkx(self):
+        """
+        Returns the topology as a networkx MultiDiGraph, equal to the graph
+        returned by networkx.read_gml(path, destringizer=int). The graph is
+        built the first time it is requested.
+        """
+        
+        if (self._graph is None):
+            G = networkx.MultiDiGraph()
+            G.graph.update(self.graph_attrs)
+            node_attrs = {name: column.tolist() for name, column in self.node_attrs.items()}
+            for i, node in enumerate(self.nodes.tolist()):
+                G.add_node(node, **{name: column[i] for name, column in node_attrs.items() if column[i] is not None})
+            edge_attrs = {name: column.tolist() for name, column in self.edge_attrs.items()}
+            src, dst, keys = self.edge_src.tolist(), self.edge_dst.tolist(), self.edge_key.tolist()
+            # Links are added in the order of their source node, as networkx
+            # does when relabeling the nodes of the graph it reads
+            index = self._get_node_index()
+            for i in sorted(range(len(src)), key=lambda i: index[src[i]]):
+                G.add_edge(src[i], dst[i], keys[i], **{name: column[i] for name, column in edge_attrs.items() if column[i] is not None})
+            self._graph = G
+        return self._graph
+    
+    def _get_node_index(self):
+        if (self._node_index is None):
+            self._node_index = {node: i for i, node in enumerate(self.nodes.tolist())}
+        return self._node_index
+    
+    def _get_link_index(self):
+        # Position of the link with key 0 of every src-dst pair
+        if (self._link_index is None):
+            self._link_index = {}
+            for i, (src, dst, key) in enumerate(zip(self.edge_src.tolist(), self.edge_dst.tolist(), self.edge_key.tolist())):
+                if (key == 0):
+                    self._link_index[(src, dst)] = i
+        return self._link_index
+    
+    def get_link_table(self):
+        """
+        Returns a NxN int array where [src,dst] is the position of the link
+        (with key 0) between src and dst in the link arrays, or -1 if there is
+        no such link. Nodes must be numbered from 0 to N-1.
+        """
+        
+        if (self._link_table is None):
+            table = numpy.full((self.net_size, self.net_size), -1, dtype=numpy.int64)
+            links = numpy.flatnonzero(self.edge_key == 0)
+            table[self.edge_src[links].astype(numpy.int64), self.edge_dst[links].astype(numpy.int64)] = links
+            self._link_table = table
+        return self._link_table
+    
+    def get_node_properties(self, id):
+        """
+        Returns a dictionary with the attributes of node id, or None if it
+        does not exist. The dictionary is a new copy built from the arrays of
+        the topology, so changing it does not change the topology (unlike
+        the attribute dictionaries of the networkx graph).
+        """
+        
+        i = self._get_node_index().get(id)
+        if (i is None):
+            return None
+        res = {}
+        for name, column in self.node_attrs.items():
+            if (column[i] is not None):
+                res[name] = column[i].item() if isinstance(column[i], numpy.generic) else column[i]
+        return res
+    
+    def get_link_properties(self, src, dst):
+        """
+        Returns a dictionary with the attributes of the link (with key 0)
+        between src and dst, or None if it does not exist. The dictionary is a
+        new copy built from the arrays of the topology, so changing it does
+        not change the topology (unlike the attribute dictionaries of the
+        networkx graph).
+        """
+        
+        i = self._get_link_index().get((src, dst))
+        if (i is None):
+            return None
+        res = {}
+        for name, column in self.edge_attrs.items():
+            if (column[i] is not None):
+                res[name] = column[i].item() if isinstance(column[i], numpy.generic) else column[i]
+        return res
+
+class RoutingPaths:
+    """
+    Paths between all the pairs of nodes of a network, stored in compressed
+    sparse row format: the nodes of all the paths in a single array, and the
+    offset of each path in that array.
+    
+    ...
+    
+    Attributes
+    ----------
+    nodes : int array
+        Nodes of all the paths, one after the other. The path between src and
+        dst starts at src and ends at dst.
+    offsets : int array
+        Array of N*N+1 elements where the path between src and dst is
+        nodes[offsets[src*N+dst]:offsets[src*N+dst+1]].
+    net_size : int
+        Number of nodes of the network.
+    """
+    
+    def __init__(self, nodes, offsets, net_size):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.net_size = net_size
+        self._matrix = None
+        self._links = None
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The matrix view and the links are rebuilt when needed
+        state['_matrix'] = None
+        state['_links'] = None
+        return state
+    
+    def __setstate__(self, state):
+        # Pickles of older versions may lack some of the caches
+        self._matrix = None
+        self._links = None
+        self.__dict__.update(state)
+    
+    def get_links(self, topology):
+        """
+        Returns the links traversed by the paths between different nodes,
+        given the Topology instance of the network. Paths are numbered in
+        src-dst order skipping the pairs where src equals dst, and links by
+        their position in the link arrays of the topology. The result is
+        kept for the next calls with the same topology.
+
+        Returns
+        -------
+        Dictionary with the following keys:
+            'path_src', 'path_dst' : source and destination of every path.
+            'path_links' : links of all the paths, one path after the other.
+            'path_link_offsets' : array of P+1 elements where the links of
+                path p are path_links[path_link_offsets[p]:path_link_offsets[p+1]].
+            'path_link_positions' : position of every link in its path.
+
+        """
+        
+        if (self._links is not None and self._links[0] is topology):
+            return self._links[1]
+        n = self.net_size
+        lengths = numpy.diff(self.offsets)
+        # Every node of a path but the last one starts a hop
+        last = numpy.zeros(len(self.nodes), dtype=bool)
+        last[self.offsets[1:] - 1] = True
+        hops = numpy.flatnonzero(~last)
+        path_links = topology.get_link_table()[self.nodes[hops], self.nodes[hops + 1]]
+        if (numpy.any(path_links == -1)):
+            raise ValueError("Path through a link that is not in the topology")
+        pairs = numpy.flatnonzero(~numpy.eye(n, dtype=bool).reshape(-1))
+        path_link_offsets = numpy.zeros(len(pairs) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths[pairs] - 1, out=path_link_offsets[1:])
+        path_link_positions = numpy.arange(len(hops)) - numpy.repeat(path_link_offsets[:-1], lengths[pairs] - 1)
+        links = {'path_src': pairs // n,
+                 'path_dst': pairs % n,
+                 'path_links': path_links,
+                 'path_link_offsets': path_link_offsets,
+                 'path_link_positions': path_link_positions}
+        self._links = (topology, links)
+        return links
+    
+    def get_path(self, src, dst):
+        """
+        Returns an array with the nodes of the path between src and dst.
+        """
+        
+        pair = src * self.net_size + dst
+        return self.nodes[self.offsets[pair]:self.offsets[pair+1]]
+    
+    def get_path_lengths(self):
+        """
+        Returns a NxN array with the number of nodes of the path of each
+        src-dst pair.
+        """
+        
+        return numpy.diff(self.offsets).reshape(self.net_size, self.net_size)
+    
+    def get_matrix(self):
+        """
+        Returns a NxN matrix where each cell [i,j] contains the list of nodes
+        of the path between i and j, i.e., the routing_matrix of the samples.
+        The matrix is built the first time it is requested.
+        """
+        
+        if (self._matrix is None):
+            nodes = self.nodes.tolist()
+            offsets = self.offsets.tolist()
+            matrix = numpy.empty((self.net_size, self.net_size), dtype=object)
+            flat = matrix.reshape(-1)
+            for pair in range(self.net_size * self.net_size):
+                flat[pair] = nodes[offsets[pair]:offsets[pair+1]]
+            self._matrix = matrix
+        return self._matrix
@@ -0,0 +1,55 @@
+'''
+Fixtures of the tests: small synthetic datasets generated with
+benchmarks/synthetic_dataset.py.
+'''
+
+import os, shutil, sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+from synthetic_dataset import generate_dataset
+
+@pytest.fixture(scope='session')
+def dataset(tmp_path_factory):
+    '''
+    Dataset with two data files of 10 samples of a 10-node network, some of
+    them unstable. It must not be modified by the tests (see
+    dataset_copy).
+    '''
+    
+    path = str(tmp_path_factory.mktemp('dataset'))
+    generate_dataset(path, num_nodes=10, num_files=2, samples_per_file=10, unstable_ratio=0.1, seed=0)
+    return path
+
+@pytest.fixture
+def dataset_copy(tmp_path):
+    '''
+    Dataset like the dataset fixture that the test can modify.
+    '''
+    
+    path = str(tmp_path / 'dataset')
+    generate_dataset(path, num_nodes=10, num_files=2, samples_per_file=10, unstable_ratio=0.1, seed=0)
+    return path
+
+@pytest.fixture
+def rewrite_data_file(tmp_path):
+    '''
+    Function replacing the data file at path with the data file of the same
+    name of a dataset generated with another seed, without changing its
+    directory (i.e., the file is rewritten in place).
+    '''
+    
+    def rewrite(path, seed):
+        other = str(tmp_path / ('other_%d' % seed))
+        generate_dataset(other, num_nodes=10, num_files=2, samples_per_file=12, unstable_ratio=0.1, seed=seed)
+        with open(os.path.join(other, os.path.basename(path)), 'rb') as src, open(path, 'r+b') as dst:
+            dst.truncate()
+            shutil.copyfileobj(src, dst)
+        shutil.rmtree(other)
+        # Modification times may have a coarse resolution
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+    return rewrite
@@ -0,0 +1,81 @@
+'''
+Golden values of the samples of the dataset fixture, read with the original
+parser of datanetAPI.py (the baseline commit, before any reader option was
+added): data/golden_samples.json holds, for every data file, the SHA-256
+digests of the values given by the public getters of its samples, in the
+order of the file. The tests compare the samples read with every option
+with them, so that a change of the shared parser can not go unnoticed.
+'''
+
+import collections.abc, hashlib, json, os
+
+import numpy
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'golden_samples.json')
+
+with open(GOLDEN_PATH) as f:
+    GOLDEN_SAMPLES = json.load(f)
+
+def normalize(value):
+    '''
+    Returns value with mappings as dictionaries with string keys, sequences
+    as lists, arrays as [shape, values] and numbers as floats, so that the
+    values of the original parser, the typed arrays and the read-only views
+    of compact samples have the same JSON encoding.
+    '''
+
+    if (isinstance(value, collections.abc.Mapping)):
+        return {str(k): normalize(v) for k, v in value.items()}
+    if (isinstance(value, (list, tuple))):
+        return [normalize(v) for v in value]
+    if (isinstance(value, numpy.ndarray)):
+        return [list(value.shape), [normalize(v) for v in value.ravel().tolist()]]
+    if (isinstance(value, (int, float, numpy.number)) and not isinstance(value, bool)):
+        return float(value)
+    return value
+
+def snapshot(s):
+    '''
+    Returns the values of a sample given by the public getters of the
+    original Sample class.
+    '''
+
+    n = s.get_network_size()
+    pairs = [(src, dst) for src in range(n) for dst in range(n)]
+    return {'global': [s.get_global_packets(), s.get_global_losses(), s.get_global_delay(), s.get_maxAvgLambda()],
+            'performance': [s.get_srcdst_performance(src, dst) for src, dst in pairs],
+            'traffic': [s.get_srcdst_traffic(src, dst) for src, dst in pairs],
+            'routing': [list(s.get_srcdst_routing(src, dst)) for src, dst in pairs],
+            'bandwidth': [s.get_srcdst_link_bandwidth(src, dst) for src, dst in pairs],
+            'nodes': [s.get_node_properties(node) for node in range(n)]}
+
+def digest(s):
+    '''
+    Returns (data file, line, digest) of a sample, with the name of its data
+    file without extension, so that transcoded data files have the same.
+    '''
+
+    data = json.dumps(normalize(snapshot(s)), sort_keys=True)
+    name = os.path.basename(s._get_data_set_file_name()).split('.')[0]
+    return (name, s._line, hashlib.sha256(data.encode()).hexdigest())
+
+def read_digests(samples):
+    '''
+    Returns the digests of the samples of an iteration.
+    '''
+
+    return [digest(s) for s in samples]
+
+def assert_golden(digests, ordered=True):
+    '''
+    Checks that the samples of digests (see read_digests) are those of the
+    golden values, and, if ordered, that the samples of every data file are
+    produced in the order of the file.
+    '''
+
+    by_file = {}
+    for name, line, value in digests:
+        by_file.setdefault(name, []).append((line, value))
+    if (ordered):
+        assert all(entries == sorted(entries) for entries in by_file.values())
+    assert {name: [value for _, value in sorted(entries)] for name, entries in by_file.items()} == GOLDEN_SAMPLES
@@ -0,0 +1,29 @@
+'''
+Tests of the batches of samples packed into arrays.
+'''
+
+import numpy
+
+import datanetAPI
+
+def test_batches_match_samples(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False))
+    samples = [(s.get_performance_array().copy(), s.get_topology_object(), s.get_routing_matrix().copy(),
+                s.get_maxAvgLambda()) for s in reader]
+    batches = list(reader.batches(8))
+    assert [len(b['maxAvgLambda']) for b in batches] == [8, 8, 3]
+    assert len(list(reader.batches(8, drop_last=True))) == 2
+    batch = batches[1]
+    for b, (agg, G, routing, max_avg_lambda) in enumerate(samples[8:16]):
+        assert batch['maxAvgLambda'][b] == max_avg_lambda
+        paths = range(batch['sample_path_offsets'][b], batch['sample_path_offsets'][b+1])
+        links = list(G.edges(keys=True))
+        first_link = batch['sample_link_offsets'][b]
+        for p in paths:
+            src, dst = batch['path_src'][p], batch['path_dst'][p]
+            assert numpy.array_equal(batch['path_features'][p], agg[src, dst])
+            path_links = batch['path_links'][batch['path_link_offsets'][p]:batch['path_link_offsets'][p+1]]
+            assert [links[l - first_link][:2] for l in path_links] == list(zip(routing[src, dst], routing[src, dst][1:]))
+            # Every path is among the paths of its links
+            for l in path_links:
+                assert p in batch['link_paths'][batch['link_path_offsets'][l]:batch['link_path_offsets'][l+1]]
@@ -0,0 +1,29 @@
+'''
+Tests of the disk cache of topologies and routing paths.
+'''
+
+import glob, io, os
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+def test_cached_topology_round_trip(dataset):
+    for path in glob.glob(os.path.join(dataset, 'graphs', '*')):
+        t = datanetAPI.topology._read_gml_topology(path)
+        loaded = datanetAPI.store._load_cached(io.BytesIO(datanetAPI.store._dump_cached(t)))
+        assert list(loaded.to_networkx().edges(keys=True, data=True)) == list(t.to_networkx().edges(keys=True, data=True))
+        assert {name: c.dtype for name, c in loaded.node_attrs.items()} == {name: c.dtype for name, c in t.node_attrs.items()}
+
+def test_cached_topologies_match_original_parser(dataset, tmp_path):
+    for _ in range(2):
+        reader = datanetAPI.DatanetAPI(dataset,
+                                       cache=datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path)),
+                                       stats=True)
+        assert_golden(read_digests(reader))
+    # Topology and routing paths are read from the cache the second time
+    assert reader.stats.caches['disk'] == [2, 0]
+    assert len(glob.glob(str(tmp_path / '*' / 'topologies' / '*.npz'))) == 2
+
+def test_topologies_are_not_cached_by_default(dataset_copy):
+    read_digests(datanetAPI.DatanetAPI(dataset_copy, cache=datanetAPI.CacheOptions(use_store=False)))
+    assert not os.path.exists(os.path.join(dataset_copy, '.datanetAPI'))
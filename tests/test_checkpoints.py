@@ -0,0 +1,44 @@
+'''
+Tests of the gzip checkpoints used to jump into the data files.
+'''
+
+import glob, gzip, io, os
+
+import datanetAPI
+from golden import assert_golden, digest, read_digests
+
+def test_checkpointed_reader_matches_original_parser(dataset, tmp_path):
+    cache = datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path))
+    assert_golden(read_digests(datanetAPI.DatanetAPI(dataset, archive=datanetAPI.ArchiveOptions(checkpoints=True),
+                                                     cache=cache)))
+
+def test_random_access_with_checkpoints(dataset, tmp_path):
+    expected = read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
+    reader = datanetAPI.DatanetAPI(dataset,
+                                   archive=datanetAPI.ArchiveOptions(checkpoints=True, checkpoint_spacing=4096),
+                                   cache=datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path)))
+    order = list(range(len(reader)))[::3] + list(reversed(range(len(reader))))
+    assert [digest(reader[i]) for i in order] == [expected[i] for i in order]
+
+def test_checkpoint_reader_matches_gzip_file():
+    data = [os.urandom(50000), b'', b'0123456789' * 30000]
+    compressed = b''.join(gzip.compress(d) for d in data) + b'\x00' * 1000
+    expected = gzip.GzipFile(fileobj=io.BytesIO(compressed)).read()
+    assert expected == b''.join(data)
+    for spacing in (None, 4096, 1 << 20):
+        f = datanetAPI.archives._GzipCheckpointReader(io.BytesIO(compressed), spacing)
+        assert f.read() == expected
+        for offset in (len(expected) - 10, 10, 60000, 50001, 0, 200000):
+            assert f.seek(offset) == offset
+            assert f.read(100) == expected[offset:offset+100]
+
+def test_interleaved_files_are_decompressed_twice(dataset):
+    tar_bytes = sum(len(gzip.open(path).read()) for path in glob.glob(os.path.join(dataset, '*.tar.gz')))
+    reader = datanetAPI.DatanetAPI(dataset, archive=datanetAPI.ArchiveOptions(checkpoints=True),
+                                   cache=datanetAPI.CacheOptions(use_store=False), stats=True)
+    read_digests(reader)
+    assert tar_bytes < reader.read_stats['decompressed_bytes'] <= 2 * tar_bytes
+    # tarfile's gzip reader decompresses the archives again when seeking back
+    default = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False), stats=True)
+    read_digests(default)
+    assert default.read_stats['decompressed_bytes'] > 2 * tar_bytes
@@ -0,0 +1,42 @@
+'''
+Tests of the archive codecs and of the dataset transcoder.
+'''
+
+import io, os
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+CODECS = [datanetAPI.ARCHIVE_CODECS['zstd'], datanetAPI.ARCHIVE_CODECS['lz4']] + \
+         [datanetAPI.GzipCodec(backend) for backend in datanetAPI.GZIP_BACKENDS]
+
+@pytest.mark.parametrize('codec', CODECS, ids=lambda codec: getattr(codec, 'backend', None) or codec.name)
+def test_codec_round_trip(codec):
+    if (not codec.is_available()):
+        pytest.skip("%s codec not installed" % codec.name)
+    data = os.urandom(1000) + b'0123456789' * 100000
+    compressed = io.BytesIO()
+    try:
+        writer = codec.open_writer(compressed, level=1)
+    except ValueError:
+        pytest.skip("%s gzip backend not installed" % codec.backend)
+    with writer as f:
+        f.write(data)
+    assert not compressed.closed and len(compressed.getvalue()) < len(data)
+    compressed.seek(0)
+    with codec.open_reader(compressed) as f:
+        assert f.read() == data
+
+@pytest.mark.parametrize('codec', ['gzip', 'zstd', 'lz4', 'dir'])
+def test_transcoded_dataset_matches_original_parser(dataset, tmp_path, codec):
+    if (codec != 'dir' and not datanetAPI.ARCHIVE_CODECS[codec].is_available()):
+        pytest.skip("%s codec not installed" % codec)
+    files = datanetAPI.transcode_dataset(dataset, str(tmp_path / 'transcoded'), codec=codec, num_workers=1)
+    assert len(files) == 2
+    for streaming in (False, True):
+        digests = read_digests(datanetAPI.DatanetAPI(str(tmp_path / 'transcoded'),
+                                                     archive=datanetAPI.ArchiveOptions(streaming=streaming),
+                                                     cache=datanetAPI.CacheOptions(use_store=False)))
+        assert_golden(digests)
@@ -0,0 +1,21 @@
+'''
+Tests of the shared-memory epoch cache of parsed samples.
+'''
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+@pytest.mark.parametrize('num_workers', [0, 2])
+def test_epoch_cache_matches_original_parser(dataset, num_workers):
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=num_workers),
+                                   cache=datanetAPI.CacheOptions(use_store=False, epoch_cache_size=64 * 1024**2),
+                                   stats=True)
+    try:
+        for epoch in range(2):
+            reader.set_epoch(epoch)
+            assert_golden(read_digests(reader))
+        assert reader.stats.caches['epoch'] == [2, 2]
+    finally:
+        reader.clear_epoch_cache()
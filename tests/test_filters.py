@@ -0,0 +1,34 @@
+'''
+Tests of the filters of the samples.
+'''
+
+import pytest
+
+import datanetAPI
+from golden import GOLDEN_SAMPLES, read_digests
+
+def delay_below_5(delay):
+    return delay < 5
+
+@pytest.mark.parametrize('num_workers, use_index', [(0, False), (2, False), (0, True)])
+def test_filters_select_samples(dataset, tmp_path, num_workers, use_index):
+    all_samples = [(s.get_global_delay(), s.get_network_size())
+                   for s in datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False))]
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=num_workers),
+                                   cache=datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path),
+                                                                 use_index=use_index))
+    reader.add_filter('global_delay', delay_below_5)
+    delays = [s.get_global_delay() for s in reader]
+    assert delays == [delay for delay, _ in all_samples if delay < 5]
+    assert 0 < len(delays) < len(all_samples)
+    if (use_index):
+        assert len(reader) == len(delays)
+
+def test_file_and_sample_filters(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False))
+    reader.add_filter('file', lambda file: file.endswith('_1.tar.gz'))
+    reader.add_filter('sample', lambda s: s.get_global_packets() > 0)
+    digests = read_digests(reader)
+    assert [value for _, _, value in digests] == GOLDEN_SAMPLES['results_10_400-2000_1']
+    with pytest.raises(ValueError):
+        reader.add_filter('unknown', bool)
@@ -0,0 +1,33 @@
+'''
+Tests of the table of flows of the samples.
+'''
+
+import numpy
+
+import datanetAPI
+
+def test_flows_table_matches_dictionaries(dataset):
+    for s in datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)):
+        table = s.flows_table(max_candidates=4)
+        rows = iter(table)
+        n = s.get_network_size()
+        for src in range(n):
+            for dst in range(n):
+                if (src == dst):
+                    continue
+                traffic = s.get_srcdst_traffic(src, dst)['Flows']
+                performance = s.get_srcdst_performance(src, dst)['Flows']
+                for flow, (t, p) in enumerate(zip(traffic, performance)):
+                    row = next(rows)
+                    assert (row['src'], row['dst'], row['flow']) == (src, dst, flow)
+                    assert (row['TimeDist'], row['SizeDist'], row['ToS']) == (t['TimeDist'], t['SizeDist'], t['ToS'])
+                    for name, value in list(t['TimeDistParams'].items()) + list(t['SizeDistParams'].items()):
+                        if (name.startswith('Size_') or name.startswith('Prob_')):
+                            column, i = name.split('_')
+                            assert row[column + 's'][int(i)] == value
+                        else:
+                            assert row[name] == value
+                    assert [row[name] for name in ('AvgBw', 'PktsGen')] == [t['AvgBw'], t['PktsGen']]
+                    assert numpy.isclose(row['TotalPktsGen'], t['TotalPktsGen'])
+                    assert [row[name] for name in p] == list(p.values())
+        assert next(rows, None) is None
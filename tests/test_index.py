@@ -0,0 +1,32 @@
+'''
+Tests of the dataset index: len(), random access, and its invalidation when
+a data file changes.
+'''
+
+import glob, os
+
+import datanetAPI
+from golden import assert_golden, digest, read_digests
+
+def test_indexed_iteration_matches_original_parser(dataset, tmp_path):
+    cache = datanetAPI.CacheOptions(use_store=False, use_index=True, cache_dir=str(tmp_path))
+    assert_golden(read_digests(datanetAPI.DatanetAPI(dataset, cache=cache)))
+
+def test_indexing_matches_iteration(dataset, tmp_path):
+    expected = read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path)))
+    assert len(reader) == len(expected)
+    assert [digest(reader[i]) for i in reversed(range(len(reader)))] == expected[::-1]
+
+def test_index_is_rebuilt_when_a_file_changes(dataset_copy, tmp_path, rewrite_data_file):
+    cache = datanetAPI.CacheOptions(use_index=True, cache_dir=str(tmp_path), use_store=False)
+    reader = datanetAPI.DatanetAPI(dataset_copy, cache=cache)
+    before = [digest(reader[i]) for i in range(len(reader))]
+    rewrite_data_file(glob.glob(os.path.join(dataset_copy, 'results_*'))[0], seed=1)
+    expected = read_digests(datanetAPI.DatanetAPI(dataset_copy, cache=datanetAPI.CacheOptions(use_store=False)))
+    assert expected != before
+    for r in (datanetAPI.DatanetAPI(dataset_copy, cache=cache), reader):
+        r.set_epoch(0)
+        assert len(r) == len(expected)
+        assert [digest(r[i]) for i in range(len(r))] == expected
+        assert read_digests(r) == expected
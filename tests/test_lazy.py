@@ -0,0 +1,35 @@
+'''
+Tests of lazy samples and field projections.
+'''
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+def test_lazy_samples_match_original_parser(dataset):
+    assert_golden(read_digests(datanetAPI.DatanetAPI(dataset, parsing=datanetAPI.ParsingOptions(lazy=True),
+                                                     cache=datanetAPI.CacheOptions(use_store=False))))
+
+def test_performance_projection(dataset):
+    full = next(iter(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False))))
+    s = next(iter(datanetAPI.DatanetAPI(dataset, parsing=datanetAPI.ParsingOptions(fields=('performance',)),
+                                        cache=datanetAPI.CacheOptions(use_store=False))))
+    n = full.get_network_size()
+    assert s.get_network_size() == n
+    for src in range(n):
+        for dst in range(n):
+            perf = s.get_srcdst_performance(src, dst)
+            assert perf['AggInfo'] == full.get_srcdst_performance(src, dst)['AggInfo']
+            assert perf['Flows'] == [perf['AggInfo']]
+
+def test_unread_fields_raise(dataset):
+    s = next(iter(datanetAPI.DatanetAPI(dataset, parsing=datanetAPI.ParsingOptions(fields=('performance',)),
+                                        cache=datanetAPI.CacheOptions(use_store=False))))
+    getters = [lambda: s.get_srcdst_traffic(0, 1), s.get_traffic_matrix, s.get_flow_offsets,
+               lambda: s.get_srcdst_routing(0, 1), s.get_routing_matrix, s.get_routing_paths,
+               s.get_topology_object, s.get_topology, lambda: s.get_node_properties(0),
+               lambda: s.get_link_properties(0, 1), lambda: s.get_srcdst_link_bandwidth(0, 1)]
+    for getter in getters:
+        with pytest.raises(ValueError, match="was not read from the dataset"):
+            getter()
@@ -0,0 +1,38 @@
+'''
+Tests of the manifest of the data files of a dataset.
+'''
+
+import os, shutil, time
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+def test_manifest_lists_the_data_files(dataset, tmp_path):
+    for _ in range(2):
+        cache = datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path))
+        assert_golden(read_digests(datanetAPI.DatanetAPI(dataset, cache=cache)))
+
+def test_manifest_checks_files_and_directories(dataset_copy, tmp_path, rewrite_data_file):
+    # Directories modified recently are always listed again
+    past = time.time() - 60
+    os.utime(dataset_copy, (past, past))
+    cache = datanetAPI.CacheOptions(cache_dir=str(tmp_path))
+    reader = datanetAPI.DatanetAPI(dataset_copy, cache=cache)
+    files, roots = reader._get_data_files()
+    assert roots == [dataset_copy] and len(files) == 2
+    assert os.path.exists(reader._cache_path(dataset_copy, "manifest.json"))
+    # A file rewritten in place does not change its directory
+    root, file = files[0]
+    rewrite_data_file(os.path.join(root, file), seed=2)
+    os.utime(dataset_copy, (past, past))
+    reader = datanetAPI.DatanetAPI(dataset_copy, cache=cache)
+    assert reader._get_data_files() == (files, roots)
+    assert reader._data_file_size(root, file) == os.path.getsize(os.path.join(root, file))
+    # New files change their directory
+    shutil.copy(os.path.join(root, file), os.path.join(root, file.replace('.tar.gz', '0.tar.gz')))
+    new_files, _ = datanetAPI.DatanetAPI(dataset_copy, cache=cache)._get_data_files()
+    assert sorted(new_files) == sorted(files + [(root, file.replace('.tar.gz', '0.tar.gz'))])
+
+def test_manifest_is_opt_in(dataset_copy):
+    read_digests(datanetAPI.DatanetAPI(dataset_copy))
+    assert not os.path.exists(os.path.join(dataset_copy, '.datanetAPI'))
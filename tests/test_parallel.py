@@ -0,0 +1,54 @@
+'''
+Tests of the multi-process reader.
+'''
+
+import os
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+from synthetic_dataset import generate_dataset
+
+@pytest.mark.parametrize('num_workers, array_mode', [(2, False), (3, True)])
+def test_ordered_workers_match_serial_reader(dataset, num_workers, array_mode):
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=num_workers),
+                                   parsing=datanetAPI.ParsingOptions(array_mode=array_mode),
+                                   cache=datanetAPI.CacheOptions(use_store=False))
+    digests = read_digests(reader)
+    assert_golden(digests)
+    assert digests == read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
+
+def test_unordered_workers_match_original_parser(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=2, ordered=False),
+                                   cache=datanetAPI.CacheOptions(use_store=False))
+    assert_golden(read_digests(reader))
+
+def test_ordered_workers_reorder_files_of_different_sizes(tmp_path):
+    # More files than the window of files read ahead, with different sizes,
+    # so that files are read out of order
+    for i, samples_per_file in enumerate([2, 12, 5]):
+        generate_dataset(str(tmp_path / str(i)), num_nodes=5, num_files=3, samples_per_file=samples_per_file,
+                         flows_per_pair=(1, 1), seed=i)
+    serial = read_digests(datanetAPI.DatanetAPI(str(tmp_path), cache=datanetAPI.CacheOptions(use_store=False)))
+    assert len(serial) == 57
+    for num_workers in [1, 2]:
+        assert read_digests(datanetAPI.DatanetAPI(str(tmp_path),
+                                                  parallel=datanetAPI.ParallelOptions(num_workers=num_workers),
+                                                  cache=datanetAPI.CacheOptions(use_store=False))) == serial
+    unordered = read_digests(datanetAPI.DatanetAPI(str(tmp_path),
+                                                   parallel=datanetAPI.ParallelOptions(num_workers=2, ordered=False),
+                                                   cache=datanetAPI.CacheOptions(use_store=False)))
+    assert sorted(unordered) == sorted(serial)
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_worker_errors_are_raised(dataset_copy, ordered):
+    path = os.path.join(dataset_copy, sorted(f for f in os.listdir(dataset_copy) if f.endswith('.tar.gz'))[0])
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) // 2)
+    reader = datanetAPI.DatanetAPI(dataset_copy,
+                                   parallel=datanetAPI.ParallelOptions(num_workers=2, ordered=ordered),
+                                   cache=datanetAPI.CacheOptions(use_store=False), stats=True)
+    with pytest.raises(EOFError):
+        read_digests(reader)
+    assert reader.stats.samples['error'] == 1
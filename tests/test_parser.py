@@ -0,0 +1,30 @@
+'''
+Tests of the parser of the data files: the samples of the default reader and
+those of the array mode are those of the original parser.
+'''
+
+import numpy
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+@pytest.mark.parametrize('array_mode', [False, True])
+def test_samples_match_original_parser(dataset, array_mode):
+    assert_golden(read_digests(datanetAPI.DatanetAPI(dataset,
+                                                     parsing=datanetAPI.ParsingOptions(array_mode=array_mode),
+                                                     cache=datanetAPI.CacheOptions(use_store=False))))
+
+def test_arrays_match_dictionaries(dataset):
+    for s in datanetAPI.DatanetAPI(dataset, parsing=datanetAPI.ParsingOptions(array_mode=True),
+                                   cache=datanetAPI.CacheOptions(use_store=False)):
+        n = s.get_network_size()
+        agg = s.get_performance_array()
+        assert agg.shape == (n, n, len(datanetAPI.PERF_COLUMNS))
+        for src in range(n):
+            for dst in range(n):
+                if (src == dst):
+                    continue
+                performance = s.get_srcdst_performance(src, dst)['AggInfo']
+                assert list(agg[src, dst, 2:]) == [performance[k] for k in datanetAPI.PERF_COLUMNS[2:]]
+        assert numpy.array_equal(s.get_delay_matrix(), agg[:, :, 3])
@@ -0,0 +1,24 @@
+'''
+Tests of the background prefetch of samples.
+'''
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+@pytest.mark.parametrize('options', [{'prefetch': 4}, {'prefetch': 1, 'num_workers': 2}])
+def test_prefetched_samples_match_serial_reader(dataset, options):
+    digests = read_digests(datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(**options),
+                                                 cache=datanetAPI.CacheOptions(use_store=False)))
+    assert_golden(digests)
+    assert digests == read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
+
+def test_prefetch_stops_with_the_consumer(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(prefetch=2),
+                                   cache=datanetAPI.CacheOptions(use_store=False))
+    for _ in range(3):
+        samples = iter(reader)
+        next(samples)
+        samples.close()
+    assert len(read_digests(reader)) == 19
@@ -0,0 +1,34 @@
+'''
+Tests of the routing paths built from the next-hop tables.
+'''
+
+import numpy
+import pytest
+
+import datanetAPI
+
+def test_paths_follow_next_hops():
+    # Ring of 4 nodes routed clockwise
+    next_hop = numpy.array([[(i + 1) % 4 if i != j else -1 for j in range(4)] for i in range(4)])
+    nodes, offsets = datanetAPI.topology._routing_paths_from_next_hops(next_hop)
+    paths = datanetAPI.RoutingPaths(nodes, offsets, 4)
+    assert paths.get_path(0, 3).tolist() == [0, 1, 2, 3]
+    assert paths.get_path(3, 1).tolist() == [3, 0, 1]
+    assert paths.get_path(2, 2).tolist() == [2]
+    assert paths.get_path_lengths()[1].tolist() == [4, 1, 2, 3]
+    assert paths.get_matrix()[3, 1] == [3, 0, 1]
+
+def test_routing_loop_is_detected():
+    next_hop = numpy.array([[-1, 1, 1], [0, -1, 0], [0, 0, -1]])
+    with pytest.raises(ValueError):
+        datanetAPI.topology._routing_paths_from_next_hops(next_hop)
+
+def test_paths_of_the_dataset_follow_the_links(dataset):
+    for s in datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)):
+        G = s.get_topology_object()
+        for src in range(s.get_network_size()):
+            for dst in range(s.get_network_size()):
+                path = list(s.get_srcdst_routing(src, dst))
+                assert path[0] == src and path[-1] == dst
+                assert all(G.has_edge(a, b) for a, b in zip(path, path[1:]))
+        break
@@ -0,0 +1,39 @@
+'''
+Tests of the Sample classes.
+'''
+
+import pickle
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_compact_samples_match_original_parser(dataset, lazy):
+    digests = read_digests(datanetAPI.DatanetAPI(dataset,
+                                                 parsing=datanetAPI.ParsingOptions(compact=True, lazy=lazy),
+                                                 cache=datanetAPI.CacheOptions(use_store=False)))
+    assert_golden(digests)
+    assert digests == read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
+
+def test_compact_sample_has_no_dict(dataset):
+    sample = next(iter(datanetAPI.DatanetAPI(dataset, parsing=datanetAPI.ParsingOptions(compact=True))))
+    assert isinstance(sample, datanetAPI.CompactSample)
+    assert not hasattr(sample, '__dict__')
+    with pytest.raises(AttributeError):
+        sample.label = 1
+
+def test_sample_is_an_ordinary_class(dataset):
+    assert datanetAPI.Sample.global_packets is None and datanetAPI.Sample.maxAvgLambda is None
+    sample = next(iter(datanetAPI.DatanetAPI(dataset)))
+    assert type(sample) is datanetAPI.Sample
+    sample.label = 1
+    assert sample.label == 1 and sample.__dict__['label'] == 1
+
+def test_sample_pickle(dataset):
+    for compact in (False, True):
+        sample = next(iter(datanetAPI.DatanetAPI(dataset, parsing=datanetAPI.ParsingOptions(compact=compact))))
+        copy = pickle.loads(pickle.dumps(sample))
+        assert copy.get_global_packets() == sample.get_global_packets()
+        assert copy.get_srcdst_performance(0, 1) == sample.get_srcdst_performance(0, 1)
@@ -0,0 +1,61 @@
+'''
+Tests of the shards of the dataset read by every rank and loader worker.
+'''
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, digest, read_digests
+
+@pytest.mark.parametrize('world_size, num_loader_workers', [(2, 1), (3, 1), (2, 2), (7, 1), (5, 3)])
+@pytest.mark.parametrize('options', [{}, {'shuffle': True}, {'intensity_values': [600, 1800]}])
+def test_shards_are_disjoint_and_complete(dataset, tmp_path, world_size, num_loader_workers, options):
+    options = dict(options, cache=datanetAPI.CacheOptions(cache_dir=str(tmp_path), use_store=False))
+    full = read_digests(datanetAPI.DatanetAPI(dataset, **options))
+    shards = []
+    equal_shards = []
+    for rank in range(world_size):
+        for worker in range(num_loader_workers):
+            shard_options = dict(rank=rank, world_size=world_size, loader_worker_id=worker,
+                                 num_loader_workers=num_loader_workers)
+            reader = datanetAPI.DatanetAPI(dataset, sharding=datanetAPI.ShardOptions(drop_remainder=False,
+                                                                                     **shard_options),
+                                           **options)
+            shards.append(read_digests(reader))
+            assert [digest(reader[i]) for i in range(len(reader))] == shards[-1]
+            equal_shards.append(read_digests(datanetAPI.DatanetAPI(dataset,
+                                                                   sharding=datanetAPI.ShardOptions(**shard_options),
+                                                                   **options)))
+    samples = [k for shard in shards for k in shard]
+    assert sorted(samples) == sorted(full)
+    if (options.get('intensity_values') is None):
+        assert_golden(samples, ordered=False)
+    # With drop_remainder, the default with several ranks, shards have the
+    # same length and take the first samples of the iteration
+    num_shards = world_size * num_loader_workers
+    assert all(len(shard) == len(full) // num_shards for shard in equal_shards)
+    assert [k for shard in equal_shards for k in shard] == full[:len(full) // num_shards * num_shards]
+
+def test_shards_only_index_partial_files(dataset, tmp_path, monkeypatch):
+    indexed = []
+    build = datanetAPI.DatanetAPI._build_archive_index
+    monkeypatch.setattr(datanetAPI.DatanetAPI, '_build_archive_index',
+                        lambda self, root, file: indexed.append(file) or build(self, root, file))
+    parallel = datanetAPI.ParallelOptions(num_workers=1)
+    cache = datanetAPI.CacheOptions(cache_dir=str(tmp_path))
+    for rank in range(2):
+        sharding = datanetAPI.ShardOptions(rank=rank, world_size=2, drop_remainder=False)
+        read_digests(datanetAPI.DatanetAPI(dataset, parallel=parallel, sharding=sharding, cache=cache))
+    assert indexed == []
+    sharding = datanetAPI.ShardOptions(rank=0, world_size=4, drop_remainder=False)
+    read_digests(datanetAPI.DatanetAPI(dataset, parallel=parallel, sharding=sharding, cache=cache))
+    assert len(indexed) == 1
+
+def test_loader_workers_keep_all_samples_by_default(dataset, tmp_path):
+    cache = datanetAPI.CacheOptions(cache_dir=str(tmp_path))
+    full = read_digests(datanetAPI.DatanetAPI(dataset, cache=cache))
+    shards = [read_digests(datanetAPI.DatanetAPI(dataset, cache=cache,
+                                                 sharding=datanetAPI.ShardOptions(loader_worker_id=worker,
+                                                                                  num_loader_workers=3)))
+              for worker in range(3)]
+    assert [k for shard in shards for k in shard] == full
@@ -0,0 +1,33 @@
+'''
+Tests of the shuffle of the samples and of the epoch seeds.
+'''
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+SHUFFLE_OPTIONS = [{}, {'interleave': 2, 'shuffle_buffer': 8}]
+
+def read_epoch(path, epoch, **options):
+    reader = datanetAPI.DatanetAPI(path, shuffle=True, shuffling=datanetAPI.ShuffleOptions(**options),
+                                   cache=datanetAPI.CacheOptions(use_store=False))
+    reader.set_epoch(epoch)
+    return read_digests(reader)
+
+@pytest.mark.parametrize('options', SHUFFLE_OPTIONS)
+def test_shuffled_samples_match_original_parser(dataset, options):
+    assert_golden(read_epoch(dataset, 0, **options), ordered=False)
+
+@pytest.mark.parametrize('options', SHUFFLE_OPTIONS)
+def test_epochs_are_reproducible(dataset, options):
+    assert read_epoch(dataset, 3, **options) == read_epoch(dataset, 3, **options)
+
+def test_epochs_have_different_orders(dataset):
+    options = SHUFFLE_OPTIONS[1]
+    orders = [read_epoch(dataset, epoch, **options) for epoch in range(3)]
+    assert orders[0] != orders[1] and orders[1] != orders[2]
+
+def test_nearby_seeds_have_different_orders(dataset):
+    options = SHUFFLE_OPTIONS[1]
+    assert read_epoch(dataset, 1, seed=1234, **options) != read_epoch(dataset, 0, seed=1235, **options)
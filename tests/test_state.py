@@ -0,0 +1,69 @@
+'''
+Tests of the checkpointable state of the iterator.
+'''
+
+import json
+
+import pytest
+
+import datanetAPI
+from golden import assert_golden, digest
+
+def read(reader, count=None):
+    digests = []
+    for s in reader:
+        digests.append(digest(s))
+        if (len(digests) == count):
+            break
+    return digests
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'shuffle': True},
+    {'parallel': datanetAPI.ParallelOptions(num_workers=2)},
+    {'cache': {'use_index': True}},
+    {'archive': datanetAPI.ArchiveOptions(checkpoints=True), 'cache': {'use_index': True}},
+    {'shuffling': datanetAPI.ShuffleOptions(interleave=2), 'shuffle': True},
+    {'parallel': datanetAPI.ParallelOptions(prefetch=3)},
+])
+@pytest.mark.parametrize('count', [0, 1, 7, 12])
+def test_resume_equals_uninterrupted_iteration(dataset, tmp_path, options, count):
+    options = dict(options, cache=datanetAPI.CacheOptions(cache_dir=str(tmp_path), use_store=False,
+                                                          **options.get('cache', {})))
+    full = read(datanetAPI.DatanetAPI(dataset, **options))
+    reader = datanetAPI.DatanetAPI(dataset, **options)
+    first = read(reader, count) if count > 0 else []
+    # The state is saved as JSON and loaded by a new reader
+    state = json.loads(json.dumps(reader.state_dict()))
+    resumed = datanetAPI.DatanetAPI(dataset, **options)
+    resumed.load_state_dict(state)
+    rest = read(resumed)
+    if ('shuffling' in options):
+        # Only the samples produced are the same when files are interleaved
+        assert sorted(first + rest) == sorted(full)
+    else:
+        assert first + rest == full
+    assert_golden(first + rest, ordered=not options.get('shuffle', False))
+    assert read(datanetAPI.DatanetAPI.from_state_dict(state)) == rest
+
+def test_unsupported_state_version(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False))
+    state = reader.state_dict()
+    state['version'] = -1
+    with pytest.raises(ValueError):
+        reader.load_state_dict(state)
+    with pytest.raises(ValueError):
+        datanetAPI.DatanetAPI.from_state_dict(state)
+
+def test_option_groups_are_saved(dataset, tmp_path):
+    reader = datanetAPI.DatanetAPI(dataset, shuffling=datanetAPI.ShuffleOptions(seed=7, interleave=2),
+                                   parsing=datanetAPI.ParsingOptions(fields=['performance']),
+                                   cache=datanetAPI.CacheOptions(cache_dir=str(tmp_path), use_store=False))
+    state = json.loads(json.dumps(reader.state_dict()))
+    resumed = datanetAPI.DatanetAPI.from_state_dict(state)
+    for group in datanetAPI.OPTION_GROUPS:
+        assert resumed.get_options(group) == reader.get_options(group)
+    assert resumed.get_options('follow') is None
+    assert resumed.interleave == 2 and resumed.fields == ('performance',)
+    with pytest.raises(TypeError):
+        datanetAPI.DatanetAPI(dataset, cache={'use_store': False})
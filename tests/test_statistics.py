@@ -0,0 +1,41 @@
+'''
+Tests of the statistics of the datasets.
+'''
+
+import numpy
+import pytest
+
+import datanetAPI
+
+def test_accumulator_merge_matches_numpy():
+    values = numpy.random.default_rng(0).lognormal(size=10000)
+    merged = datanetAPI.stats._StatsAccumulator()
+    for part in numpy.array_split(values, 7):
+        accumulator = datanetAPI.stats._StatsAccumulator()
+        accumulator.update(part)
+        merged.merge(accumulator)
+    summary = merged.summary(quantiles=(0.5, 0.9))
+    assert summary['count'] == len(values)
+    assert summary['mean'] == pytest.approx(values.mean())
+    assert summary['std'] == pytest.approx(values.std())
+    assert (summary['min'], summary['max']) == (values.min(), values.max())
+    for q in (0.5, 0.9):
+        assert summary['quantiles'][q] == pytest.approx(numpy.quantile(values, q), rel=0.02)
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_statistics_match_samples(dataset, tmp_path, num_workers):
+    delays = []
+    global_delays = []
+    for s in datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)):
+        n = s.get_network_size()
+        delays += [s.get_srcdst_performance(src, dst)['AggInfo']['AvgDelay']
+                   for src in range(n) for dst in range(n) if src != dst]
+        global_delays.append(s.get_global_delay())
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=num_workers),
+                                   cache=datanetAPI.CacheOptions(use_store=False, cache_dir=str(tmp_path)))
+    for _ in range(2):
+        statistics = reader.compute_statistics(fields=('AvgDelay',), levels=('global', 'path'))
+        assert statistics['samples'] == len(global_delays)
+        assert statistics['path']['AvgDelay']['count'] == len(delays)
+        assert statistics['path']['AvgDelay']['mean'] == pytest.approx(numpy.mean(delays))
+        assert statistics['global']['global_delay']['max'] == max(global_delays)
@@ -0,0 +1,40 @@
+'''
+Tests of the instrumentation of the reader.
+'''
+
+import time
+
+import datanetAPI
+
+def test_stats_count_samples_and_stages(dataset):
+    events = []
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False), stats=True,
+                                   stats_callback=lambda event, stats: events.append((event, stats)))
+    samples = [s.get_global_delay() for s in reader]
+    stats = reader.stats.as_dict()
+    assert stats['samples']['yielded'] == len(samples) == 19
+    assert stats['samples']['unstable'] == 1
+    assert stats['files'] == {'done': 2, 'total': 2}
+    assert stats['stages']['parse']['calls'] == 19
+    assert all(stats['stages'][stage]['time'] > 0 for stage in ('open', 'decompress', 'readline', 'parse'))
+    assert [event for event, _ in events] == ['file', 'file', 'end']
+    assert events[-1][1]['samples']['yielded'] == 19
+
+def test_stats_of_the_workers_are_merged(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=2),
+                                   cache=datanetAPI.CacheOptions(use_store=False), stats=True,
+                                   stats_callback=lambda event, stats: None)
+    samples = [s.get_global_delay() for s in reader]
+    stats = reader.stats.as_dict()
+    assert stats['samples']['yielded'] == len(samples)
+    assert stats['stages']['parse']['calls'] == len(samples)
+    assert stats['io']['archives'] == 2
+
+def test_nothing_is_measured_without_stats(dataset, monkeypatch):
+    calls = []
+    perf_counter = time.perf_counter
+    monkeypatch.setattr(time, 'perf_counter', lambda: calls.append(1) or perf_counter())
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False))
+    assert len([s.get_global_delay() for s in reader]) == 19
+    assert calls == []
+    assert reader.stats is None and not any(reader.read_stats.values())
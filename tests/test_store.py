@@ -0,0 +1,31 @@
+'''
+Tests of the columnar store of parsed samples.
+'''
+
+import os
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+def test_store_matches_original_parser(dataset, tmp_path):
+    reader = datanetAPI.DatanetAPI(dataset, parallel=datanetAPI.ParallelOptions(num_workers=1),
+                                   cache=datanetAPI.CacheOptions(cache_dir=str(tmp_path)))
+    assert reader.build_store() == 2
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(cache_dir=str(tmp_path)), stats=True)
+    digests = read_digests(reader)
+    assert_golden(digests)
+    assert reader.stats.caches['store'] == [2, 0]
+    assert digests == read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
+
+def test_store_directory_is_probed_once(dataset, tmp_path, monkeypatch):
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(cache_dir=str(tmp_path)), stats=True)
+    probed = []
+    isdir = os.path.isdir
+    monkeypatch.setattr(os.path, 'isdir', lambda path: probed.append(path) or isdir(path))
+    read_digests(reader)
+    assert [path for path in probed if path.endswith('store')] == [reader._cache_path(dataset, 'store')]
+    assert reader.stats.caches['store'] == [0, 2]
+    # A store built by the reader is used from then on
+    assert reader.build_store() == 2
+    read_digests(reader)
+    assert reader.stats.caches['store'] == [2, 2]
@@ -0,0 +1,12 @@
+'''
+Tests of the single-pass reading of the members of the data files.
+'''
+
+import datanetAPI
+from golden import assert_golden, read_digests
+
+def test_streaming_matches_original_parser(dataset):
+    digests = read_digests(datanetAPI.DatanetAPI(dataset, archive=datanetAPI.ArchiveOptions(streaming=True),
+                                                 cache=datanetAPI.CacheOptions(use_store=False)))
+    assert_golden(digests)
+    assert digests == read_digests(datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False)))
@@ -0,0 +1,25 @@
+'''
+Tests of the synthetic datasets of benchmarks/synthetic_dataset.py.
+'''
+
+import filecmp, os
+
+import datanetAPI
+from synthetic_dataset import generate_dataset
+
+def test_datasets_are_reproducible(tmp_path):
+    paths = [generate_dataset(str(tmp_path / name), num_nodes=5, num_files=2, samples_per_file=3, seed=seed)
+             for name, seed in (('a', 1), ('b', 1), ('c', 2))]
+    assert all(filecmp.cmp(a, b, shallow=False) for a, b in zip(paths[0], paths[1]))
+    assert not any(filecmp.cmp(a, c, shallow=False) for a, c in zip(paths[0], paths[2]))
+
+def test_datasets_are_read(tmp_path):
+    path = str(tmp_path / 'dataset')
+    # Without flow results, the parser only supports a flow per src-dst pair
+    generate_dataset(path, num_nodes=6, num_files=3, samples_per_file=4, flows_per_pair=(1, 1), num_routings=2,
+                     flow_results=False)
+    samples = [s for s in datanetAPI.DatanetAPI(path, cache=datanetAPI.CacheOptions(use_store=False))]
+    assert len(samples) == 12
+    assert all(s.get_network_size() == 6 for s in samples)
+    assert {os.path.basename(s._get_data_set_file_name()) for s in samples} == \
+           {'results_6_400-2000_%d.tar.gz' % k for k in range(3)}
@@ -0,0 +1,52 @@
+'''
+Tests of the Topology class, the GML reader and the LRU cache of topologies.
+'''
+
+import glob, os
+
+import networkx
+
+import datanetAPI
+
+def test_mixed_column_keeps_types():
+    column = datanetAPI.topology._compact_column([1, 2.5, None, 'x'])
+    assert [type(v) for v in column] == [int, float, type(None), str]
+    assert datanetAPI.topology._compact_column([1, 2]).dtype.kind == 'i'
+    assert datanetAPI.topology._compact_column([1.5, 2.0]).dtype.kind == 'f'
+
+def test_link_properties_keep_types():
+    G = networkx.MultiDiGraph()
+    G.add_edge(0, 1, 0, weight=1, bandwidth=10000.0)
+    G.add_edge(1, 0, 0, weight=2.5, bandwidth=10000.0)
+    t = datanetAPI.Topology.from_networkx(G)
+    assert t.get_link_properties(0, 1) == {'weight': 1, 'bandwidth': 10000.0}
+    assert type(t.get_link_properties(0, 1)['weight']) is int
+    # Properties are copies of the arrays of the topology
+    t.get_link_properties(0, 1)['weight'] = 3
+    assert t.get_link_properties(0, 1)['weight'] == 1
+
+def test_gml_reader_matches_networkx(dataset):
+    for path in glob.glob(os.path.join(dataset, 'graphs', '*')):
+        G = networkx.read_gml(path, destringizer=int)
+        t = datanetAPI.topology._read_gml_topology(path)
+        assert list(t.to_networkx().nodes(data=True)) == list(G.nodes(data=True))
+        assert list(t.to_networkx().edges(keys=True, data=True)) == list(G.edges(keys=True, data=True))
+
+def test_lru_cache_bounds():
+    cache = datanetAPI.store._LRUCache(max_items=2, max_bytes=100)
+    cache.put('a', 1, 10)
+    cache.put('b', 2, 10)
+    assert cache.get('a') == 1
+    cache.put('c', 3, 10)
+    # b is the least recently used value
+    assert (cache.get('b'), cache.get('a'), cache.get('c')) == (None, 1, 3)
+    cache.put('d', 4, 95)
+    assert len(cache) == 1 and cache.get('d') == 4 and cache.nbytes == 95
+
+def test_topologies_are_loaded_lazily(dataset):
+    reader = datanetAPI.DatanetAPI(dataset, cache=datanetAPI.CacheOptions(use_store=False, max_topologies=1),
+                                   stats=True)
+    assert len(reader._topologies) == 0
+    samples = [s.get_network_size() for s in reader]
+    assert len(reader._topologies) == 1
+    assert reader.stats.caches['topologies'][1] > 1 and len(samples) == 19